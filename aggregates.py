@@ -0,0 +1,147 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+
+# =================================== CONFIG ================================== #
+
+# Dimensions the navigation report charts, and the measures summed along each of them
+report_dimensions = [
+    'Ethnicity', 'Gender', 'Age_Group', 'Insurance', 'Location',
+    'Status', 'Housing', 'Income', 'Person', 'ZIP2',
+]
+report_measures = ['Activity Duration', 'Travel']
+
+# Dimensions whose cells can name several people ('A, B'); each name is counted once per row
+split_dimensions = {'Person': ','}
+
+# ============================== Aggregation Engine ============================== #
+
+def dimension_codes(col):
+    """(codes, labels) for one column: category codes as they are, other columns factorized"""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy(), col.cat.categories
+    return pd.factorize(col)
+
+
+def split_mentions(col, sep):
+    """
+    (row_ids, codes, labels) with one entry per name in a sep-separated column, labels in
+    first-mention order. Each distinct value is split once; values go through str() and
+    empty names are skipped, so a blank cell counts as 'nan' like the old Counter loop.
+    """
+    codes, uniques = pd.factorize(col.astype(str))
+    names = [[item.strip() for item in value.split(sep) if item.strip()] for value in uniques]
+
+    # Flatten the names of every distinct value, then look them up per row
+    lengths = np.array([len(n) for n in names], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    flat_codes, flat_labels = pd.factorize(pd.Series([name for n in names for name in n], dtype=object))
+
+    per_row = lengths[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+    row_ids = np.repeat(np.arange(len(codes)), per_row)
+    offset = np.arange(len(row_ids)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    flat = np.repeat(starts[codes], per_row) + offset if len(row_ids) else np.zeros(0, dtype=np.int64)
+
+    # Renumber in the order the rows first mention each name
+    codes, mentioned = pd.factorize(flat_codes[flat])
+    return row_ids, codes, pd.Index(np.asarray(flat_labels, dtype=object)[mentioned], dtype=object)
+
+
+def mention_tokens(row_ids):
+    """Place of each mention within its row (0 for the first name a row lists)"""
+    return pd.Series(row_ids).groupby(row_ids, sort=False).cumcount().to_numpy()
+
+
+def ties_by_appearance(category_dtype):
+    """Equal counts rank by first appearance in the view, except for ordered categories (age buckets)"""
+    return category_dtype is None or not category_dtype.ordered
+
+
+def observed_series(dim, labels, values, observed, category_dtype=None):
+    """Values per label of one dimension, labels that never occur dropped"""
+    index = labels[observed]
+    if category_dtype is not None:
+        # Only the categories that occur (plotly can't group on empty categories)
+        index = pd.CategoricalIndex(index, categories=index, ordered=category_dtype.ordered)
+    return pd.Series(values[observed], index=pd.Index(index, name=dim))
+
+
+def count_frame(counts, order='count', name='Count'):
+    """
+    [dim, name] frame from counts in first-seen (or category) order. order='count'
+    sorts like value_counts(), order='key' like groupby(dim).size(). Labels come back as objects
+    """
+    if order == 'count':
+        counts = counts.sort_values(ascending=False)
+    elif not (isinstance(counts.index, pd.CategoricalIndex) and counts.index.ordered):
+        # Unordered categories sort by label, same as groupby on the plain strings
+        counts = counts.iloc[pd.Index(np.asarray(counts.index, dtype=object)).argsort()]
+    # Plain labels for the charts: plotly express groups category columns with pandas'
+    # deprecated observed=False default
+    counts.index = pd.Index(np.asarray(counts.index, dtype=object), name=counts.index.name)
+    return counts.reset_index(name=name)
+
+
+class Aggregates:
+    """
+    Row counts and measure sums for every declared dimension. Each dimension is one code
+    array and one np.bincount per measure over it; charts read the results from here
+    instead of running their own value_counts / groupby over the frame.
+    """
+
+    def __init__(self, df, dimensions=None, measures=None, split=None):
+        dimensions = report_dimensions if dimensions is None else dimensions
+        measures = report_measures if measures is None else measures
+        split = split_dimensions if split is None else split
+        self.rows = len(df)
+
+        # Measures as float arrays, missing values counting as 0 (like Series.sum())
+        weights = {}
+        for measure in measures:
+            values = pd.to_numeric(df[measure], errors='coerce').to_numpy(dtype='float64')
+            weights[measure] = np.where(np.isnan(values), 0.0, values)
+        self.totals = {measure: w.sum() for measure, w in weights.items()}
+
+        self.labels = {}
+        self.category_dtypes = {}
+        self.counts_by = {}
+        self.sums_by = {}
+        for dim in dimensions:
+            if dim in split:
+                # One entry per name; a row's measures count towards each name it lists
+                rows, codes, labels = split_mentions(df[dim], split[dim])
+                self.category_dtypes[dim] = None
+            else:
+                codes, labels = dimension_codes(df[dim])
+                rows = np.flatnonzero(codes >= 0)
+                codes = codes[rows]
+                self.category_dtypes[dim] = df[dim].dtype if isinstance(df[dim].dtype, pd.CategoricalDtype) else None
+            self.labels[dim] = labels
+            self.counts_by[dim] = np.bincount(codes, minlength=len(labels))
+            self.sums_by[dim] = {
+                measure: np.bincount(codes, weights=w[rows], minlength=len(labels))
+                for measure, w in weights.items()
+            }
+
+    def total(self, measure):
+        return self.totals[measure]
+
+    def _series(self, dim, values):
+        return observed_series(dim, self.labels[dim], values, self.counts_by[dim] > 0, self.category_dtypes[dim])
+
+    def counts(self, dim, order='count', name='Count'):
+        """
+        [dim, name] frame of row counts. order='count' matches value_counts() (most
+        common first, ties in first-seen order); order='key' matches groupby(dim).size()
+        """
+        return count_frame(self._series(dim, self.counts_by[dim]), order, name)
+
+    def sums(self, dim, measure):
+        """Series of measure totals per label, in label order"""
+        return self._series(dim, self.sums_by[dim][measure])
+
+
+def aggregate(df, dimensions=None, measures=None, split=None):
+    """Aggregates for a cleaned report frame (see report_dimensions / report_measures / split_dimensions)"""
+    return Aggregates(df, dimensions, measures, split)
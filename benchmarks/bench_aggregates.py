@@ -0,0 +1,97 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from aggregates import aggregate
+from cleaning import clean_stage, normalize, age_stage
+from sheet_schema import apply_schema, navigation_schema
+from synthetic_data import make_navigation
+from zip_codes import zip_stage
+
+# ============================ Aggregation Benchmark ============================ #
+
+# Per-chart value_counts / groupby / Counter passes vs one Aggregates build:
+#   python benchmarks/bench_aggregates.py 1000000
+
+renames = {
+    'Activity Duration (minutes):': 'Activity Duration',
+    'Location Encountered:': 'Location',
+    "Individual's Insurance Status:": 'Insurance',
+    "Individual's Status:": 'Status',
+    'Person submitting this form:': 'Person',
+    'Total travel time (minutes):': 'Travel',
+    'Race / Ethnicity:': 'Ethnicity',
+    'Gender:': 'Gender',
+    'Housing Status': 'Housing',
+    'Income Level': 'Income',
+}
+
+
+def report_frame(n_rows):
+    """Synthetic navigation rows, cleaned the way nav_dec_25 cleans them before charting"""
+    raw = make_navigation(n_rows)
+    header = list(raw.columns)
+    df = apply_schema(header, raw.set_axis([f"c{i}" for i in range(len(header))], axis=1), navigation_schema)
+    df = clean_stage(df).rename(columns=renames)
+    df['Full Name'] = df["Individual's First Name:"].astype(str) + " " + df["Individual's Last Name:"].astype(str)
+    df = normalize(df)
+    df['Travel'] = pd.to_numeric(df['Travel'], errors='coerce').fillna(0)
+    return zip_stage(age_stage(df))
+
+
+def per_chart_passes(df):
+    """What the report did before aggregates.py: one pass per chart"""
+    results = [
+        df['Activity Duration'].sum(),
+        df['Travel'].sum(),
+        df['Ethnicity'].value_counts(),
+        df['Gender'].value_counts(),
+        df.groupby('Age_Group', observed=True).size(),
+        df.groupby('Insurance', observed=True).size(),
+        df['Location'].value_counts(),
+        df['Status'].value_counts(),
+        df['Housing'].value_counts(),
+        df['Income'].value_counts(),
+        df[df['ZIP2'].notna()]['ZIP2'].value_counts(),
+    ]
+    counter = Counter()
+    for entry in df['Person']:
+        for item in (i.strip() for i in str(entry).split(",")):
+            if item:
+                counter[item] += 1
+    results.append(counter)
+    return results
+
+
+def one_pass(df):
+    report = aggregate(df)
+    # The chart builders then read their frames off the result
+    return [report.counts(dim) for dim in report.labels]
+
+
+def timed(label, fn, df, runs=3):
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(df)
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    print(f"   {label:<34} {best:8.3f}s")
+    return best
+
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = report_frame(n_rows)
+
+    print(f"\n📊 Report aggregates over {n_rows:,} rows (best of 3)")
+    passes_seconds = timed('per-chart passes', per_chart_passes, df)
+    engine_seconds = timed('aggregate() + counts()', one_pass, df)
+    print(f"✅ {passes_seconds / engine_seconds:.1f}x faster with one Aggregates build")
@@ -0,0 +1,107 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bench_aggregates import report_frame
+from bitmap_index import BitmapIndex
+from cube import cube_dimensions
+from date_index import DateRangeIndex
+from support_types import support_table
+
+# ============================ Cross-Filter Benchmark ============================ #
+
+# Cross-filter selection latency, DataFrame filters vs the bitmap index:
+#   python benchmarks/bench_crossfilter.py 1000000
+
+
+def frame_filter(df, long_table, selections, skip=None):
+    """Boolean row mask for the selections, except the one on dimension skip"""
+    keep = np.ones(len(df), dtype=bool)
+    for dim, values in selections.items():
+        if dim == skip:
+            continue
+        if dim == 'Support':
+            rows = long_table.loc[long_table['Support'].isin(values), 'row_id'].unique()
+            keep &= np.isin(np.arange(len(df)), rows)
+        else:
+            keep &= df[dim].isin(values).to_numpy()
+    return keep
+
+
+def dataframe_selection(df, long_table, selections):
+    """Every chart and KPI the way a per-click DataFrame filter would build them"""
+    keep = frame_filter(df, long_table, selections)
+    results = [keep.sum(), df.loc[keep, 'Activity Duration'].sum(), df.loc[keep, 'Travel'].sum()]
+    for dim in cube_dimensions:
+        results.append(df.loc[frame_filter(df, long_table, selections, skip=dim), dim].value_counts())
+    rows = np.flatnonzero(frame_filter(df, long_table, selections, skip='Support'))
+    results.append(long_table.loc[long_table['row_id'].isin(rows), 'Support'].value_counts())
+    return results
+
+
+def bitmap_selection(index, selections, lo=0, hi=None):
+    view = index.slice(selections, lo, hi)
+    results = [view.rows, view.total('Activity Duration'), view.total('Travel')]
+    results += [view.counts(dim) for dim in cube_dimensions]
+    results.append(view.support_counts())
+    return results
+
+
+def most_common(column):
+    return column.value_counts().index[0]
+
+
+def timed(label, fn, runs=3):
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    print(f"   {label:<44} {best * 1000:9.1f}ms")
+    return best
+
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = report_frame(n_rows).rename(columns={'Type of Coordination/Navigation Provided:': 'Support'}).reset_index(drop=True)
+    long_table = support_table(df)
+
+    started = time.perf_counter()
+    index = BitmapIndex(df)
+    build_seconds = time.perf_counter() - started
+    size_mb = sum(bitmaps.nbytes for bitmaps in index.bitmaps.values()) / 1024 / 1024
+    print(f"\n🧮 Bitmap index over {n_rows:,} rows: {build_seconds:.2f}s, {size_mb:.1f} MB")
+
+    # One, two and four clicked charts, using the most common values
+    gender, location, support = most_common(df['Gender']), most_common(df['Location']), most_common(long_table['Support'])
+    zips = df['ZIP2'].value_counts().index[:2].tolist()
+    cases = [
+        ('Gender', {'Gender': [gender]}),
+        ('Gender + 2 ZIPs', {'Gender': [gender], 'ZIP2': zips}),
+        ('Gender + 2 ZIPs + Location + Support', {'Gender': [gender], 'ZIP2': zips, 'Location': [location], 'Support': [support]}),
+    ]
+
+    # Same rows counted both ways
+    for _, selections in cases:
+        assert bitmap_selection(index, selections)[0] == dataframe_selection(df, long_table, selections)[0]
+
+    print("\n📊 Cross-filter selection latency, all charts and KPIs (best of 3)")
+    for label, selections in cases:
+        print(f"  {label}")
+        frame_seconds = timed('DataFrame filters + value_counts', lambda: dataframe_selection(df, long_table, selections))
+        bitmap_seconds = timed('bitmap ANDs + popcounts', lambda: bitmap_selection(index, selections))
+        print(f"   ✅ {frame_seconds / bitmap_seconds:.1f}x faster")
+
+    # Date ranges only touch the bytes they cover
+    dates = DateRangeIndex(df)
+    dated = BitmapIndex(df, order=dates.order)
+    month = dates.slice('2025-03-01', '2025-03-31')
+    print(f"  One month ({month.rows:,} rows), {cases[-1][0]}")
+    timed('bitmap ANDs + popcounts', lambda: bitmap_selection(dated, cases[-1][1], month.lo, month.hi))
@@ -0,0 +1,231 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+
+from aggregates import dimension_codes, observed_series, count_frame, ties_by_appearance, split_dimensions, split_mentions, mention_tokens
+from cube import cube_dimensions, cube_measures
+from support_types import support_table
+
+# =================================== CONFIG ================================== #
+
+# Set bits per byte, and the offset of the first set bit (np.packbits is big-endian: bit 7 is the first row)
+byte_popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+byte_first_bit = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).argmax(axis=1)
+
+# ============================== Bitmap Index ============================== #
+
+def popcount(packed):
+    """Set bits along the last axis of a packed uint8 array"""
+    if hasattr(np, 'bitwise_count'):  # NumPy 2
+        return np.bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+    return byte_popcount[packed].sum(axis=-1, dtype=np.int64)
+
+
+def packed_bitmaps(codes, positions, n_labels, n_bytes):
+    """[label, byte] packed bitmaps with bit `position` set for each (code, position) pair"""
+    key = codes * n_bytes + (positions >> 3)
+    sorter = np.argsort(key, kind='stable')
+    key = key[sorter]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else np.zeros(0, dtype=np.int64)
+    flat = np.zeros(n_labels * n_bytes, dtype=np.uint8)
+    if len(key):
+        # Each row owns a distinct bit of its byte, so summing the bit weights is an OR
+        weights = (128 >> (positions[sorter] & 7)).astype(np.uint8)
+        flat[key[starts]] = np.add.reduceat(weights, starts, dtype=np.uint8)
+    return flat.reshape(n_labels, n_bytes)
+
+
+class BitmapIndex:
+    """
+    One packed bitmap per (dimension, value) over row ids, for cross-filtering.
+    A multi-chart selection is an OR of bitmaps within each dimension and an AND
+    across dimensions; every chart's counts are then popcounts of the selection
+    against that chart's bitmaps. Support types and split dimensions (Person: 'A, B')
+    get bitmaps of the rows naming each value, plus the extra mentions of rows that
+    name a value more than once, so their counts are mentions like Aggregates'.
+
+    order lists the rows of df in index order (DateRangeIndex.order), so a date
+    range is a contiguous run of bits and slices only touch the bytes it covers.
+    long_table is support_table(df), when the caller already has it.
+    """
+
+    def __init__(self, df, order=None, dimensions=None, measures=None, long_table=None, split=None):
+        dimensions = cube_dimensions if dimensions is None else dimensions
+        measures = cube_measures if measures is None else measures
+        split = split_dimensions if split is None else split
+        self.order = np.arange(len(df)) if order is None else np.asarray(order, dtype=np.int64)
+        self.n_rows = len(self.order)
+        self.n_bytes = (self.n_rows + 7) // 8
+        bit = np.arange(self.n_rows, dtype=np.int64)
+
+        self.values = {
+            measure: np.nan_to_num(pd.to_numeric(df[measure], errors='coerce').to_numpy(dtype='float64')[self.order])
+            for measure in measures
+        }
+
+        self.labels = {}
+        self.category_dtypes = {}
+        self.bitmaps = {}
+        self.mentions = {}
+        position = np.full(len(df), -1, dtype=np.int64)
+        position[self.order] = bit
+        for dim in dimensions:
+            if dim in split:
+                row_id, codes, labels = split_mentions(df[dim], split[dim])
+                self._add_mentions(dim, position[row_id], codes, mention_tokens(row_id), labels)
+                continue
+            codes, labels = dimension_codes(df[dim])
+            codes = np.asarray(codes, dtype=np.int64)[self.order]
+            present = codes >= 0
+            self.labels[dim] = labels
+            self.category_dtypes[dim] = df[dim].dtype if isinstance(df[dim].dtype, pd.CategoricalDtype) else None
+            self.bitmaps[dim] = packed_bitmaps(codes[present], bit[present], len(labels), self.n_bytes)
+
+        long_table = support_table(df) if long_table is None else long_table
+        row_id = long_table['row_id'].to_numpy()
+        self._add_mentions(
+            'Support', position[row_id], long_table['Support'].cat.codes.to_numpy(dtype=np.int64),
+            mention_tokens(row_id), long_table['Support'].cat.categories,
+        )
+
+        # Clicked values arrive as text (ZIPs may come back as numbers)
+        self._lookup = {
+            dim: {str(label): code for code, label in enumerate(labels)}
+            for dim, labels in self.labels.items()
+        }
+
+    def _add_mentions(self, dim, rows, codes, token, labels):
+        """
+        Bitmaps for a dimension a row can name several values of: one bit per (value, row)
+        for selecting rows, and for a row naming a value k times k - 1 extra mentions,
+        added back when counting
+        """
+        keep = (rows >= 0) & (codes >= 0)
+        width = max(self.n_rows, 1)
+        pairs, first_mention, mentions = np.unique(codes[keep] * width + rows[keep], return_index=True, return_counts=True)
+        self.labels[dim] = labels
+        self.category_dtypes[dim] = None
+        self.bitmaps[dim] = packed_bitmaps(pairs // width, pairs % width, len(labels), self.n_bytes)
+        repeated = mentions > 1
+        self.mentions[dim] = {
+            # Where in its row each (value, row) pair is first named, for first-mention order
+            'pairs': pairs,
+            'token': token[keep][first_mention],
+            'extra': (pairs[repeated] // width, pairs[repeated] % width, mentions[repeated] - 1),
+        }
+
+    def range_mask(self, lo=0, hi=None):
+        """Packed bitmap of rows lo .. hi-1 (index order)"""
+        hi = self.n_rows if hi is None else hi
+        mask = np.zeros(self.n_bytes, dtype=np.uint8)
+        first, last = lo >> 3, (hi + 7) >> 3
+        if hi > lo:
+            bits = np.zeros((last - first) * 8, dtype=bool)
+            bits[lo - first * 8:hi - first * 8] = True
+            mask[first:last] = np.packbits(bits)
+        return mask
+
+    def value_mask(self, dim, values, first_byte=0, last_byte=None):
+        """OR of the bitmaps of the selected values of one dimension (unknown values match nothing)"""
+        last_byte = self.n_bytes if last_byte is None else last_byte
+        codes = [self._lookup[dim][str(v)] for v in values if str(v) in self._lookup[dim]]
+        if not codes:
+            return np.zeros(last_byte - first_byte, dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[dim][codes, first_byte:last_byte], axis=0)
+
+    def select(self, selections, base=None):
+        """AND of value_mask() over the selected dimensions, within base (all rows by default)"""
+        mask = self.range_mask() if base is None else base.copy()
+        for dim, values in selections.items():
+            if values:
+                mask &= self.value_mask(dim, values)
+        return mask
+
+    def slice(self, selections=None, lo=0, hi=None):
+        """Cross-filtered view of rows lo .. hi-1, same interface as a cube slice"""
+        return BitmapSlice(self, selections or {}, lo, self.n_rows if hi is None else hi)
+
+
+class BitmapSlice:
+    """
+    Counts and totals for one cross-filter selection. KPIs count the full selection;
+    each chart ignores its own dimension's selection, so the other values stay
+    visible and clickable.
+    """
+
+    def __init__(self, index, selections, lo, hi):
+        self.index = index
+        self.selections = {dim: list(values) for dim, values in selections.items() if values}
+        self.lo, self.hi = lo, hi
+        # Only the bytes the range covers take part in the ANDs and popcounts
+        self.first_byte, self.last_byte = lo >> 3, (hi + 7) >> 3
+        self._base = index.range_mask(lo, hi)[self.first_byte:self.last_byte]
+        self._masks = {}
+        self.mask = self._mask(None)
+        self.rows = int(popcount(self.mask))
+
+    def _mask(self, skip):
+        """Selection over the range, without the selection on dimension skip"""
+        key = skip if skip in self.selections else None
+        if key not in self._masks:
+            mask = self._base.copy()
+            for dim, values in self.selections.items():
+                if dim != key:
+                    mask &= self.index.value_mask(dim, values, self.first_byte, self.last_byte)
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def total(self, measure):
+        start = self.first_byte * 8
+        rows = np.unpackbits(self.mask, count=self.hi - start).astype(bool)
+        return self.index.values[measure][start:self.hi][rows].sum()
+
+    def _popcounts(self, dim):
+        """(count per label, first selected row per label) for one dimension"""
+        hits = self.index.bitmaps[dim][:, self.first_byte:self.last_byte] & self._mask(dim)
+        counts = popcount(hits)
+        if not hits.shape[1]:
+            return counts, np.zeros(len(hits), dtype=np.int64)
+        nonzero = hits != 0
+        first_byte = nonzero.argmax(axis=1)
+        first = (first_byte + self.first_byte) * 8 + byte_first_bit[hits[np.arange(len(hits)), first_byte]]
+        return counts, first
+
+    def counts(self, dim, order='count', name='Count'):
+        """[dim, name] frame of row counts, same order rules as Aggregates.counts"""
+        index = self.index
+        if dim in index.mentions:
+            counts, ranked = self._mention_counts(dim)
+            labels = pd.Index(np.asarray(index.labels[dim], dtype=object)[ranked], name=dim)
+            return count_frame(pd.Series(counts[ranked], index=labels), order, name)
+        counts, first = self._popcounts(dim)
+        observed = counts > 0
+        series = observed_series(dim, index.labels[dim], counts, observed, index.category_dtypes[dim])
+        if ties_by_appearance(index.category_dtypes[dim]):
+            # Labels in the order the selected rows first meet them
+            series = series.iloc[np.argsort(first[observed], kind='stable')]
+        return count_frame(series, order, name)
+
+    def _mention_counts(self, dim):
+        """(mentions per label, observed labels in first-mention order) for a multi-valued dimension"""
+        mentions = self.index.mentions[dim]
+        counts, first = self._popcounts(dim)
+        # Rows that name a value more than once count once per mention
+        codes, bits, extra = mentions['extra']
+        inside = (bits >= self.lo) & (bits < self.hi)
+        codes, bits, extra = codes[inside], bits[inside] - self.first_byte * 8, extra[inside]
+        selected = (self._mask(dim)[bits >> 3] >> (7 - (bits & 7))) & 1
+        counts = counts + np.bincount(codes, weights=extra * selected, minlength=len(counts)).astype(np.int64)
+        # Values first named in the same row keep the order the row names them
+        ranked = np.flatnonzero(counts > 0)
+        token = mentions['token'][np.searchsorted(mentions['pairs'], ranked * max(self.index.n_rows, 1) + first[ranked])]
+        return counts, ranked[np.lexsort((token, first[ranked]))]
+
+    def support_counts(self, name='Support'):
+        """Mentions of each support type, in first-mention order (like support_counts)"""
+        counts, ranked = self._mention_counts('Support')
+        return pd.DataFrame({
+            name: np.asarray(self.index.labels['Support'], dtype=object)[ranked],
+            'Count': counts[ranked],
+        })
@@ -0,0 +1,310 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import infer_dtype
+from pandas.util import hash_pandas_object
+
+# =================================== CONFIG ================================== #
+
+# Low-cardinality form fields (raw sheet headers), kept as pandas categories after cleaning.
+# Dashboards rename these to Person, Location, Insurance, Status, Gender, Ethnicity, Housing, Income.
+dimension_columns = [
+    'Person submitting this form:',
+    'Location Encountered:',
+    "Individual's Insurance Status:",
+    "Individual's Status:",
+    'Gender:',
+    'Race / Ethnicity:',
+    'Housing Status',
+    'Income Level',
+]
+
+# Seed for filling in missing dates of birth; the same seed gives the same ages on every worker
+dob_seed = os.getenv("DOB_SEED", "bmhc-navigation")
+
+# Missing dates of birth are drawn from this range (inclusive start, exclusive end)
+dob_range = (pd.Timestamp(1950, 1, 1), pd.Timestamp(2000, 12, 31))
+
+# Age buckets for the age charts; ages that can't be computed go to 'N/A'
+age_bins = [0, 10, 20, 30, 40, 50, 60, 70, 80, np.inf]
+age_groups = ['0-9', '10-19', '20-29', '30-39', '40-49', '50-59', '60-69', '70-79', '80+', 'N/A']
+
+# ============================== Cleaning Stage ============================== #
+
+def appearance_categories(codes, uniques):
+    """Category column with categories in order of first appearance in the rows"""
+    first_seen = pd.unique(codes[codes >= 0])
+    remap = np.full(len(uniques), -1)
+    remap[first_seen] = np.arange(len(first_seen))
+    new_codes = np.full(len(codes), -1)
+    seen = codes >= 0
+    new_codes[seen] = remap[codes[seen]]
+    return pd.Categorical.from_codes(new_codes, uniques[first_seen])
+
+
+def strip_values(values):
+    """Strip an array of distinct strings in one Arrow kernel call"""
+    trimmed = pc.utf8_trim_whitespace(pa.array(np.asarray(values, dtype=object), type=pa.string()))
+    return trimmed.to_numpy(zero_copy_only=False)
+
+
+def needs_strip(col):
+    """True when any string in an all-string column has surrounding whitespace"""
+    arr = pa.array(col.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    return not pc.all(pc.equal(arr, pc.utf8_trim_whitespace(arr))).as_py()
+
+
+def strip_column(col, as_category=False):
+    """
+    Strip surrounding whitespace from the strings in one column, leaving other values alone.
+    Each distinct value is stripped once. With as_category the result is a category column
+    ordered by first appearance, so value_counts() ties come out as they do on plain strings.
+    """
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        if col.cat.categories.dtype != object:
+            return col
+        codes, values = col.cat.codes.to_numpy(), col.cat.categories
+    elif infer_dtype(col, skipna=True) in ('string', 'empty'):
+        if not as_category and not needs_strip(col):
+            # Most columns (timestamps, names) have nothing to strip: no per-value work at all
+            return col
+        codes, values = pd.factorize(col)
+    else:
+        # Numbers mixed in with text (factorize would merge 1 and 1.0): strip just the strings
+        stripped = col.map(lambda x: x.strip() if isinstance(x, str) else x)
+        if as_category:
+            return pd.Series(appearance_categories(*pd.factorize(stripped)), index=col.index, name=col.name)
+        return stripped
+
+    stripped = strip_values(values)
+    if (stripped == np.asarray(values, dtype=object)).all():
+        # Nothing to strip (e.g. timestamps): keep the column as it is
+        if not as_category:
+            return col
+        new_codes, uniques = codes, pd.Index(stripped, dtype=object)
+    else:
+        # Values that only differed by whitespace now share one code
+        stripped_codes, uniques = pd.factorize(stripped)
+        new_codes = np.full(len(codes), -1)
+        present = codes >= 0
+        new_codes[present] = stripped_codes[codes[present]]
+
+    if as_category:
+        return pd.Series(appearance_categories(new_codes, uniques), index=col.index, name=col.name)
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return pd.Series(pd.Categorical.from_codes(new_codes, uniques), index=col.index, name=col.name)
+
+    out = np.asarray(uniques, dtype=object)[new_codes]
+    missing = new_codes < 0
+    if missing.any():
+        # Keep None / NaN exactly as they were
+        out[missing] = col.to_numpy(dtype=object)[missing]
+    return pd.Series(out, index=col.index, name=col.name, dtype=object)
+
+
+def strip_strings(df, dimensions=()):
+    """Vectorized replacement for df[col].map(lambda x: x.strip() if isinstance(x, str) else x)"""
+    df.columns = df.columns.str.strip()
+    for col in df.select_dtypes(include=['object', 'category']).columns:
+        df[col] = strip_column(df[col], as_category=col in dimensions)
+    return df
+
+
+def clean_stage(df, dimensions=None):
+    """Strip column names and string values; dimension columns come back as categories"""
+    dimensions = dimension_columns if dimensions is None else dimensions
+    return strip_strings(df, set(dimensions))
+
+# =========================== Normalization Registry =========================== #
+
+# One mapping table per (renamed) column, shared by both dashboards. Each map is applied
+# once per distinct value and the results are broadcast back to the rows.
+normalization_maps = {
+    'Travel': {
+        'The Bumgalows': '0',
+    },
+    'Ethnicity': {
+        "Hispanic/Latino": "Hispanic/ Latino",
+        "White": "White/ European Ancestry",
+        "White/ European Ancestry": "White / Caucasian",
+        "Group search": "N/A",
+    },
+    'Gender': {
+        "Group search": "N/A",
+    },
+    'Insurance': {
+        '': 'Unknown',
+        'unknown': 'Unknown',
+        'Just got it!!!': 'Private Insurance',
+        'Medicare': 'Medicaid',
+        'NONE': 'None',
+        'Map 000': 'MAP 100',
+        '30 Day 100': '30 DAY 100',
+        '30 DAY100': '30 DAY 100',
+        '30DAY 100': '30 DAY 100',
+    },
+    'Location': {
+        "": "N/A",
+    },
+    'Status': {
+        "": "N/A",
+        "Group search": "N/A",
+    },
+    'Housing': {
+        "": "N/A",
+    },
+    'Income': {
+        "$0": "N/A",
+        "": "N/A",
+        "Unknown": "N/A",
+        "unknown": "N/A",
+        "?": "N/A",
+    },
+    'Person': {
+        'Dominique': 'Dominique Street',
+        'Jaqueline Ovieod': 'Jaqueline Oviedo',
+        'Eric roberts': 'Eric Roberts',
+        'EricRoberts': 'Eric Roberts',
+        'Dr Larry Wallace Jr': 'Larry Wallace Jr',
+        'Sonya': 'Sonya Hosey',
+    },
+}
+
+# Columns read as text first (.astype(str)): numbers and blanks become '30.0', 'nan', ...
+# Everything else keeps .str semantics, where non-strings become NaN.
+text_columns = {'Travel', 'Ethnicity', 'Gender'}
+
+
+def compile_map(mapping, as_text=False):
+    """Function from an array of distinct raw values to their cleaned, remapped values"""
+    def apply(values):
+        if as_text:
+            cleaned = [str(v).strip() for v in values]
+        else:
+            cleaned = [v.strip() if isinstance(v, str) else np.nan for v in values]
+        return np.array([mapping.get(v, v) if isinstance(v, str) else v for v in cleaned], dtype=object)
+    return apply
+
+
+compiled_maps = {name: compile_map(mapping, name in text_columns) for name, mapping in normalization_maps.items()}
+
+
+def normalize_categories(col, apply):
+    """
+    Category column mapped one category at a time; categories that map to the same
+    value are merged, and the result stays a category column in first-appearance order
+    """
+    codes = col.cat.codes.to_numpy()
+    # Blank cells map like any other value ('nan' as text), so they get one extra slot
+    values = np.append(np.asarray(col.cat.categories, dtype=object), np.nan)
+    mapped_codes, uniques = pd.factorize(apply(values))
+    new_codes = mapped_codes[np.where(codes < 0, len(values) - 1, codes)]
+    return pd.Series(appearance_categories(new_codes, pd.Index(uniques, dtype=object)), index=col.index, name=col.name)
+
+
+def normalize_column(col, name):
+    """
+    Same result as col(.astype(str)).str.strip().replace(map), computed on the
+    distinct values (category codes or factorized uniques) instead of every row.
+    Category columns (clean_stage dimensions) stay categories.
+    """
+    apply = compiled_maps.get(name) or compile_map({}, name in text_columns)
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return normalize_categories(col, apply)
+    if col.dtype != object or infer_dtype(col, skipna=True) in ('string', 'empty'):
+        codes, uniques = pd.factorize(col)
+    else:
+        # Mixed numbers and text (factorize would merge 1 and 1.0): map row by row
+        return pd.Series(apply(col.to_numpy(dtype=object)), index=col.index, name=col.name)
+
+    out = apply(np.asarray(uniques, dtype=object))[codes] if len(uniques) else np.empty(len(col), dtype=object)
+    missing = codes < 0
+    if missing.any():
+        # Blank cells: None/NaN give 'None'/'nan' as text, NaN otherwise
+        out[missing] = apply(col.to_numpy(dtype=object)[missing])
+    return pd.Series(out, index=col.index, name=col.name, dtype=object)
+
+
+def normalize(df, columns=None):
+    """Apply the normalization registry to every mapped column present in df"""
+    for name in (normalization_maps if columns is None else columns):
+        if name in df.columns:
+            df[name] = normalize_column(df[name], name)
+    return df
+
+# ================================ Ages ================================ #
+
+def row_hashes(df, columns, index=False):
+    """Stable 64-bit hash per row of the given columns (and the index label), salted with dob_seed"""
+    hash_key = hashlib.sha256(dob_seed.encode('utf-8')).hexdigest()[:16]
+    return hash_pandas_object(df[columns].astype(str), index=index, hash_key=hash_key).to_numpy()
+
+
+def unnamed_rows(names):
+    """Rows whose name is only blanks and the 'nan'/'None' text of empty name cells"""
+    text = names.astype(str).str.replace(r'\b(?:nan|NaN|None)\b', '', regex=True).str.strip()
+    return (text == '').to_numpy()
+
+
+def keyed_draws(hashes, span):
+    """One draw in [0, span) per distinct hash, from default_rng seeded with dob_seed and the hash"""
+    salt = int(hashlib.sha256(dob_seed.encode('utf-8')).hexdigest()[:16], 16)
+    uniques, inverse = np.unique(hashes, return_inverse=True)
+    draws = np.array([np.random.default_rng([salt, int(h)]).integers(span) for h in uniques], dtype=np.int64)
+    return draws[inverse]
+
+
+def impute_birthdates(df, column="Individual's Date of Birth:", key_columns=('Full Name',),
+                      row_columns=('Timestamp', 'Date of Activity', 'Location')):
+    """
+    Parse dates of birth and fill the missing ones with a date in dob_range drawn from a
+    generator keyed by key_columns, so one client gets the same date on every worker,
+    restart and month. Rows without a name are keyed by row_columns and their sheet row
+    (the index) instead, so unnamed clients don't all share one date.
+    """
+    dob = pd.to_datetime(df[column], errors='coerce')
+    missing = dob.isna().to_numpy()
+    if missing.any():
+        start, end = dob_range
+        span = (end - start).days
+        df_missing = df.loc[missing]
+        hashes = row_hashes(df_missing, list(key_columns))
+        unnamed = unnamed_rows(df_missing[key_columns[0]])
+        if unnamed.any():
+            columns = list(key_columns) + [c for c in row_columns if c in df.columns]
+            hashes[unnamed] = row_hashes(df_missing.loc[unnamed], columns, index=True)
+        filled = dob.to_numpy(dtype='datetime64[ns]')
+        filled[missing] = np.datetime64(start, 'ns') + keyed_draws(hashes, span).astype('timedelta64[D]')
+        dob = pd.Series(filled, index=df.index, name=column)
+    return dob
+
+
+def age_at(dob, when):
+    """Whole years from dob to when (both datetime Series); <NA> when either is missing or when < dob"""
+    when = when.fillna(pd.Timestamp('today').normalize())
+    years = when.dt.year - dob.dt.year
+    # One year less when the birthday hasn't come round yet that year
+    before_birthday = (when.dt.month < dob.dt.month) | ((when.dt.month == dob.dt.month) & (when.dt.day < dob.dt.day))
+    ages = (years - before_birthday.astype(int)).astype('Int64')
+    return ages.mask(ages < 0)
+
+
+def bucket_ages(ages):
+    """Ordered age-group category per age; missing ages go to 'N/A'"""
+    groups = pd.cut(ages.astype('float64'), bins=age_bins, labels=age_groups[:-1], right=False)
+    groups = groups.cat.set_categories(age_groups, ordered=True)
+    return groups.fillna('N/A')
+
+
+def age_stage(df, activity_column='Date of Activity'):
+    """Fill in dates of birth, then add 'Client Age' (at the activity date) and 'Age_Group'"""
+    df["Individual's Date of Birth:"] = impute_birthdates(df)
+    df['Client Age'] = age_at(df["Individual's Date of Birth:"], df[activity_column])
+    df['Age_Group'] = bucket_ages(df['Client Age'])
+    return df
@@ -0,0 +1,83 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+# =================================== CONFIG ================================== #
+
+# Key for rows with no usable name; never matches anything
+no_identity = np.uint64(0)
+
+first_name_column = "Individual's First Name:"
+last_name_column = "Individual's Last Name:"
+dob_column = "Individual's Date of Birth:"
+
+# ============================== Identity Keys ============================== #
+
+def fold_names(col):
+    """Case- and whitespace-folded names; blanks and missing values become <NA>"""
+    folded = col.astype('string').str.casefold().str.replace(r'\s+', ' ', regex=True).str.strip()
+    return folded.mask(folded.isin(['', 'nan', 'none']))
+
+
+def identity_keys(first, last=None, dob=None):
+    """
+    Fixed-width (uint64) client key per row from a first and last name, or from one
+    full-name column when last is None. With dob the date of birth is part of the key.
+    Rows without a name get no_identity.
+    """
+    if last is None:
+        name = fold_names(first)
+    else:
+        # Fold each part first, so a missing last name keys on the first name, not 'ann nan'
+        name = fold_names(first).fillna('').str.cat(fold_names(last).fillna(''), sep=' ').str.strip()
+        name = name.mask(name == '')
+    if dob is not None:
+        born = pd.to_datetime(dob, errors='coerce').dt.strftime('%Y-%m-%d').fillna('')
+        name = name + '|' + born
+    keys = hash_pandas_object(name.fillna(''), index=False).to_numpy()
+    keys[name.isna().to_numpy()] = no_identity
+    return pd.Series(keys, index=first.index, name='Client Key')
+
+
+def frame_keys(df, dob=False):
+    """identity_keys for a navigation frame (raw or stripped column names)"""
+    columns = {str(c).strip(): c for c in df.columns}
+    first = df[columns[first_name_column]]
+    last = df[columns[last_name_column]]
+    return identity_keys(first, last, df[columns[dob_column]] if dob else None)
+
+# ============================== Client Index ============================== #
+
+def duplicated_clients(keys):
+    """Rows whose client appears more than once (like duplicated(keep=False), named rows only)"""
+    keys = pd.Series(keys)
+    return (keys.duplicated(keep=False) & (keys != no_identity)).to_numpy()
+
+
+def missing_from(keys, other_keys):
+    """Rows whose client has no row in other_keys (hash join; unnamed rows count as missing)"""
+    keys = pd.Series(keys)
+    found = keys.isin(pd.unique(np.asarray(other_keys)))
+    return (~found | (keys == no_identity)).to_numpy()
+
+
+class ClientIndex:
+    """First visit per client across every month loaded, for returning-client lookups"""
+
+    def __init__(self, keys, dates):
+        history = pd.DataFrame({'key': np.asarray(keys), 'date': pd.to_datetime(np.asarray(dates), errors='coerce')})
+        history = history[history['key'] != no_identity]
+        self.first_seen = history.groupby('key', sort=False)['date'].min()
+
+    @classmethod
+    def from_frame(cls, df, date_column='Date of Activity'):
+        columns = {str(c).strip(): c for c in df.columns}
+        return cls(frame_keys(df), df[columns[date_column]])
+
+    def returning(self, keys, dates):
+        """True where the client had a visit before this row's date"""
+        first = self.first_seen.reindex(np.asarray(keys)).to_numpy()
+        dates = pd.to_datetime(np.asarray(dates), errors='coerce')
+        return np.asarray(pd.notna(first) & (first < dates), dtype=bool)
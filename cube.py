@@ -0,0 +1,178 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+
+from aggregates import dimension_codes, observed_series, count_frame, ties_by_appearance, split_dimensions, split_mentions, mention_tokens
+from support_types import support_table
+
+# =================================== CONFIG ================================== #
+
+# Dimensions and measures the cube is pre-aggregated over (besides year and month)
+cube_dimensions = [
+    'Location', 'Person', 'Gender', 'Ethnicity', 'Insurance', 'Age_Group',
+    'Status', 'Housing', 'Income', 'ZIP2',
+]
+cube_measures = ['Activity Duration', 'Travel']
+
+# ============================== Report Cube ============================== #
+
+def cube_table(row_codes, positions, weights=None):
+    """
+    One cell per observed combination of row_codes, as flat arrays: the codes of each
+    cell, its row count, its first row position and (optionally) measure sums
+    """
+    cell = pd.DataFrame(row_codes).groupby(list(row_codes), sort=False).ngroup().to_numpy()
+    n_cells = int(cell.max()) + 1 if len(cell) else 0
+    codes = {}
+    for name, values in row_codes.items():
+        cell_codes = np.empty(n_cells, dtype=np.int32)
+        cell_codes[cell] = values
+        codes[name] = cell_codes
+    return {
+        'codes': codes,
+        'count': np.bincount(cell, minlength=n_cells),
+        'first': pd.Series(positions).groupby(cell).min().to_numpy(),
+        'sums': {measure: np.bincount(cell, weights=w, minlength=n_cells) for measure, w in (weights or {}).items()},
+    }
+
+
+class NavigationCube:
+    """
+    The report pre-aggregated once per dataset version, as one small cube per
+    dimension keyed by (year, month, Location, value), plus a (year, month, Location)
+    cube for the row counts and measure totals. Each is kept as flat NumPy arrays
+    (a code array per key, a row count, a first row position). A month,
+    location or month + location view is a mask over one dimension's cells and a
+    bincount, never a pass over the rows. Support types get their own
+    (year, month, Location, Support) cube, since one answer can name several;
+    split dimensions (Person: 'A, B') count each name a row lists, like Aggregates.
+
+    order lists the rows of df in the order equal counts are ranked by. Pass
+    DateRangeIndex.order, so a month slice ranks ties exactly like the same month
+    taken as a date range or a bitmap slice (earliest activity first).
+    long_table is support_table(df), when the caller already has it.
+    """
+
+    def __init__(self, df, order=None, dimensions=None, measures=None, date_column='Date of Activity', long_table=None, split=None):
+        dimensions = cube_dimensions if dimensions is None else dimensions
+        measures = cube_measures if measures is None else measures
+        split = split_dimensions if split is None else split
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+        # Rows left out of order (no date) rank after the others, in frame order
+        positions = np.arange(len(df), dtype=np.int64) + len(df)
+        if order is not None:
+            positions[np.asarray(order, dtype=np.int64)] = np.arange(len(order))
+        location_codes, self.location_labels = dimension_codes(df['Location'])
+        keys = {
+            'year': dates.dt.year.fillna(-1).to_numpy(dtype=np.int64),
+            'month': dates.dt.month.fillna(-1).to_numpy(dtype=np.int64),
+            'Location': np.asarray(location_codes, dtype=np.int64),
+        }
+
+        weights = {}
+        for measure in measures:
+            values = pd.to_numeric(df[measure], errors='coerce').to_numpy(dtype='float64')
+            weights[measure] = np.where(np.isnan(values), 0.0, values)
+        self.totals = cube_table(keys, positions, weights)
+
+        self.labels = {}
+        self.category_dtypes = {}
+        self.tables = {}
+        for dim in dimensions:
+            if dim in split:
+                # One entry per name, first mention ranked by (row position, place in the row)
+                row_id, codes, self.labels[dim] = split_mentions(df[dim], split[dim])
+                token = mention_tokens(row_id)
+                width = int(token.max()) + 1 if len(token) else 1
+                self.category_dtypes[dim] = None
+                self.tables[dim] = cube_table(
+                    {**{key: key_codes[row_id] for key, key_codes in keys.items()}, dim: np.asarray(codes, dtype=np.int64)},
+                    positions[row_id] * width + token,
+                )
+                continue
+            codes, self.labels[dim] = dimension_codes(df[dim])
+            self.category_dtypes[dim] = df[dim].dtype if isinstance(df[dim].dtype, pd.CategoricalDtype) else None
+            # Location is already a key, so its cube is the totals cube
+            self.tables[dim] = self.totals if dim == 'Location' else cube_table(
+                {**keys, dim: np.asarray(codes, dtype=np.int64)}, positions)
+
+        # Support cube: long table cells, first mention ranked by (row position, token order)
+        long_table = support_table(df) if long_table is None else long_table
+        row_id = long_table['row_id'].to_numpy()
+        token = long_table.groupby('row_id', sort=False).cumcount().to_numpy()
+        width = int(token.max()) + 1 if len(token) else 1
+        self.support_labels = long_table['Support'].cat.categories
+        self.tables['Support'] = cube_table(
+            {**{key: codes[row_id] for key, codes in keys.items()}, 'Support': long_table['Support'].cat.codes.to_numpy(dtype=np.int64)},
+            positions[row_id] * width + token,
+        )
+
+    @property
+    def n_cells(self):
+        return sum(len(table['count']) for table in self.tables.values())
+
+    def cells(self, table, year, month=None, location=None):
+        """Mask over one cube's cells for one year, optionally one month and one location"""
+        codes = table['codes']
+        mask = codes['year'] == int(year)
+        if month is not None:
+            mask &= codes['month'] == int(month)
+        if location is not None:
+            found = np.flatnonzero(np.asarray(self.location_labels, dtype=object) == location)
+            mask &= codes['Location'] == (found[0] if len(found) else -2)
+        return mask
+
+    def slice(self, year, month=None, location=None):
+        """View of one year, month or month + location"""
+        return CubeSlice(self, year, month, location)
+
+
+class CubeSlice:
+    """Counts and totals for one slice of a NavigationCube, read off the per-dimension cells"""
+
+    def __init__(self, cube, year, month=None, location=None):
+        self.cube = cube
+        self.year, self.month, self.location = year, month, location
+        self.mask = cube.cells(cube.totals, year, month, location)
+        self.rows = int(cube.totals['count'][self.mask].sum())
+
+    def total(self, measure):
+        return self.cube.totals['sums'][measure][self.mask].sum()
+
+    def _cells(self, dim):
+        """(codes, row counts, first positions) of the cells of one dimension's cube in this slice"""
+        table = self.cube.tables[dim]
+        mask = self.cube.cells(table, self.year, self.month, self.location)
+        codes = table['codes'][dim][mask]
+        present = codes >= 0
+        return codes[present], table['count'][mask][present], table['first'][mask][present]
+
+    def counts(self, dim, order='count', name='Count'):
+        """[dim, name] frame of row counts, same order rules as Aggregates.counts"""
+        cube = self.cube
+        labels = cube.labels[dim]
+        codes, cell_counts, cell_first = self._cells(dim)
+        counts = np.bincount(codes, weights=cell_counts, minlength=len(labels)).astype(np.int64)
+        observed = counts > 0
+        series = observed_series(dim, labels, counts, observed, cube.category_dtypes[dim])
+        if ties_by_appearance(cube.category_dtypes[dim]):
+            # Labels in the order the slice's rows first meet them
+            first = np.full(len(labels), np.iinfo(np.int64).max)
+            np.minimum.at(first, codes, cell_first)
+            series = series.iloc[np.argsort(first[observed], kind='stable')]
+        return count_frame(series, order, name)
+
+    def support_counts(self, name='Support'):
+        """Count of each support type in first-mention order (like support_counts)"""
+        labels = self.cube.support_labels
+        codes, cell_counts, cell_first = self._cells('Support')
+        counts = np.bincount(codes, weights=cell_counts, minlength=len(labels))
+        firsts = np.full(len(labels), np.iinfo(np.int64).max)
+        np.minimum.at(firsts, codes, cell_first)
+        order = np.flatnonzero(counts > 0)
+        order = order[np.argsort(firsts[order], kind='stable')]
+        return pd.DataFrame({
+            name: np.asarray(labels, dtype=object)[order],
+            'Count': counts[order].astype(np.int64),
+        })
@@ -0,0 +1,202 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+
+import pandas as pd
+from gspread.utils import extract_id_from_url
+
+from sheets_client import get_client
+from sheet_cache import load_records, records_frame, sheet_revision
+from sheet_sync import grid_from_values
+
+# =================================== CONFIG ================================== #
+
+# Where the dashboards read from:
+#   unset / 'sheets'       -> Google Sheets (needs credentials)
+#   'csv:<folder>'         -> <folder>/<name>.csv, <folder>/<name>__<worksheet>.csv
+#   'parquet:<folder>'     -> same layout with .parquet files
+#   'sqlite:<file.db>'     -> tables named <name> and <name>__<worksheet>
+data_source = os.getenv("DATA_SOURCE", "sheets")
+
+# Seconds any one source may take to load before startup gives up on it
+fetch_timeout = float(os.getenv("NAV_FETCH_TIMEOUT", "60"))
+
+# ============================== Helper Functions ============================== #
+
+def table_name(name, worksheet=None):
+    safe_sheet = "".join(c if c.isalnum() else "_" for c in str(worksheet)) if worksheet else None
+    return f"{name}__{safe_sheet}" if safe_sheet else name
+
+
+def frame_from_table(df_table, schema=None):
+    """Normalize a local table to the frame the Sheets backend returns for the same cells"""
+    header = [str(col) for col in df_table.columns]
+    grid = df_table.astype(object).where(df_table.notna(), "").astype(str)
+    return records_frame(header, grid, schema)
+
+# ================================ Data Sources ================================ #
+
+class DataSource(ABC):
+    """
+    One spreadsheet's worth of tables. Every backend returns the same typed frames:
+    columns declared in 'schema' are parsed per sheet_schema.py, the rest as get_all_records()
+    """
+
+    def __init__(self, name, schema=None):
+        self.name = name
+        self.schema = schema
+
+    @abstractmethod
+    def read(self, worksheet=None):
+        """One worksheet (the first one when None) as a typed frame"""
+
+    def read_many(self, worksheets):
+        """Dict of worksheet -> frame; worksheets that can't be read are left out"""
+        frames = {}
+        for worksheet in worksheets:
+            try:
+                frames[worksheet] = self.read(worksheet)
+            except Exception as e:
+                print(f"⚠️ Worksheet {worksheet} not found: {str(e)}")
+        return frames
+
+    def revision(self):
+        """Opaque marker that changes whenever the underlying data changes"""
+        return None
+
+
+class SheetsSource(DataSource):
+    """Google Sheets, read through the local snapshot cache"""
+
+    def __init__(self, name, sheet_url, creds_path=None, schema=None):
+        super().__init__(name, schema)
+        self.sheet_url = sheet_url
+        self.creds_path = creds_path
+        self.spreadsheet_id = extract_id_from_url(sheet_url)
+
+    @property
+    def client(self):
+        # Credentials are only required once Sheets is actually used; see sheets_client.py
+        return get_client(self.creds_path, timeout=fetch_timeout)
+
+    def read(self, worksheet=None):
+        return load_records(self.client, self.sheet_url, worksheet, schema=self.schema)
+
+    def read_many(self, worksheets):
+        """All worksheets in a single values batchGet request"""
+        try:
+            response = self.client.http_client.values_batch_get(self.spreadsheet_id, [f"'{ws}'" for ws in worksheets])
+        except Exception as e:
+            # One missing worksheet fails the whole batch, so fall back to one request per worksheet
+            print(f"⚠️ Batched load failed, loading worksheets one by one: {str(e)}")
+            return super().read_many(worksheets)
+
+        frames = {}
+        for worksheet, value_range in zip(worksheets, response.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            if values:
+                header = values[0]
+                frames[worksheet] = records_frame(header, grid_from_values(values[1:], len(header)), self.schema)
+        return frames
+
+    def revision(self):
+        return sheet_revision(self.client, self.spreadsheet_id)
+
+
+class FileSource(DataSource):
+    """A folder of CSV or Parquet files, one file per worksheet"""
+
+    def __init__(self, name, folder, fmt="csv", schema=None):
+        super().__init__(name, schema)
+        self.folder = folder
+        self.fmt = fmt
+
+    def path(self, worksheet=None):
+        return os.path.join(self.folder, f"{table_name(self.name, worksheet)}.{self.fmt}")
+
+    def read(self, worksheet=None):
+        path = self.path(worksheet)
+        if self.fmt == "parquet":
+            df_table = pd.read_parquet(path)
+        else:
+            df_table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        return frame_from_table(df_table, self.schema)
+
+    def revision(self):
+        paths = [os.path.join(self.folder, f) for f in os.listdir(self.folder) if f.startswith(self.name)]
+        return str(max((os.path.getmtime(p) for p in paths), default=0))
+
+
+class SqliteSource(DataSource):
+    """A SQLite database, one table per worksheet"""
+
+    def __init__(self, name, db_path, schema=None):
+        super().__init__(name, schema)
+        self.db_path = db_path
+
+    def read(self, worksheet=None):
+        with sqlite3.connect(self.db_path) as conn:
+            df_table = pd.read_sql_query(f'SELECT * FROM "{table_name(self.name, worksheet)}"', conn)
+        return frame_from_table(df_table, self.schema)
+
+    def revision(self):
+        return str(os.path.getmtime(self.db_path))
+
+# ============================= Concurrent Reads ============================= #
+
+def start_read(source, worksheet=None):
+    """
+    source.read(worksheet) in a daemon thread, as a Future. A pool's worker threads
+    are joined at interpreter exit, so a read hung on the network would keep the
+    process alive after its timeout; a daemon thread is simply abandoned.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(source.read(worksheet))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"source-read-{source.name}", daemon=True).start()
+    return future
+
+
+def read_concurrently(reads, timeout=None):
+    """
+    Run independent reads in parallel so startup waits on the slowest source, not the sum.
+    reads: dict of key -> (source, worksheet); returns dict of key -> frame
+    """
+    timeout = fetch_timeout if timeout is None else timeout
+    futures = {key: start_read(source, worksheet) for key, (source, worksheet) in reads.items()}
+    # Every read starts together, so one deadline is each source's own timeout
+    deadline = time.monotonic() + timeout
+    frames = {}
+    for key, future in futures.items():
+        try:
+            frames[key] = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            # The hung read keeps running in its daemon thread; it won't block exit
+            raise TimeoutError(f"Loading '{reads[key][0].name}' took longer than {timeout:.0f}s") from None
+    return frames
+
+# ================================== Factory ================================== #
+
+def open_source(name, sheet_url, creds_path=None, spec=None, schema=None):
+    """Pick the backend from DATA_SOURCE (or spec); 'name' identifies the local file/table"""
+    spec = spec or data_source
+    kind, _, location = spec.partition(":")
+    if kind == "sheets":
+        return SheetsSource(name, sheet_url, creds_path, schema)
+    if kind in ("csv", "parquet"):
+        return FileSource(name, location, kind, schema)
+    if kind == "sqlite":
+        return SqliteSource(name, location, schema)
+    raise ValueError(f"Unknown DATA_SOURCE '{spec}' (expected sheets, csv:, parquet: or sqlite:)")
@@ -0,0 +1,160 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+
+from aggregates import dimension_codes, observed_series, count_frame, ties_by_appearance, split_dimensions, split_mentions, mention_tokens
+from cube import cube_dimensions, cube_measures
+from support_types import support_table
+
+# ============================== Date Range Index ============================== #
+
+def cumulative_by_day(day, codes, n_days, n_labels, weights=None):
+    """[day + 1, label] running totals: row d holds everything before day d"""
+    flat = np.bincount(day * n_labels + codes, weights=weights, minlength=n_days * n_labels)
+    return np.vstack([np.zeros((1, n_labels), dtype=flat.dtype), np.cumsum(flat.reshape(n_days, n_labels), axis=0)])
+
+
+def first_positions(codes, positions):
+    """Sorted (label, position) keys, so the first position of every label after a row is one searchsorted"""
+    stride = int(positions.max()) + 2 if len(positions) else 1
+    return np.sort(codes.astype(np.int64) * stride + positions), stride
+
+
+class DateRangeIndex:
+    """
+    Rows sorted by date with per-day cumulative counts and sums for every dimension.
+    A date range is two searchsorted calls on the day array; its totals and per-label
+    counts are the difference of two cumulative rows, however long the range is.
+    Works for any window: months, quarters, fiscal years, grant periods.
+    Split dimensions (Person: 'A, B') count each name a row lists, like Aggregates.
+    long_table is support_table(df), when the caller already has it.
+    """
+
+    def __init__(self, df, dimensions=None, measures=None, date_column='Date of Activity', long_table=None, split=None):
+        dimensions = cube_dimensions if dimensions is None else dimensions
+        measures = cube_measures if measures is None else measures
+        split = split_dimensions if split is None else split
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+        dated = np.flatnonzero(dates.notna().to_numpy())
+        # Stable, so same-day rows stay in frame order
+        self.order = dated[np.argsort(dates.to_numpy()[dated], kind='stable')]
+        row_days = dates.to_numpy()[self.order].astype('datetime64[D]')
+        self.days, day = np.unique(row_days, return_inverse=True)
+        n_days = len(self.days)
+        position = np.empty(len(df), dtype=np.int64)
+        position[self.order] = np.arange(len(self.order))
+
+        self.rows_before = np.concatenate([[0], np.cumsum(np.bincount(day, minlength=n_days))])
+        self.sums_before = {}
+        for measure in measures:
+            values = pd.to_numeric(df[measure], errors='coerce').to_numpy(dtype='float64')[self.order]
+            self.sums_before[measure] = np.concatenate([[0.0], np.cumsum(np.bincount(day, weights=np.nan_to_num(values), minlength=n_days))])
+
+        self.labels = {}
+        self.category_dtypes = {}
+        self.counts_before = {}
+        self.first_keys = {}
+        self.widths = {}  # first_keys positions per row: names a split dimension row can list
+        for dim in dimensions:
+            if dim in split:
+                # One entry per name, first mention ranked by (row, place in the row)
+                row_id, codes, labels = split_mentions(df[dim], split[dim])
+                token = mention_tokens(row_id)
+                width = int(token.max()) + 1 if len(token) else 1
+                dated_mentions = np.isin(row_id, dated)
+                mention_pos = position[row_id[dated_mentions]]
+                codes = np.asarray(codes, dtype=np.int64)[dated_mentions]
+                self.labels[dim] = labels
+                self.category_dtypes[dim] = None
+                self.widths[dim] = width
+                self.counts_before[dim] = cumulative_by_day(day[mention_pos], codes, n_days, len(labels))
+                self.first_keys[dim] = first_positions(codes, mention_pos * width + token[dated_mentions])
+                continue
+            codes, labels = dimension_codes(df[dim])
+            codes = np.asarray(codes, dtype=np.int64)[self.order]
+            present = codes >= 0
+            self.labels[dim] = labels
+            self.category_dtypes[dim] = df[dim].dtype if isinstance(df[dim].dtype, pd.CategoricalDtype) else None
+            self.widths[dim] = 1
+            self.counts_before[dim] = cumulative_by_day(day[present], codes[present], n_days, len(labels))
+            self.first_keys[dim] = first_positions(codes[present], np.flatnonzero(present))
+
+        # Support mentions: long table rows in date order, first mention ranked by (row, token)
+        long_table = support_table(df) if long_table is None else long_table
+        support_pos = position[long_table['row_id'].to_numpy()]
+        dated_mentions = np.isin(long_table['row_id'].to_numpy(), dated)
+        token = long_table.groupby('row_id', sort=False).cumcount().to_numpy()
+        width = int(token.max()) + 1 if len(token) else 1
+        support_codes = long_table['Support'].cat.codes.to_numpy(dtype=np.int64)[dated_mentions]
+        self.support_labels = long_table['Support'].cat.categories
+        self.support_width = width
+        self.support_before = cumulative_by_day(
+            day[support_pos[dated_mentions]], support_codes, n_days, len(self.support_labels))
+        self.support_first = first_positions(
+            support_codes, support_pos[dated_mentions] * width + token[dated_mentions])
+
+    def day_bounds(self, start, end):
+        """(first day, one past last day) codes for an inclusive date range, either way round"""
+        start = np.datetime64(pd.Timestamp(start).date(), 'D')
+        end = np.datetime64(pd.Timestamp(end).date(), 'D')
+        if start > end:
+            start, end = end, start
+        return int(np.searchsorted(self.days, start, 'left')), int(np.searchsorted(self.days, end, 'right'))
+
+    def rows(self, start, end):
+        """Positions (into the indexed frame) of the rows in the range, oldest first"""
+        a, b = self.day_bounds(start, end)
+        return self.order[self.rows_before[a]:self.rows_before[b]]
+
+    def slice(self, start, end):
+        """View of an inclusive date range, same interface as a cube slice"""
+        return DateRangeSlice(self, start, end)
+
+
+class DateRangeSlice:
+    """Counts and totals for one date range of a DateRangeIndex"""
+
+    def __init__(self, index, start, end):
+        self.index = index
+        self.a, self.b = index.day_bounds(start, end)
+        self.lo, self.hi = int(index.rows_before[self.a]), int(index.rows_before[self.b])
+        self.rows = self.hi - self.lo
+
+    def total(self, measure):
+        before = self.index.sums_before[measure]
+        return before[self.b] - before[self.a]
+
+    @staticmethod
+    def _first_in_range(first_keys, n_labels, lo):
+        """First position at or after lo for every label (only meaningful where the label occurs)"""
+        keys, stride = first_keys
+        wanted = np.arange(n_labels, dtype=np.int64) * stride + lo
+        found = keys[np.minimum(np.searchsorted(keys, wanted), max(len(keys) - 1, 0))] if len(keys) else wanted
+        return found - np.arange(n_labels, dtype=np.int64) * stride
+
+    def counts(self, dim, order='count', name='Count'):
+        """[dim, name] frame of row counts, same order rules as Aggregates.counts"""
+        index = self.index
+        before = index.counts_before[dim]
+        counts = (before[self.b] - before[self.a]).astype(np.int64)
+        labels = index.labels[dim]
+        observed = counts > 0
+        series = observed_series(dim, labels, counts, observed, index.category_dtypes[dim])
+        if ties_by_appearance(index.category_dtypes[dim]):
+            # Labels in the order the range's rows first meet them
+            first = self._first_in_range(index.first_keys[dim], len(labels), self.lo * index.widths[dim])
+            series = series.iloc[np.argsort(first[observed], kind='stable')]
+        return count_frame(series, order, name)
+
+    def support_counts(self, name='Support'):
+        """Count of each support type in first-mention order (like support_counts)"""
+        index = self.index
+        counts = (index.support_before[self.b] - index.support_before[self.a]).astype(np.int64)
+        first = self._first_in_range(index.support_first, len(index.support_labels), self.lo * index.support_width)
+        order = np.flatnonzero(counts > 0)
+        order = order[np.argsort(first[order], kind='stable')]
+        return pd.DataFrame({
+            name: np.asarray(index.support_labels, dtype=object)[order],
+            'Count': counts[order],
+        })
@@ -0,0 +1,137 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import sys
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# =================================== CONFIG ================================== #
+
+# Memory budget (MB) for memoized derived frames; least recently used ones go first
+derived_cache_mb = float(os.getenv("DERIVED_CACHE_MB", "512"))
+
+# ============================== Derived Dataset Graph ============================== #
+
+def approx_bytes(value):
+    """Rough in-memory size of a derived value (shallow for frames, sampled for record lists)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, list) and value:
+        first = value[0]
+        per_item = sys.getsizeof(first) + (sum(sys.getsizeof(v) for v in first.values()) if isinstance(first, dict) else 0)
+        return sys.getsizeof(value) + per_item * len(value)
+    return sys.getsizeof(value)
+
+
+def fingerprint(value):
+    """Content hash of a source value, or None when it can't be hashed (it then always counts as changed)"""
+    digest = hashlib.blake2b(digest_size=8)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value if isinstance(value, pd.DataFrame) else value.to_frame()
+        digest.update(repr([(col, str(dtype)) for col, dtype in frame.dtypes.items()]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(repr((value.dtype.str, value.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        try:
+            return ('hash', type(value).__name__, hash(value))
+        except TypeError:
+            return None
+    return digest.hexdigest()
+
+
+class DerivedGraph:
+    """
+    Derived frames and figures, each declared once with the nodes it is built from.
+    A node is computed on first get(), memoized against the versions of its inputs
+    and recomputed only when one of them changes. Memoized values are evicted
+    least recently used first once they pass the memory cap; sources are never evicted.
+    A source's version only moves when its content does, so re-setting the same data
+    after a refresh keeps every derived value.
+    """
+
+    def __init__(self, max_mb=None):
+        self.max_bytes = (derived_cache_mb if max_mb is None else max_mb) * 1024 * 1024
+        self.nodes = {}
+        self.versions = {}
+        self.timings = {}
+        self._built_from = {}  # name -> input versions of its latest value (kept after eviction)
+        self._sources = {}
+        self._fingerprints = {}
+        self._memo = OrderedDict()  # name -> (input versions, value, bytes)
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def source(self, name, value):
+        """Set an input of the graph; if its content changed, everything derived from it goes stale"""
+        key = fingerprint(value)
+        with self._lock:
+            self._sources[name] = value
+            if key is None or self._fingerprints.get(name) != key:
+                self.versions[name] = self.versions.get(name, 0) + 1
+            self._fingerprints[name] = key
+
+    def node(self, name, inputs=()):
+        """Decorator declaring fn(*input values) as the node name"""
+        def register(fn):
+            self.nodes[name] = (fn, tuple(inputs))
+            return fn
+        return register
+
+    def get(self, name):
+        """Value of a source or node, computed at most once per version of its inputs"""
+        with self._lock:
+            if name in self._sources:
+                return self._sources[name]
+            fn, inputs = self.nodes[name]
+            memo = self._memo.get(name)
+            if memo is not None and memo[0] == self._input_key(name):
+                self._memo.move_to_end(name)
+                return memo[1]
+
+            values = [self.get(i) for i in inputs]
+            key = tuple(self.versions[i] for i in inputs)
+            started = time.perf_counter()
+            value = fn(*values)
+            self.timings[name] = time.perf_counter() - started
+            # Recomputing an evicted value from the same inputs keeps its version
+            if self._built_from.get(name) != key:
+                self.versions[name] = self.versions.get(name, 0) + 1
+                self._built_from[name] = key
+            self._store(name, key, value)
+            return value
+
+    def _version(self, name):
+        """Version name has (or would have, if evicted) right now; None when it is stale"""
+        if name in self._sources:
+            return self.versions[name]
+        key = self._input_key(name)
+        return self.versions.get(name) if key is not None and self._built_from.get(name) == key else None
+
+    def _input_key(self, name):
+        key = tuple(self._version(i) for i in self.nodes[name][1])
+        return None if None in key else key
+
+    def _store(self, name, key, value):
+        old = self._memo.pop(name, None)
+        if old is not None:
+            self._bytes -= old[2]
+        size = approx_bytes(value)
+        self._memo[name] = (key, value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._memo) > 1:
+            _, (_, _, evicted) = self._memo.popitem(last=False)
+            self._bytes -= evicted
+
+    def timing_report(self):
+        """One line of per-node compute times, slowest first"""
+        ranked = sorted(self.timings.items(), key=lambda item: -item[1])
+        return ', '.join(f"{name} {seconds:.3f}s" for name, seconds in ranked)
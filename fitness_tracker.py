@@ -4,16 +4,12 @@ import numpy as np
 import pandas as pd 
 import plotly.express as px
 import plotly.graph_objects as go
-import seaborn as sns 
 from datetime import datetime
 import os
 import sys
 # -------------------------------
-import requests
-import json
-import base64
-import gspread
-from google.oauth2.service_account import Credentials
+import time
+from data_sources import open_source
 # --------------------------------
 import dash
 from dash import dcc, html, Input, Output, State, dash_table
@@ -36,53 +32,56 @@ name = "CxLos"
 # Define the Google Sheets URL
 sheet_url = "https://docs.google.com/spreadsheets/d/1EXDabqzS1Gd1AteSqcovvUuJxrUMQvisf_MhnhFMeNk/edit?gid=0#gid=0"
 
-# Define the scope
-scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+# Local development fallback (GOOGLE_CREDENTIALS takes priority when set)
+creds_path = r"C:\Users\CxLos\OneDrive\Documents\Portfolio Projects\GCP\personal-projects-485203-6f6c61641541.json"
 
-# Load credentials
-encoded_key = os.getenv("GOOGLE_CREDENTIALS")
+# Google Sheets by default; set DATA_SOURCE (csv:, parquet:, sqlite:) to run from local files
+fitness_source = open_source('fitness', sheet_url, creds_path)
 
-if encoded_key:
-    # Render: GOOGLE_CREDENTIALS is BASE64 ENCODED JSON
-    json_key = json.loads(
-        base64.b64decode(encoded_key).decode("utf-8")
-    )
-    creds = Credentials.from_service_account_info(json_key, scopes=scope)
+# ============================== Data Loading Function ========================== #
 
-else:
-    # Local development fallback
-    creds_path = r"C:\Users\CxLos\OneDrive\Documents\Portfolio Projects\GCP\personal-projects-485203-6f6c61641541.json"
+# Year worksheets that make up 'All Time'
+all_years = ['2026']
 
-    if not os.path.exists(creds_path):
-        raise FileNotFoundError(
-            "Service account JSON file not found and GOOGLE_CREDENTIALS is not set."
-        )
+# Seconds the per-year cache is trusted before checking whether the sheet changed
+year_cache_ttl = int(os.getenv("FITNESS_CACHE_TTL", "300"))
 
-    creds = Credentials.from_service_account_file(creds_path, scopes=scope)
+# Parsed frame per year, plus the sheet revision they were read at
+year_cache = {}
+year_cache_state = {'revision': None, 'checked_at': None}
 
-# Authorize and load the sheet
-client = gspread.authorize(creds)
-sheet = client.open_by_url(sheet_url)
+def invalidate_year_cache():
+    """Drop every cached year so the next load re-reads the sheet"""
+    year_cache.clear()
+    year_cache_state['revision'] = None
+    year_cache_state['checked_at'] = None
 
-# ============================== Data Loading Function ========================== #
+def refresh_year_cache():
+    """Fetch every year worksheet at once, unless nothing changed since the last fetch"""
+    now = time.time()
+    if year_cache and year_cache_state['checked_at'] and now - year_cache_state['checked_at'] < year_cache_ttl:
+        return
+
+    revision = fitness_source.revision()
+    year_cache_state['checked_at'] = now
+    if year_cache and revision is not None and revision == year_cache_state['revision']:
+        return
+
+    # Google Sheets reads every year worksheet in a single batched values request
+    year_frames = fitness_source.read_many(all_years)
+
+    year_cache.clear()
+    year_cache.update(year_frames)
+    year_cache_state['revision'] = revision
 
 def load_data_for_year(year):
     """Load and process fitness data for a specific year or all years"""
     try:
         # print(f"📊 Loading data for year: {year}")
+        refresh_year_cache()
         
         if year == 'All Time':
-            all_years = ['2026']
-            dfs = []
-            for yr in all_years:
-                try:
-                    worksheet = sheet.worksheet(f"{yr}")
-                    data = pd.DataFrame(worksheet.get_all_records())
-                    # print(f"✅ Loaded {len(data)} rows for {yr}")
-                    dfs.append(data)
-                except Exception as e:
-                    print(f"⚠️ Worksheet {yr} not found: {str(e)}")
-                    continue
+            dfs = [year_cache[yr] for yr in all_years if yr in year_cache]
             
             if dfs:
                 combined_df = pd.concat(dfs, ignore_index=True)
@@ -92,10 +91,10 @@ def load_data_for_year(year):
                 print("❌ No data found for All Time")
                 return pd.DataFrame()
         else:
-            worksheet = sheet.worksheet(f"{year}")
-            data = pd.DataFrame(worksheet.get_all_records())
+            if f"{year}" not in year_cache:
+                raise KeyError(f"Worksheet {year} not found")
             # print(f"✅ Loaded {len(data)} rows for {year}")
-            return data.copy()
+            return year_cache[f"{year}"].copy()
             
     except Exception as e:
         print(f"❌ ERROR loading data for {year}: {str(e)}")
@@ -1249,9 +1248,6 @@ def update_dashboard(selected_year):
             []
         )
 
-    # Load data for selected year
-    df_year = load_data_for_year(selected_year)
-    
     # Get all date columns (everything except Category and Exercise)
     date_columns = [col for col in df_year.columns if col not in ['Category', 'Exercise']]
     
@@ -0,0 +1,107 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import time
+import hashlib
+import threading
+import traceback
+
+import pandas as pd
+
+# =================================== CONFIG ================================== #
+
+# Seconds before the partitions are rebuilt from a fresh load
+partition_ttl = int(os.getenv("NAV_PARTITION_TTL", "900"))
+
+# ============================== Helper Functions ============================== #
+
+def content_hash(df):
+    """Short hex digest of a frame's columns, index and values; equal data gives equal hashes"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(repr(list(df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+# ============================ Month Partition Store ============================ #
+
+class MonthPartitionStore:
+    """
+    Loads the response sheet once and keeps it split into (year, month) partitions.
+    A month selection is a dict lookup and a full year is a concat of its months,
+    so switching months never re-downloads or re-scans the whole sheet.
+    After the TTL the partitions are rebuilt in a background thread while the
+    current ones keep being served.
+    """
+
+    def __init__(self, load_fn, date_column="Date of Activity", ttl=None):
+        self.load_fn = load_fn
+        self.date_column = date_column
+        self.ttl = partition_ttl if ttl is None else ttl
+        # (partitions, empty frame, content hash), swapped as one reference
+        self._state = None
+        self._loaded_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Load the sheet and rebuild every partition"""
+        data = self.load_fn()
+        df_all = data.copy()
+        # Trim leading and trailing whitespaces from column names
+        df_all.columns = df_all.columns.str.strip()
+        df_all[self.date_column] = pd.to_datetime(df_all[self.date_column], errors='coerce')
+
+        dates = df_all[self.date_column]
+        partitions = {}
+        # Rows without a valid date have NaN keys and are dropped, same as the old month filter
+        for (year, month), df_part in df_all.groupby([dates.dt.year, dates.dt.month], sort=True):
+            partitions[(int(year), int(month))] = df_part
+
+        self._state = (partitions, df_all.iloc[0:0], content_hash(df_all))
+        self._loaded_at = time.time()
+        print(f"🗂️ Partitioned {len(df_all)} rows into {len(partitions)} months")
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep serving the loaded partitions; the next request after the TTL tries again
+            print(f"❌ ERROR refreshing month partitions: {str(e)}")
+            traceback.print_exc()
+        finally:
+            self._refreshing = False
+
+    def _current(self):
+        """Loaded state; only the very first load runs on the caller's thread"""
+        with self._lock:
+            if self._state is None:
+                self.refresh()
+            elif self.ttl and not self._refreshing and time.time() - self._loaded_at > self.ttl:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, name="month-store-refresh", daemon=True).start()
+            return self._state
+
+    def version(self):
+        """Content hash of the current partitions; only changes when the sheet data does"""
+        return self._current()[2]
+
+    def keys(self):
+        return sorted(self._current()[0])
+
+    def month(self, year, month):
+        """Rows for one calendar month, sorted (a new frame, callers are free to mutate it)"""
+        partitions, empty, _ = self._current()
+        df_part = partitions.get((int(year), int(month)))
+        if df_part is None:
+            return empty.copy()
+        # Sort df from oldest to newest
+        return df_part.sort_values(by=self.date_column, ascending=True)
+
+    def year(self, year):
+        """Rows for a full year, built from that year's month partitions"""
+        partitions, empty, _ = self._current()
+        parts = [partitions[key] for key in sorted(partitions) if key[0] == int(year)]
+        if not parts:
+            return empty.copy()
+        # Back to sheet order first so same-day rows sort exactly as a full-year filter would
+        return pd.concat(parts).sort_index().sort_values(by=self.date_column, ascending=True)
@@ -3,32 +3,29 @@
 # =================================== IMPORTS ================================= #
 
 import os
-import re
-pattern = r',(?=(?:[^()]*\([^()]*\))*[^()]*$)'
+import threading
 
 # import json
-import numpy as np 
 import pandas as pd 
-from datetime import datetime, timedelta
-from collections import Counter
 
 # import seaborn as sns 
 import plotly.graph_objects as go
 import plotly.express as px
 
-import time
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
-import folium
-from folium.plugins import MousePosition
-
 import dash
 from dash import dcc, html, dash_table, Input, Output, State, callback_context
-# Google Web Credentials
-import json
-import base64
-import gspread
-from google.oauth2.service_account import Credentials
+# Google Sheets or local files, see data_sources.py
+from data_sources import open_source
+from sheet_schema import navigation_schema, findhelp_schema
+from month_store import MonthPartitionStore
+from cleaning import clean_stage, normalize, age_stage
+from zip_codes import zip_stage
+from staff_names import canonical_names
+from client_identity import frame_keys, identity_keys, duplicated_clients, missing_from
+from cube import NavigationCube
+from date_index import DateRangeIndex
+from bitmap_index import BitmapIndex
+from support_types import support_table
 
 # 'data/~$bmhc_data_2024_cleaned.xlsx'
 # print('System Version:', sys.version)
@@ -45,70 +42,138 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 # Define the Google Sheets URL
 sheet_url = "https://docs.google.com/spreadsheets/d/1Vi5VQWt9AD8nKbO78FpQdm6TrfRmg0o7az77Hku2i7Y/edit#gid=78776635"
 
-scope = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive"
-]
+# Local service account key (GOOGLE_CREDENTIALS takes priority when set)
+creds_path = r"C:\Users\CxLos\OneDrive\Documents\BMHC\Data\bmhc-timesheet-4808d1347240.json"
 
-encoded_key = os.getenv("GOOGLE_CREDENTIALS")
+# Google Sheets by default; set DATA_SOURCE (csv:, parquet:, sqlite:) to run from local files
+# Columns are typed on ingest from the declared schema (sheet_schema.py)
+nav_source = open_source('navigation', sheet_url, creds_path, schema=navigation_schema)
 
-if encoded_key:
-    json_key = json.loads(base64.b64decode(encoded_key).decode("utf-8"))
-    creds = Credentials.from_service_account_info(json_key, scopes=scope)
-else:
-    creds_path = r"C:\Users\CxLos\OneDrive\Documents\BMHC\Data\bmhc-timesheet-4808d1347240.json"
-    if os.path.exists(creds_path):
-        creds = Credentials.from_service_account_file(creds_path, scopes=scope)
-    else:
-        raise FileNotFoundError("Service account JSON file not found and GOOGLE_CREDENTIALS is not set.")
+# ============================== Data Loading Function ========================== #
 
-# Authorize and load the sheet
-client = gspread.authorize(creds)
-sheet = client.open_by_url(sheet_url)
+# Fetched once and split into (year, month) partitions; see month_store.py
+month_store = MonthPartitionStore(nav_source.read)
 
-# ============================== Data Loading Function ========================== #
+# Convert month name to integer
+month_map = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4,
+    'May': 5, 'June': 6, 'July': 7, 'August': 8,
+    'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
 
 def load_data_for_month(month_name, year=2025):
     """Load and process navigation data for a specific month or full year"""
-
-    data = pd.DataFrame(client.open_by_url(sheet_url).sheet1.get_all_records())
-    df_loaded = data.copy()
-    
-    # Trim leading and trailing whitespaces from column names
-    df_loaded.columns = df_loaded.columns.str.strip()
-    
-    # Convert month name to integer
-    month_map = {
-        'January': 1, 'February': 2, 'March': 3, 'April': 4,
-        'May': 5, 'June': 6, 'July': 7, 'August': 8,
-        'September': 9, 'October': 10, 'November': 11, 'December': 12
-    }
-    
-    # Filter df where 'Date of Activity' is in selected month or full year
-    df_loaded["Date of Activity"] = pd.to_datetime(df_loaded["Date of Activity"], errors='coerce')
     
     # Handle full year option (e.g., '2025')
     if month_name == '2025':
-        df_loaded = df_loaded[df_loaded['Date of Activity'].dt.year == year]  # type: ignore
+        df_loaded = month_store.year(year)
         int_month = None  # No specific month
     else:
         int_month = month_map.get(month_name, 12)
-        df_loaded = df_loaded[(df_loaded['Date of Activity'].dt.month == int_month) & (df_loaded['Date of Activity'].dt.year == year)]  # type: ignore
-    
-    # Sort df from oldest to newest
-    df_loaded = df_loaded.sort_values(by='Date of Activity', ascending=True)
+        df_loaded = month_store.month(year, int_month)
     
     return df_loaded, month_name, year, int_month
 
+# ============================== Report Cube ============================== #
+
+def prepare_frame(df_month):
+    """Cleaning pipeline behind every report view; each row is cleaned on its own"""
+
+    # Strip whitespace from column names and string entries, dimensions as categories
+    df_month = clean_stage(df_month)
+    
+    # Create Full Name column
+    df_month['Full Name'] = df_month["Individual's First Name:"].astype(str) + " " + df_month["Individual's Last Name:"].astype(str)
+    
+    # Data preprocessing (same as original)
+    df_month['HMIS SPID Number:'] = df_month['HMIS SPID Number:'].fillna(-1)
+    df_month['MAP Card Number'] = df_month['MAP Card Number'].fillna(-1)
+    
+    df_month.rename(
+        columns={
+            "Activity Duration (minutes):" : "Activity Duration",
+            "Location Encountered:" : "Location",
+            "Type of Coordination/Navigation Provided:" : "Support",
+            "Individual's Insurance Status:" : "Insurance",
+            "Individual's Status:" : "Status",
+            'Person submitting this form:' : 'Person',
+            'Total travel time (minutes):' : 'Travel',
+            'County:' : 'County',
+            'Race / Ethnicity:' : 'Ethnicity',  # Fixed: added spaces around slash
+            'Gender:' : 'Gender',
+            'Age:' : 'Age',
+            'Housing Status' : 'Housing',
+            'Income Level' : 'Income'
+        },
+        inplace=True
+    )
+    
+    # Value cleanup for every mapped column (see normalization_maps in cleaning.py)
+    df_month = normalize(df_month)
+    df_month['Person'] = canonical_names(df_month['Person'])
+    df_month['Travel'] = pd.to_numeric(df_month['Travel'], errors='coerce').fillna(0)
+
+    # Deterministic DOB fill, age at the activity date, ordered buckets
+    df_month = age_stage(df_month)
+
+    # Clean five-digit ZIPs (ZIP+4 and '78701.0' included, phone numbers and text dropped),
+    # plus county and centroid from the bundled reference table (see zip_codes.py)
+    return zip_stage(df_month)
+
+
+def build_views():
+    """
+    NavigationCube, DateRangeIndex and cross-filter BitmapIndex over every loaded year,
+    from one pass of the cleaning pipeline. All three rank equal counts by the date-sorted
+    row order, so a month reads the same from the month picker, a date range or a click.
+    """
+    years = sorted({year for year, _ in month_store.keys()})
+    frames = [month_store.year(year) for year in years]
+    df_all = pd.concat(frames) if frames else month_store.year(0)
+
+    df_prepared = prepare_frame(df_all)
+    # Support answers are tokenized once for all three
+    long_table = support_table(df_prepared)
+    dates = DateRangeIndex(df_prepared, long_table=long_table)
+    cube = NavigationCube(df_prepared, order=dates.order, long_table=long_table)
+    # Bits in date order, so a month or date range is one contiguous run
+    return cube, dates, BitmapIndex(df_prepared, order=dates.order, long_table=long_table)
+
+
+# Rebuilt only when the month store reloads the sheet
+_views = {'version': None, 'cube': None, 'dates': None, 'bitmaps': None}
+_views_lock = threading.Lock()
+
+def report_views():
+    """Cube, date-range index and bitmap index for the current data version"""
+    version = month_store.version()
+    with _views_lock:
+        if _views['version'] != version:
+            _views['cube'], _views['dates'], _views['bitmaps'] = build_views()
+            _views['version'] = version
+            print(f"🧊 Built report cube ({_views['cube'].n_cells} cells) and date index ({len(_views['dates'].days)} days)")
+        return _views
+
+
+def navigation_cube():
+    """The report cube for the current data version"""
+    return report_views()['cube']
+
+
+def date_range_index():
+    """The date-range index for the current data version"""
+    return report_views()['dates']
+
+
+def bitmap_index():
+    """The cross-filter bitmap index for the current data version"""
+    return report_views()['bitmaps']
+
 # Load default month 
 df, report_month, report_year, int_month = load_data_for_month('January', 2025)
 
-# Strip whitespace
-df.columns = df.columns.str.strip()
-
-# Strip whitespace from string entries in the whole DataFrame
-for col in df.select_dtypes(include='object').columns:
-    df[col] = df[col].map(lambda x: x.strip() if isinstance(x, str) else x)
+# Strip whitespace from column names and string entries, dimensions as categories (see cleaning.py)
+df = clean_stage(df)
 
 # df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
 
@@ -184,16 +249,28 @@ df.rename(
     }, 
 inplace=True)
 
-# Search for all duplicates in dataset:
-duplicates = df[df.duplicated(keep=False)]
-# print("Duplicate entries in dataset:\n", duplicates)
+# Client identity: case/whitespace-folded first + last name, hashed to one uint64 per row
+# (see client_identity.py); duplicates and the Findhelp comparison are hash joins on it
+client_keys = frame_keys(df)
+duplicate_mask = duplicated_clients(client_keys)
 
 # Find duplicate rows where both first and last names match:
-duplicate_rows = df[df.duplicated(subset=["Individual's First Name:", "Individual's Last Name:"], keep=False)][["Individual's First Name:", "Individual's Last Name:", 'Date of Activity']].sort_values(["Individual's Last Name:", "Individual's First Name:"])
+duplicate_rows = df[duplicate_mask][["Individual's First Name:", "Individual's Last Name:", 'Date of Activity']].sort_values(["Individual's Last Name:", "Individual's First Name:"])
 # print("Duplicate name entries:\n", duplicate_rows)
 
 # Show duplicate names with their counts
-duplicate_counts = df[df.duplicated(subset=["Individual's First Name:", "Individual's Last Name:"], keep=False)].groupby(["Individual's First Name:", "Individual's Last Name:"]).size().reset_index(name='Count').sort_values('Count', ascending=False)
+duplicate_counts = (
+    df.loc[duplicate_mask, ["Individual's First Name:", "Individual's Last Name:"]]
+    .groupby(client_keys[duplicate_mask], sort=False)
+    .agg(**{
+        "Individual's First Name:": ("Individual's First Name:", 'first'),
+        "Individual's Last Name:": ("Individual's Last Name:", 'first'),
+        'Count': ("Individual's First Name:", 'size'),
+    })
+    .sort_values(["Individual's First Name:", "Individual's Last Name:"])
+    .reset_index(drop=True)
+    .sort_values('Count', ascending=False)
+)
 # print("Duplicate name counts:\n", duplicate_counts)
 
 # ================================== Data Cleaning ================================== #
@@ -206,32 +283,24 @@ income_unique = [
     'Unknown', 'Under 25,000', '', 0, '$0', '25,000 - 49,999', 'unknown', '?'
 ]
 
-df['Income'] = df['Income'].replace({
-    '': 'N/A',
-    '$0': 'Unknown',
-    'Unknown': 'N/A',
-    'unknown': 'N/A',
-    '?': 'N/A',
-    0: 'N/A',
-    '': '',
-})
+df = normalize(df, ['Income'])
 
 # ========================== SPREADSHEET COMPARISON ========================== #
 
 # Load second spreadsheet for comparison
 sheet_url_2 = "https://docs.google.com/spreadsheets/d/1GWnQrLptjkgg8CR1G8OpYaCHZMmW5xOzg0kFtPCkxKw/edit?gid=0#gid=0"
-sheet_2 = client.open_by_url(sheet_url_2)
-worksheet_2 = sheet_2.worksheet(f"{report_month}")
-data_2 = pd.DataFrame(worksheet_2.get_all_records())
+findhelp_source = open_source('findhelp', sheet_url_2, creds_path, schema=findhelp_schema)
+data_2 = findhelp_source.read(f"{report_month}")
 df_2 = data_2.copy()
 df_2.columns = df_2.columns.str.strip()
 
 # Find records in df_2 that are NOT in df
-missing_in_main = df_2[~df_2['seeker_name'].isin(df['Full Name'])][["seeker_name", 'created_at']].sort_values(['seeker_name', 'created_at'])
+findhelp_keys = identity_keys(df_2['seeker_name'])
+missing_in_main = df_2[missing_from(findhelp_keys, client_keys)][["seeker_name", 'created_at']].sort_values(['seeker_name', 'created_at'])
 # print(f"\nRecords in FH NOT in Navigation ({len(missing_in_main)}):\n", missing_in_main)
 
 # Find records in df that are NOT in df_2
-missing_in_comparison = df[~df['Full Name'].isin(df_2['seeker_name'])][['Full Name', 'Date of Activity', 'Person']].sort_values(['Full Name', 'Date of Activity'])
+missing_in_comparison = df[missing_from(client_keys, findhelp_keys)][['Full Name', 'Date of Activity', 'Person']].sort_values(['Full Name', 'Date of Activity'])
 # print(f"\nRecords in Navigation NOT in Findhelp ({len(missing_in_comparison)}):\n", missing_in_comparison)
 
 # =========================== Initial Empty Figures =========================== #
@@ -304,6 +373,23 @@ app.layout = html.Div(
                                 # 'borderRadius': '50px'
                             }
                         ),
+                        # Any start and end date (quarters, fiscal years, grant periods)
+                        dcc.DatePickerRange(
+                            id='date-range',
+                            className='date-range',
+                            start_date_placeholder_text='Start date',
+                            end_date_placeholder_text='End date',
+                            clearable=True,
+                            style={'marginLeft': '20px'}
+                        ),
+                        # Click a bar (or a location slice) to filter every other chart
+                        html.Button(
+                            'Clear filters',
+                            id='cross-filter-clear',
+                            className='bread-button',
+                            n_clicks=0,
+                            style={'marginLeft': '20px'}
+                        ),
                     ],
                     style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'margin': '20px 0'}
                 ),
@@ -620,6 +706,10 @@ html.Div(
         
         # Store for drill-down state
         dcc.Store(id='location-drill-state', data={'level': 0, 'selected_location': None}),
+
+        # Month or date range on screen, and the cross-filter selection {dimension: [values]}
+        dcc.Store(id='report-view', data=None),
+        dcc.Store(id='cross-filter', data={}),
         
         html.Div(
             className='graph-row',
@@ -885,37 +975,62 @@ html.Div(
 
 # ======================== Month Selection Callback ======================== #
 
+# Components the report fills in, for a month (cube slice) or a date range
+report_outputs = [
+    ('month-subtitle', 'children'),
+    ('clients-served-title', 'children'),
+    ('clients-served-number', 'children'),
+    ('nav-hours-title', 'children'),
+    ('nav-hours-number', 'children'),
+    ('travel-hours-title', 'children'),
+    ('travel-hours-number', 'children'),
+    ('race-bar', 'figure'),
+    ('race-pie', 'figure'),
+    ('gender-bar', 'figure'),
+    ('gender-pie', 'figure'),
+    ('age-bar', 'figure'),
+    ('age-pie', 'figure'),
+    ('insurance-bar', 'figure'),
+    ('insurance-pie', 'figure'),
+    ('location-drill-chart', 'figure'),
+    ('location-pie', 'figure'),
+    ('support-bar', 'figure'),
+    ('support-pie', 'figure'),
+    ('status-bar', 'figure'),
+    ('status-pie', 'figure'),
+    ('housing-bar', 'figure'),
+    ('housing-pie', 'figure'),
+    ('income-bar', 'figure'),
+    ('income-pie', 'figure'),
+    ('person-bar', 'figure'),
+    ('person-pie', 'figure'),
+    ('zip-graph', 'figure'),
+]
+
+
+def error_state(label):
+    """Empty/error state for every report output"""
+    return (
+        f"Error: {label}",
+        "Error loading data",
+        '-',
+        "Error loading data",
+        '-',
+        "Error loading data",
+        '-',
+        *[empty_fig] * (len(report_outputs) - 7),  # All graph outputs
+    )
+
+
+# A new month or date range starts without a cross-filter
+view_outputs = [
+    Output('report-view', 'data', allow_duplicate=True),
+    Output('cross-filter', 'data', allow_duplicate=True),
+]
+
+
 @app.callback(
-    [
-        Output('month-subtitle', 'children'),
-        Output('clients-served-title', 'children'),
-        Output('clients-served-number', 'children'),
-        Output('nav-hours-title', 'children'),
-        Output('nav-hours-number', 'children'),
-        Output('travel-hours-title', 'children'),
-        Output('travel-hours-number', 'children'),
-        Output('race-bar', 'figure'),
-        Output('race-pie', 'figure'),
-        Output('gender-bar', 'figure'),
-        Output('gender-pie', 'figure'),
-        Output('age-bar', 'figure'),
-        Output('age-pie', 'figure'),
-        Output('insurance-bar', 'figure'),
-        Output('insurance-pie', 'figure'),
-        Output('location-drill-chart', 'figure'),
-        Output('location-pie', 'figure'),
-        Output('support-bar', 'figure'),
-        Output('support-pie', 'figure'),
-        Output('status-bar', 'figure'),
-        Output('status-pie', 'figure'),
-        Output('housing-bar', 'figure'),
-        Output('housing-pie', 'figure'),
-        Output('income-bar', 'figure'),
-        Output('income-pie', 'figure'),
-        Output('person-bar', 'figure'),
-        Output('person-pie', 'figure'),
-        Output('zip-graph', 'figure'),
-    ],
+    [Output(component, prop) for component, prop in report_outputs] + view_outputs,
     [Input('month-dropdown', 'value')],
     prevent_initial_call=True
 )
@@ -929,8 +1044,10 @@ def update_month_data(selected_month):
     try:
         print(f"🔄 Callback triggered for month: {selected_month}")
         
-        # Load data for selected month
-        df_month, month_name, year, int_month = load_data_for_month(selected_month, 2025)
+        # Slice the pre-aggregated cube instead of filtering rows
+        month_name, year = selected_month, 2025
+        int_month = None if selected_month == '2025' else month_map.get(selected_month, 12)
+        view = navigation_cube().slice(year, int_month)
         
     except Exception as e:
         print(f"❌ ERROR in callback: {str(e)}")
@@ -938,76 +1055,61 @@ def update_month_data(selected_month):
         traceback.print_exc()
         
         # Return empty/error state
-        return (
-            f"Error: {selected_month}",
-            "Error loading data",
-            '-',
-            "Error loading data",
-            '-',
-            "Error loading data",
-            '-',
-            *[empty_fig] * 22,  # All graph outputs (11 pairs of charts)
-        )
-    
-    # Load data for selected month
-    df_month, month_name, year, int_month = load_data_for_month(selected_month, 2025)
-    
-    # Strip whitespace from columns
-    df_month.columns = df_month.columns.str.strip()
-    
-    # Strip whitespace from string entries
-    for col in df_month.select_dtypes(include='object').columns:
-        df_month[col] = df_month[col].map(lambda x: x.strip() if isinstance(x, str) else x)
-    
-    # Create Full Name column
-    df_month['Full Name'] = df_month["Individual's First Name:"].astype(str) + " " + df_month["Individual's Last Name:"].astype(str)
-    
-    # Data preprocessing (same as original)
-    df_month['HMIS SPID Number:'] = df_month['HMIS SPID Number:'].fillna(-1)
-    df_month['MAP Card Number'] = df_month['MAP Card Number'].fillna(-1)
-    
-    # Debug: Print column names before rename
-    # print(f"📋 Columns BEFORE rename: {df_month.columns.tolist()[:10]}...")  # First 10 columns
-    
-    df_month.rename(
-        columns={
-            "Activity Duration (minutes):" : "Activity Duration",
-            "Location Encountered:" : "Location",
-            "Type of Coordination/Navigation Provided:" : "Support",
-            "Individual's Insurance Status:" : "Insurance",
-            "Individual's Status:" : "Status",
-            'Person submitting this form:' : 'Person',
-            'Total travel time (minutes):' : 'Travel',
-            'County:' : 'County',
-            'Race / Ethnicity:' : 'Ethnicity',  # Fixed: added spaces around slash
-            'Gender:' : 'Gender',
-            'Age:' : 'Age',
-            'Housing Status' : 'Housing',
-            'Income Level' : 'Income'
-        },
-        inplace=True
-    )
-    
-    # Debug: Print column names to see what we have
-    # print(f"📋 Available columns after rename: {df_month.columns.tolist()}")
-    
+        return error_state(selected_month) + (dash.no_update, dash.no_update)
+
+    return render_report(view, month_name) + ({'month': selected_month}, {})
+
+
+def range_label(start_date, end_date):
+    """Report label for a date range"""
+    return f"{pd.Timestamp(start_date):%b %d, %Y} - {pd.Timestamp(end_date):%b %d, %Y}"
+
+
+def ordered_range(start_date, end_date):
+    """The picked dates earliest first (typing into the picker can leave them reversed)"""
+    if pd.Timestamp(start_date) > pd.Timestamp(end_date):
+        return end_date, start_date
+    return start_date, end_date
+
+
+@app.callback(
+    [Output(component, prop, allow_duplicate=True) for component, prop in report_outputs] + view_outputs,
+    [Input('date-range', 'start_date'),
+     Input('date-range', 'end_date')],
+    prevent_initial_call=True
+)
+def update_date_range(start_date, end_date):
+    """Update all dashboard components for any start and end date (date-range index)"""
+
+    # Wait for both ends of the range
+    if not start_date or not end_date:
+        return dash.no_update
+
+    start_date, end_date = ordered_range(start_date, end_date)
+    label = range_label(start_date, end_date)
+    try:
+        print(f"🔄 Callback triggered for date range: {label}")
+        view = date_range_index().slice(start_date, end_date)
+    except Exception as e:
+        print(f"❌ ERROR in callback: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return error_state(label) + (dash.no_update, dash.no_update)
+
+    return render_report(view, label) + ({'start': start_date, 'end': end_date}, {})
+
+def render_report(view, month_name):
+    """Every KPI and chart for one view of the report (a cube slice or a date range)"""
+
     # Calculate metrics
-    clients_served = str(len(df_month))
-    df_duration = round(df_month['Activity Duration'].sum()/60)
+    clients_served = str(view.rows)
+    df_duration = round(view.total('Activity Duration')/60)
     
     # Travel Time Calculation
-    df_month['Travel'] = (df_month['Travel'].astype(str).str.strip().replace({'The Bumgalows': '0'}))
-    df_month['Travel'] = pd.to_numeric(df_month['Travel'], errors='coerce').fillna(0)
-    travel_time = round(df_month['Travel'].sum() / 60)
+    travel_time = round(view.total('Travel') / 60)
     
     # Race/Ethnicity Processing
-    df_month['Ethnicity'] = (df_month['Ethnicity'].astype(str).str.strip().replace({
-        "Hispanic/Latino": "Hispanic/ Latino",
-        "White": "White/ European Ancestry",
-        "White/ European Ancestry": "White / Caucasian",
-        "Group search": "N/A",
-    }))
-    df_race = df_month['Ethnicity'].value_counts().reset_index(name='Count')
+    df_race = view.counts('Ethnicity')
     
     race_bar = px.bar(df_race, x='Ethnicity', y='Count', color='Ethnicity', text='Count').update_layout(
         title=dict(text=f'{month_name} Race Distribution Bar Chart', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1024,8 +1126,7 @@ def update_month_data(selected_month):
     ).update_traces(texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
     # Gender Processing
-    df_month['Gender'] = (df_month['Gender'].astype(str).str.strip().replace({"Group search": "N/A"}))
-    df_gender = df_month['Gender'].value_counts().reset_index(name='Count')
+    df_gender = view.counts('Gender')
     
     gender_bar = px.bar(df_gender, x='Gender', y='Count', color='Gender', text='Count').update_layout(
         title=dict(text=f'{month_name} Sex Distribution Bar Chart', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1036,42 +1137,13 @@ def update_month_data(selected_month):
         hovermode='closest', bargap=0.07, bargroupgap=0
     ).update_traces(textposition='auto', hovertemplate='<b>Gender</b>: %{label}<br><b>Count</b>: %{y}<extra></extra>')
     
-    gender_pie = px.pie(df_month, names='Gender').update_layout(
+    gender_pie = px.pie(df_gender, names='Gender', values='Count').update_layout(
         title=dict(text=f'{month_name} Patient Visits by Sex', x=0.5, font=dict(size=21, family='Calibri', color='black')),
         font=dict(family='Calibri', size=16, color='black')
     ).update_traces(texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label} Visits</b>: %{value}<extra></extra>')
     
-    # Age Processing
-    def random_date(start, end):
-        return start + timedelta(days=np.random.randint(0, (end - start).days))
-    
-    start_date = datetime(1950, 1, 1)
-    end_date = datetime(2000, 12, 31)
-    
-    df_month['Individual\'s Date of Birth:'] = pd.to_datetime(df_month['Individual\'s Date of Birth:'], errors='coerce')
-    df_month['Individual\'s Date of Birth:'] = df_month['Individual\'s Date of Birth:'].apply(
-        lambda x: random_date(start_date, end_date) if pd.isna(x) else x
-    )
-    df_month['Client Age'] = pd.to_datetime('today').year - df_month['Individual\'s Date of Birth:'].dt.year
-    df_month['Client Age'] = df_month['Client Age'].apply(lambda x: "N/A" if x < 0 else x)
-    
-    def categorize_age(age):
-        if age == "N/A": return "N/A"
-        elif 10 <= age <= 19: return '10-19'
-        elif 20 <= age <= 29: return '20-29'
-        elif 30 <= age <= 39: return '30-39'
-        elif 40 <= age <= 49: return '40-49'
-        elif 50 <= age <= 59: return '50-59'
-        elif 60 <= age <= 69: return '60-69'
-        elif 70 <= age <= 79: return '70-79'
-        else: return '80+'
-    
-    df_month['Age_Group'] = df_month['Client Age'].apply(categorize_age)
-    df_decades = df_month.groupby('Age_Group', observed=True).size().reset_index(name='Patient_Visits')
-    
-    age_order = ['10-19', '20-29', '30-39', '40-49', '50-59', '60-69', '70-79', '80+']
-    df_decades['Age_Group'] = pd.Categorical(df_decades['Age_Group'], categories=age_order, ordered=True)
-    df_decades = df_decades.sort_values('Age_Group')
+    # Age Processing (only the buckets that occur, in bucket order)
+    df_decades = view.counts('Age_Group', order='key', name='Patient_Visits')
     
     age_bar = px.bar(df_decades, x='Age_Group', y='Patient_Visits', color='Age_Group', text='Patient_Visits').update_layout(
         title=dict(text=f'{month_name} Client Age Distribution', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1088,12 +1160,7 @@ def update_month_data(selected_month):
     ).update_traces(rotation=190, texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
     # Insurance Processing
-    df_month["Insurance"] = (df_month["Insurance"].str.strip().replace({
-        '': 'Unknown', 'unknown': 'Unknown', 'Just got it!!!': 'Private Insurance',
-        'Medicare': 'Medicaid', 'NONE': 'None', 'Map 000': 'MAP 100',
-        '30 Day 100': '30 DAY 100', '30 DAY100': '30 DAY 100', '30DAY 100': '30 DAY 100',
-    }))
-    df_insurance = df_month.groupby("Insurance").size().reset_index(name='Count')
+    df_insurance = view.counts('Insurance', order='key')
     
     insurance_bar = px.bar(df_insurance, x="Insurance", y='Count', color="Insurance", text='Count').update_layout(
         title=dict(text=f'{month_name} Insurance Status Bar Chart', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1110,8 +1177,7 @@ def update_month_data(selected_month):
     ).update_traces(rotation=100, texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
     # Location Processing
-    df_month['Location'] = (df_month['Location'].str.strip().replace({"": "N/A"}))
-    df_location = df_month['Location'].value_counts().reset_index(name='Count')
+    df_location = view.counts('Location')
     
     location_bar = px.bar(df_location, x="Location", y='Count', color="Location", text='Count').update_layout(
         title=dict(text=f'{month_name} Outreach/ Locations Encountered (Click to drill down)', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1127,17 +1193,8 @@ def update_month_data(selected_month):
         font=dict(family='Calibri', size=16, color='black')
     ).update_traces(rotation=200, texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
-    # Support Processing
-    counter = Counter()
-    for entry in df_month['Support']:
-        standardized_entry = str(entry).replace(' and ', ', ')
-        items = [i.strip() for i in re.split(pattern, standardized_entry) if i.strip()]
-        for item in items:
-            clean_item = re.sub(r'\s*\(.*?\)\s*', '', item).strip()
-            if clean_item:
-                counter[clean_item] += 1
-    
-    df_support = pd.DataFrame(counter.items(), columns=['Support', 'Count']).sort_values(by='Count', ascending=False)
+    # Support Processing (support cube, see cube.py)
+    df_support = view.support_counts().sort_values(by='Count', ascending=False)
     
     support_bar = px.bar(df_support, x='Support', y='Count', color='Support', text='Count').update_layout(
         title=dict(text=f'{month_name} Coordination Services Provided', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1154,8 +1211,7 @@ def update_month_data(selected_month):
     ).update_traces(rotation=195, texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
     # Status Processing
-    df_month['Status'] = (df_month['Status'].str.strip().replace({"": "N/A", "Group search": "N/A"}))
-    df_status = df_month['Status'].value_counts().reset_index(name='Count')
+    df_status = view.counts('Status')
     
     status_bar = px.bar(df_status, x="Status", y='Count', color="Status", text='Count').update_layout(
         title=dict(text=f'{month_name} Client Status Distribution', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1172,15 +1228,7 @@ def update_month_data(selected_month):
     ).update_traces(rotation=100, texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
     # Housing Status Processing
-    df_month['Housing'] = (
-        df_month['Housing']
-        .str.strip()
-        .replace({
-            "" : "N/A",
-        })
-    )
-    
-    df_housing = df_month['Housing'].value_counts().reset_index(name='Count')
+    df_housing = view.counts('Housing')
     
     housing_bar = px.bar(
         df_housing,
@@ -1243,20 +1291,7 @@ def update_month_data(selected_month):
     )
     
     # Income Level Processing
-    df_month['Income'] = (
-        df_month['Income']
-        .str.strip()
-        .replace({
-            0 : "N/A",
-            "$0" : "N/A",
-            "" : "N/A",
-            "Unknown" : "N/A", 
-            "unknown" : "N/A",
-            "?" : "N/A",
-        })
-    )
-    
-    df_income = df_month['Income'].value_counts().reset_index(name='Count')
+    df_income = view.counts('Income')
     # print("Income Unique Before:", df_income['Income'].unique())
 
     income_unique = [
@@ -1324,7 +1359,7 @@ def update_month_data(selected_month):
     )
     
     # Person Processing
-    df_person = df_month['Person'].value_counts().reset_index(name='Count')
+    df_person = view.counts('Person')
     
     person_bar = px.bar(df_person, x='Person', y='Count', color='Person', text='Count').update_layout(
         title=dict(text='Navigator Distribution', x=0.5, font=dict(size=21, family='Calibri', color='black')),
@@ -1340,27 +1375,8 @@ def update_month_data(selected_month):
         font=dict(family='Calibri', size=16, color='black')
     ).update_traces(rotation=100, texttemplate='%{value}<br>(%{percent:.1%})', hovertemplate='<b>%{label}</b>: %{value}<extra></extra>')
     
-    # Zip Code Processing
-    df_month['ZIP2'] = df_month['ZIP Code:'].astype(str).str.strip()
-    
-    # Define invalid/null values to exclude
-    invalid_zip_values = [
-        'Texas', 'Unhoused', 'UNHOUSED', 'UnKnown', 'Unknown', 'uknown',
-        'Unknown ', 'NA', 'nan', 'NaN', 'None', '5126364511', '', ' '
-    ]
-    
-    # Filter out invalid ZIP codes - only keep numeric values
-    valid_zip_mask = (
-        df_month['ZIP2'].str.isnumeric() & 
-        ~df_month['ZIP2'].isin(invalid_zip_values)
-    )
-    
-    # Create filtered dataframe with only valid ZIP codes
-    df_zip_filtered = df_month[valid_zip_mask].copy()
-    
-    # Create value count dataframe for the bar chart (only valid zips)
-    df_z = df_zip_filtered['ZIP2'].value_counts().reset_index(name='Count')
-    df_z.columns = ['ZIP2', 'Count']
+    # Zip Code Processing (only valid ZIPs, see zip_codes.py)
+    df_z = view.counts('ZIP2')
     
     df_z['Percentage'] = (df_z['Count'] / df_z['Count'].sum()) * 100
     df_z['text_label'] = df_z['Count'].astype(str) + ' (' + df_z['Percentage'].round(1).astype(str) + '%)'
@@ -1422,6 +1438,85 @@ def update_month_data(selected_month):
         zip_fig
     )
 
+# ======================== Cross-Filter Callback ======================== #
+
+# Charts whose clicks filter the rest of the report: component -> (dimension, clicked point field)
+cross_filter_charts = {
+    'race-bar': ('Ethnicity', 'x'),
+    'gender-bar': ('Gender', 'x'),
+    'age-bar': ('Age_Group', 'x'),
+    'insurance-bar': ('Insurance', 'x'),
+    'location-pie': ('Location', 'label'),  # the location bar drills down instead
+    'support-bar': ('Support', 'x'),
+    'status-bar': ('Status', 'x'),
+    'housing-bar': ('Housing', 'x'),
+    'income-bar': ('Income', 'x'),
+    'person-bar': ('Person', 'x'),
+    'zip-graph': ('ZIP2', 'y'),
+}
+
+
+def view_bounds(report_view):
+    """(start, end, label) of the month, full year or date range on screen"""
+    report_view = report_view or {'month': 'January'}
+    if 'start' in report_view:
+        return report_view['start'], report_view['end'], range_label(report_view['start'], report_view['end'])
+    month_name = report_view['month']
+    if month_name == '2025':
+        return '2025-01-01', '2025-12-31', month_name
+    start = pd.Timestamp(2025, month_map.get(month_name, 12), 1)
+    return start, start + pd.offsets.MonthEnd(0), month_name
+
+
+@app.callback(
+    [Output(component, prop, allow_duplicate=True) for component, prop in report_outputs]
+    + [Output('cross-filter', 'data')],
+    [Input(chart, 'clickData') for chart in cross_filter_charts]
+    + [Input('cross-filter-clear', 'n_clicks')],
+    [State('cross-filter', 'data'),
+     State('report-view', 'data')],
+    prevent_initial_call=True
+)
+def update_cross_filter(*args):
+    """
+    Toggle the clicked value in the cross-filter and redraw every chart from the
+    bitmap index: the selection is an AND of per-value bitmaps, counts are popcounts
+    """
+    selections, report_view = dict(args[-2] or {}), args[-1]
+    triggered = callback_context.triggered[0] if callback_context.triggered else {}
+    component = triggered.get('prop_id', '').split('.')[0]
+
+    if component == 'cross-filter-clear':
+        selections = {}
+    elif component in cross_filter_charts and triggered.get('value'):
+        dim, field = cross_filter_charts[component]
+        value = str(triggered['value']['points'][0].get(field))
+        chosen = list(selections.get(dim, []))
+        if value in chosen:
+            chosen.remove(value)
+        else:
+            chosen.append(value)
+        selections[dim] = chosen
+        selections = {dim: values for dim, values in selections.items() if values}
+    else:
+        return dash.no_update
+
+    start, end, label = view_bounds(report_view)
+    try:
+        print(f"🔄 Cross-filter for {label}: {selections}")
+        dates = date_range_index().slice(start, end)
+        view = bitmap_index().slice(selections, dates.lo, dates.hi)
+    except Exception as e:
+        print(f"❌ ERROR in callback: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return error_state(label) + (dash.no_update,)
+
+    outputs = list(render_report(view, label))
+    if selections:
+        outputs[0] = f"{label} ({'; '.join(f'{dim}: ' + ', '.join(values) for dim, values in selections.items())})"
+    return tuple(outputs) + (selections,)
+
 # ======================== Location Drill-Down Callback ======================== #
 
 @app.callback(
@@ -1430,15 +1525,23 @@ def update_month_data(selected_month):
      Output('location-breadcrumb', 'children')],
     [Input('location-drill-chart', 'clickData'),
      Input('location-home-btn', 'n_clicks')],
-    [State('location-drill-state', 'data')],
+    [State('location-drill-state', 'data'),
+     State('report-view', 'data'),
+     State('cross-filter', 'data')],
     prevent_initial_call=True
 )
-def location_drill_navigation(clickData, home_clicks, state):
+def location_drill_navigation(clickData, home_clicks, state, report_view, selections):
     """
     Handle drill-down navigation for location charts
     - Level 0: Show all locations
     - Level 1: Show support types for selected location
+    Both levels count the month or date range on screen, under the cross-filter,
+    from the same date-range and bitmap indexes as the other charts.
     """
+    start, end, _ = view_bounds(report_view)
+    dates = date_range_index().slice(start, end)
+    selections = dict(selections or {})
+    
     ctx = callback_context.triggered[0]['prop_id'] if callback_context.triggered else None
     
     # Handle back to home button
@@ -1457,6 +1560,7 @@ def location_drill_navigation(clickData, home_clicks, state):
     # Generate chart based on current level
     if state['level'] == 0:
         # Level 0: Show all locations (original chart)
+        df_location = bitmap_index().slice(selections, dates.lo, dates.hi).counts('Location')
         fig = px.bar(
             df_location,
             x="Location",
@@ -1515,23 +1619,8 @@ def location_drill_navigation(clickData, home_clicks, state):
     else:
         # Level 1: Show support types for selected location
         selected_loc = state['selected_location']
-        df_filtered = df[df['Location'] == selected_loc]
-        
-        counter = Counter()
-        for entry in df_filtered['Support']:
-            standardized_entry = str(entry).replace(' and ', ', ')
-            items = [i.strip() for i in re.split(pattern, standardized_entry) if i.strip()]
-            for item in items:
-                # Strip parenthetical descriptions - keep only text before the opening parenthesis
-                clean_item = re.sub(r'\s*\(.*?\)\s*', '', item).strip()
-                if clean_item:  # Only count if there's content after stripping
-                    counter[clean_item] += 1
-
-        df_support_filtered = pd.DataFrame(
-            counter.items(),
-            columns=['Support', 'Count']
-        ).sort_values(by='Count', ascending=False)
-
+        view = bitmap_index().slice({**selections, 'Location': [selected_loc]}, dates.lo, dates.hi)
+        df_support_filtered = view.support_counts().sort_values(by='Count', ascending=False)
         
         fig = px.bar(
             df_support_filtered,
@@ -0,0 +1,228 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import json
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from gspread.utils import extract_id_from_url
+
+from sheet_schema import apply_schema
+from sheets_client import open_spreadsheet
+
+# =================================== CONFIG ================================== #
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Where snapshots live. Every gunicorn worker on the host points at the same
+# folder, so only the first worker to boot after the TTL pays for the download.
+cache_dir = os.getenv("NAV_CACHE_DIR", os.path.join(script_dir, "cache"))
+
+# Seconds a snapshot is trusted without asking Google if the sheet changed
+cache_ttl = int(os.getenv("NAV_CACHE_TTL", "900"))
+
+# 'incremental' only downloads new/edited rows (see sheet_sync.py), 'snapshot' re-downloads everything
+sync_mode = os.getenv("NAV_SYNC_MODE", "incremental")
+
+# Seconds a worker waits on another worker's download before serving the snapshot it already has
+lock_timeout = int(os.getenv("NAV_CACHE_LOCK_TIMEOUT", "120"))
+
+# Age in seconds after which a lock file is taken to be left behind by a dead worker
+lock_stale_after = int(os.getenv("NAV_CACHE_LOCK_STALE", "600"))
+
+# ============================== Snapshot Cache ============================== #
+
+class SnapshotCache:
+    """Parquet snapshots of Google Sheets worksheets, keyed by spreadsheet ID and revision"""
+
+    def __init__(self, directory=None, ttl=None):
+        self.directory = directory or cache_dir
+        self.ttl = cache_ttl if ttl is None else ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _base_path(self, spreadsheet_id, worksheet_name):
+        safe_name = "".join(c if c.isalnum() else "_" for c in str(worksheet_name))
+        return os.path.join(self.directory, f"{spreadsheet_id}__{safe_name}")
+
+    def data_path(self, spreadsheet_id, worksheet_name):
+        return self._base_path(spreadsheet_id, worksheet_name) + ".parquet"
+
+    def meta_path(self, spreadsheet_id, worksheet_name):
+        return self._base_path(spreadsheet_id, worksheet_name) + ".json"
+
+    def read_meta(self, spreadsheet_id, worksheet_name):
+        """Return the snapshot metadata, or None when there is no usable snapshot"""
+        meta_file = self.meta_path(spreadsheet_id, worksheet_name)
+        if not os.path.exists(meta_file) or not os.path.exists(self.data_path(spreadsheet_id, worksheet_name)):
+            return None
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, meta):
+        return meta is not None and (time.time() - meta.get("fetched_at", 0)) < self.ttl
+
+    def read_values(self, spreadsheet_id, worksheet_name):
+        """Load the cached grid as (header, string DataFrame)"""
+        meta = self.read_meta(spreadsheet_id, worksheet_name)
+        if meta is None:
+            return None, None
+        grid = pd.read_parquet(self.data_path(spreadsheet_id, worksheet_name))
+        return meta["header"], grid
+
+    def write_values(self, spreadsheet_id, worksheet_name, values, revision, **extra):
+        """Store a raw get_all_values() grid; header goes in the metadata file"""
+        header = values[0] if values else []
+        width = len(header)
+        rows = [row[:width] + [""] * (width - len(row)) for row in values[1:]]
+        # Positional column names keep blank/duplicate sheet headers Parquet-safe
+        grid = pd.DataFrame(rows, columns=[f"c{i}" for i in range(width)], dtype=str)
+        self.write_grid(spreadsheet_id, worksheet_name, header, grid, revision, **extra)
+        return grid
+
+    def write_grid(self, spreadsheet_id, worksheet_name, header, grid, revision, **extra):
+        meta = {
+            "spreadsheet_id": spreadsheet_id,
+            "worksheet": worksheet_name,
+            "revision": revision,
+            "fetched_at": time.time(),
+            "header": header,
+            "rows": len(grid),
+            **extra,
+        }
+        # Write to temp files first so readers in other workers never see half a file
+        data_file = self.data_path(spreadsheet_id, worksheet_name)
+        meta_file = self.meta_path(spreadsheet_id, worksheet_name)
+        pid = os.getpid()
+        grid.to_parquet(f"{data_file}.{pid}.tmp", index=False)
+        with open(f"{meta_file}.{pid}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(f"{data_file}.{pid}.tmp", data_file)
+        os.replace(f"{meta_file}.{pid}.tmp", meta_file)
+        return meta
+
+    def touch(self, spreadsheet_id, worksheet_name, meta):
+        """Mark an unchanged snapshot as re-validated"""
+        meta = dict(meta, fetched_at=time.time())
+        meta_file = self.meta_path(spreadsheet_id, worksheet_name)
+        tmp_file = f"{meta_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, meta_file)
+        return meta
+
+    @contextmanager
+    def lock(self, spreadsheet_id, worksheet_name, timeout=None):
+        """Cross-process lock so concurrent workers download a sheet only once"""
+        timeout = lock_timeout if timeout is None else timeout
+        lock_file = self._base_path(spreadsheet_id, worksheet_name) + ".lock"
+        deadline = time.time() + timeout
+        fd = None
+        while fd is None:
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                # Clear locks left behind by a worker that died mid-download
+                try:
+                    if time.time() - os.path.getmtime(lock_file) > max(timeout, lock_stale_after):
+                        os.remove(lock_file)
+                        continue
+                except OSError:
+                    continue
+                if time.time() > deadline:
+                    break
+                time.sleep(0.25)
+        try:
+            yield fd is not None
+        finally:
+            if fd is not None:
+                os.close(fd)
+                try:
+                    os.remove(lock_file)
+                except OSError:
+                    pass
+
+# ============================== Helper Functions ============================== #
+
+def sheet_revision(client, spreadsheet_id):
+    """Drive 'modifiedTime' of the spreadsheet, or None if it can't be read"""
+    try:
+        return client.get_file_drive_metadata(spreadsheet_id)["modifiedTime"]
+    except Exception as e:
+        print(f"⚠️ Could not read revision for {spreadsheet_id}: {str(e)}")
+        return None
+
+
+def records_frame(header, grid, schema=None):
+    """
+    Typed DataFrame for a cached grid. Declared columns are parsed per the schema
+    (see sheet_schema.py); the rest match pd.DataFrame(get_all_records())
+    """
+    return apply_schema(header, grid, schema)
+
+
+def load_records(client, sheet_url, worksheet_name=None, cache=None, schema=None):
+    """
+    Return a worksheet as a records DataFrame, served from the local snapshot when possible
+
+    - Snapshot younger than the TTL: read from disk, no network
+    - Older, but the sheet's revision is unchanged: one Drive metadata call, then disk
+    - Otherwise: download once (under a cross-worker lock) and refresh the snapshot.
+      If the lock times out the existing snapshot is served as is (TimeoutError without one)
+    """
+    cache = cache or default_cache()
+    spreadsheet_id = extract_id_from_url(sheet_url)
+    key = worksheet_name or "sheet1"
+
+    meta = cache.read_meta(spreadsheet_id, key)
+    if cache.is_fresh(meta):
+        header, grid = cache.read_values(spreadsheet_id, key)
+        return records_frame(header, grid, schema)
+
+    revision = sheet_revision(client, spreadsheet_id)
+    if meta is not None and revision is not None and meta.get("revision") == revision:
+        cache.touch(spreadsheet_id, key, meta)
+        header, grid = cache.read_values(spreadsheet_id, key)
+        return records_frame(header, grid, schema)
+
+    with cache.lock(spreadsheet_id, key) as locked:
+        # Another worker may have refreshed the snapshot while we waited
+        meta = cache.read_meta(spreadsheet_id, key)
+        if not locked:
+            # Another worker still holds the lock: never write alongside it
+            if meta is None:
+                raise TimeoutError(f"Timed out waiting for the cache lock on '{key}' of spreadsheet {spreadsheet_id}")
+            print(f"⚠️ Cache lock on '{key}' timed out, serving the existing snapshot")
+            header, grid = cache.read_values(spreadsheet_id, key)
+            return records_frame(header, grid, schema)
+        if meta is not None and revision is not None and meta.get("revision") == revision:
+            header, grid = cache.read_values(spreadsheet_id, key)
+            return records_frame(header, grid, schema)
+
+        if sync_mode == "incremental":
+            # Imported here because sheet_sync builds on this module
+            from sheet_sync import full_sync, incremental_sync
+            if meta is None:
+                header, grid = full_sync(client, spreadsheet_id, key, worksheet_name, cache, revision)
+            else:
+                header, grid = incremental_sync(client, spreadsheet_id, key, worksheet_name, cache, meta, revision)
+            return records_frame(header, grid, schema)
+
+        print(f"⬇️ Downloading '{key}' from spreadsheet {spreadsheet_id}")
+        spreadsheet = open_spreadsheet(client, spreadsheet_id)
+        worksheet = spreadsheet.worksheet(worksheet_name) if worksheet_name else spreadsheet.sheet1
+        values = worksheet.get_all_values()
+        grid = cache.write_values(spreadsheet_id, key, values, revision)
+        return records_frame(values[0] if values else [], grid, schema)
+
+
+_default_cache = None
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SnapshotCache()
+    return _default_cache
@@ -0,0 +1,97 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+from gspread.utils import numericise_all
+
+# ================================== Schemas ================================== #
+
+# Column kinds:
+#   'string'   -> kept as the sheet text
+#   'number'   -> float, blanks and junk become NaN
+#   'datetime' -> parsed with pd.to_datetime(errors='coerce'), blanks become NaT
+#   'category' -> pandas category over the sheet text
+# Columns that aren't declared are numericised cell by cell the way get_all_records() does.
+
+navigation_schema = {
+    'Timestamp': 'string',
+    'Date of Activity': 'datetime',
+    'Person submitting this form:': 'string',
+    'Activity Duration (minutes):': 'number',
+    'Location Encountered:': 'category',
+    "Individual's First Name:": 'string',
+    "Individual's Last Name:": 'string',
+    "Individual's Date of Birth:": 'string',
+    "Individual's Insurance Status:": 'category',
+    "Individual's street address:": 'string',
+    'City:': 'string',
+    'ZIP Code:': 'string',
+    'County:': 'string',
+    'Type of Coordination/Navigation Provided:': 'string',
+    'Provide brief support description:': 'string',
+    "Individual's Status:": 'string',
+    'Gender:': 'category',
+    'Race / Ethnicity:': 'category',
+    'Total travel time (minutes):': 'number',
+    'Housing Status': 'category',
+    'Income Level': 'category',
+}
+
+findhelp_schema = {
+    'seeker_name': 'string',
+    'created_at': 'string',
+}
+
+# ============================== Schema Engine ============================== #
+
+def numericise_column(col):
+    """Vectorized get_all_records() numericise: ints, then floats, everything else unchanged"""
+    values = col.to_numpy(dtype=object, copy=True)
+    if col.empty:
+        return values
+    try:
+        # Thousands separators are dropped; underscores are never treated as numeric
+        cleaned = col.str.replace(',', '', regex=False).str.strip()
+        has_underscore = col.str.contains('_', regex=False).to_numpy()
+        is_int = cleaned.str.fullmatch(r'[+-]?\d+').to_numpy() & ~has_underscore
+        if is_int.any():
+            values[is_int] = [int(v) for v in cleaned[is_int].astype('int64')]
+        rest = ~is_int & ~has_underscore & (cleaned != '').to_numpy()
+        if rest.any():
+            as_float = pd.to_numeric(cleaned[rest], errors='coerce').to_numpy()
+            ok = ~np.isnan(as_float)
+            idx = np.flatnonzero(rest)[ok]
+            values[idx] = as_float[ok].tolist()
+    except (OverflowError, ValueError):
+        # Numbers too large for int64: fall back to the cell-by-cell path
+        values = np.array(numericise_all(col.tolist()), dtype=object)
+    return values
+
+
+def convert_column(col, kind):
+    if kind == 'string':
+        return col.to_numpy(dtype=object)
+    if kind == 'number':
+        return pd.to_numeric(col.str.replace(',', '', regex=False).str.strip(), errors='coerce').to_numpy()
+    if kind == 'datetime':
+        return pd.to_datetime(col, errors='coerce')
+    if kind == 'category':
+        return pd.Categorical(col)
+    return numericise_column(col)
+
+
+def apply_schema(header, grid, schema=None):
+    """
+    Turn a raw string grid (positional c0..cN columns from get_all_values()) into a
+    typed DataFrame, one vectorized conversion per column instead of a dict per row
+    """
+    schema = schema or {}
+    columns = {}
+    for name, col in zip(header, grid.columns):
+        columns[name] = convert_column(grid[col].astype(object), schema.get(name.strip(), 'infer'))
+    df_typed = pd.DataFrame(columns, columns=header, index=pd.RangeIndex(len(grid)))
+    # All-int / all-float inferred columns get proper dtypes, like pd.DataFrame(records) does
+    inferred = [name for name in header if schema.get(name.strip(), 'infer') == 'infer']
+    if inferred:
+        df_typed[inferred] = df_typed[inferred].infer_objects()
+    return df_typed
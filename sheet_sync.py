@@ -0,0 +1,151 @@
+# =================================== IMPORTS ================================= #
+
+import os
+
+import numpy as np
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from sheets_client import open_spreadsheet
+
+# =================================== CONFIG ================================== #
+
+# Already-synced rows re-read on every sync so recent edits are picked up.
+# Edits to older rows are NOT seen by an incremental sync: they only land on
+# the next full sync (every NAV_SYNC_FULL_EVERY syncs), so raise this if staff
+# routinely correct entries further back than the last few hundred rows.
+verify_rows = int(os.getenv("NAV_SYNC_VERIFY_ROWS", "200"))
+
+# Every Nth sync re-reads the whole sheet to catch edits above the verify window
+full_every = int(os.getenv("NAV_SYNC_FULL_EVERY", "24"))
+
+hash_column = "_row_hash"
+
+# ============================== Helper Functions ============================== #
+
+def row_hashes(grid):
+    """64-bit hash per row over the sheet values (vectorized)"""
+    value_cols = [col for col in grid.columns if col != hash_column]
+    if grid.empty:
+        return np.array([], dtype="uint64")
+    return pd.util.hash_pandas_object(grid[value_cols], index=False).to_numpy()
+
+
+def trim_header(row):
+    """Header cells without the trailing blanks (get_all_values pads them, range reads drop them)"""
+    row = list(row)
+    while row and not str(row[-1]).strip():
+        row.pop()
+    return row
+
+
+def grid_from_values(values, width):
+    """Raw sheet rows -> string DataFrame with positional c0..cN columns"""
+    rows = [row[:width] + [""] * (width - len(row)) for row in values]
+    return pd.DataFrame(rows, columns=[f"c{i}" for i in range(width)], dtype=str)
+
+
+def last_column(width):
+    # rowcol_to_a1(1, 28) -> 'AB1'
+    return rowcol_to_a1(1, max(width, 1))[:-1]
+
+
+def store_synced(cache, spreadsheet_id, key, header, grid, revision, title, sync_count):
+    grid = grid.reset_index(drop=True)
+    grid[hash_column] = row_hashes(grid)
+    last_timestamp = grid["c0"].iloc[-1] if len(grid) else None
+    cache.write_grid(
+        spreadsheet_id, key, header, grid, revision,
+        title=title,
+        synced_rows=len(grid),
+        last_timestamp=last_timestamp,
+        sync_count=sync_count,
+    )
+    return grid
+
+# ============================== Sync Functions ============================== #
+
+def full_sync(client, spreadsheet_id, key, worksheet_name, cache, revision, previous=None):
+    """Download the whole worksheet; with a previous grid, report which rows changed"""
+    spreadsheet = open_spreadsheet(client, spreadsheet_id)
+    worksheet = spreadsheet.worksheet(worksheet_name) if worksheet_name else spreadsheet.sheet1
+    values = worksheet.get_all_values()
+    header = trim_header(values[0]) if values else []
+    grid = grid_from_values(values[1:], len(header))
+
+    if previous is not None and len(previous) and list(previous.columns[:-1]) == list(grid.columns):
+        fresh = row_hashes(grid)
+        overlap = min(len(previous), len(grid))
+        changed = np.flatnonzero(previous[hash_column].to_numpy()[:overlap] != fresh[:overlap])
+        print(f"🔁 Full reconcile: {len(changed)} edited rows, {max(len(grid) - overlap, 0)} new rows")
+
+    return header, store_synced(cache, spreadsheet_id, key, header, grid, revision, worksheet.title, 0)
+
+
+def incremental_sync(client, spreadsheet_id, key, worksheet_name, cache, meta, revision):
+    """
+    Fetch only the tail of an append-only worksheet and merge it into the local store
+
+    One batched request reads the header row plus every row from
+    (last synced row - verify window) to the end of the sheet. Rows in the
+    window are compared by hash to pick up edits; rows past it are appended.
+    Edits above the window stay stale until the next full sync (every
+    full_every-th call).
+    Falls back to a full download when the header changes or the last synced
+    row no longer carries the same Timestamp (rows deleted or re-sorted).
+    """
+    header, previous = cache.read_values(spreadsheet_id, key)
+    header = trim_header(header or [])
+    title = meta.get("title")
+    synced_rows = meta.get("synced_rows")
+    sync_count = meta.get("sync_count", 0) + 1
+
+    if previous is None or title is None or synced_rows is None or hash_column not in previous.columns:
+        return full_sync(client, spreadsheet_id, key, worksheet_name, cache, revision)
+
+    if full_every and sync_count % full_every == 0:
+        return full_sync(client, spreadsheet_id, key, worksheet_name, cache, revision, previous)
+
+    width = len(header)
+    window_start = max(synced_rows - verify_rows, 0)
+    # Sheet row numbers are 1-based and row 1 is the header
+    tail_range = f"A{window_start + 2}:{last_column(width)}"
+    response = client.http_client.values_batch_get(
+        spreadsheet_id, [f"'{title}'!1:1", f"'{title}'!{tail_range}"]
+    )
+    header_range, tail = response.get("valueRanges", [{}, {}])
+    remote_header = trim_header((header_range.get("values") or [[]])[0])
+    tail_values = tail.get("values", [])
+
+    if remote_header != header:
+        print("⚠️ Header changed, running a full sync")
+        return full_sync(client, spreadsheet_id, key, worksheet_name, cache, revision)
+
+    tail_grid = grid_from_values(tail_values, width)
+    window_len = synced_rows - window_start
+
+    # The last synced row must still be in place, otherwise rows moved above us
+    if len(tail_grid) < window_len or (
+        window_len and tail_grid["c0"].iloc[window_len - 1] != meta.get("last_timestamp")
+    ):
+        print("⚠️ Synced rows moved or were deleted, running a full sync")
+        return full_sync(client, spreadsheet_id, key, worksheet_name, cache, revision)
+
+    window = tail_grid.iloc[:window_len]
+    appended = tail_grid.iloc[window_len:]
+
+    merged = previous.drop(columns=[hash_column])
+    if window_len:
+        old_hashes = previous[hash_column].to_numpy()[window_start:synced_rows]
+        changed = np.flatnonzero(row_hashes(window) != old_hashes)
+        if len(changed):
+            merged.iloc[window_start + changed] = window.iloc[changed].to_numpy()
+    else:
+        changed = []
+
+    if len(appended):
+        merged = pd.concat([merged, appended], ignore_index=True)
+
+    print(f"🔄 Incremental sync: {len(appended)} new rows, {len(changed)} edited rows")
+    grid = store_synced(cache, spreadsheet_id, key, header, merged, revision, title, sync_count)
+    return header, grid
@@ -0,0 +1,213 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import json
+import time
+import base64
+import random
+import threading
+from collections import Counter, deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from google.auth.transport.requests import AuthorizedSession
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+# =================================== CONFIG ================================== #
+
+# Point every Sheets/Drive call somewhere else, e.g. http://127.0.0.1:8765 for sheets_stub.py
+api_url = os.getenv("SHEETS_API_URL")
+
+# Retries on 429 / 5xx before giving up, and the backoff bounds in seconds
+max_retries = int(os.getenv("SHEETS_MAX_RETRIES", "5"))
+backoff_base = float(os.getenv("SHEETS_BACKOFF_BASE", "1.0"))
+backoff_cap = float(os.getenv("SHEETS_BACKOFF_CAP", "32"))
+
+# Requests allowed per rolling minute (Sheets read quota is 60/min/user by default)
+quota_per_minute = int(os.getenv("SHEETS_QUOTA_PER_MINUTE", "60"))
+
+# Keep-alive connections kept open per host
+pool_size = int(os.getenv("SHEETS_POOL_SIZE", "8"))
+
+retry_statuses = {408, 429, 500, 502, 503, 504}
+
+scope = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+# ================================ Credentials ================================ #
+
+def load_credentials(creds_path=None):
+    """Service account credentials from GOOGLE_CREDENTIALS (base64 JSON) or a local key file"""
+    from google.oauth2.service_account import Credentials
+
+    encoded_key = os.getenv("GOOGLE_CREDENTIALS")
+    if encoded_key:
+        json_key = json.loads(base64.b64decode(encoded_key).decode("utf-8"))
+        return Credentials.from_service_account_info(json_key, scopes=scope)
+    if creds_path and os.path.exists(creds_path):
+        return Credentials.from_service_account_file(creds_path, scopes=scope)
+    raise FileNotFoundError("Service account JSON file not found and GOOGLE_CREDENTIALS is not set.")
+
+# ================================ Quota Tracker ================================ #
+
+class QuotaTracker:
+    """Rolling one-minute request count; callers wait instead of tripping the API quota"""
+
+    def __init__(self, per_minute=None):
+        self.per_minute = quota_per_minute if per_minute is None else per_minute
+        self._sent = deque()
+        self._lock = threading.Lock()
+        self.total = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self.statuses = Counter()
+
+    def acquire(self):
+        """Block until one more request fits in the current minute"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= 60:
+                    self._sent.popleft()
+                if not self.per_minute or len(self._sent) < self.per_minute:
+                    self._sent.append(now)
+                    self.total += 1
+                    return
+                wait = 60 - (now - self._sent[0])
+                self.throttled_seconds += wait
+            print(f"🚦 Sheets quota reached ({self.per_minute}/min), waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    def record(self, status):
+        with self._lock:
+            self.statuses[status] += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def usage(self):
+        with self._lock:
+            now = time.monotonic()
+            last_minute = sum(1 for sent in self._sent if now - sent < 60)
+            return {
+                "last_minute": last_minute,
+                "per_minute": self.per_minute,
+                "total": self.total,
+                "retries": self.retries,
+                "throttled_seconds": round(self.throttled_seconds, 2),
+                "statuses": dict(self.statuses),
+            }
+
+
+quota = QuotaTracker()
+
+# ============================== HTTP Client ============================== #
+
+class PooledSession(AuthorizedSession):
+    """Authorized keep-alive session; optionally redirects Google hosts to a stand-in server"""
+
+    def __init__(self, credentials, base_url=None):
+        super().__init__(credentials)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+    def request(self, method, url, *args, **kwargs):
+        if self.base_url:
+            url = re.sub(r"^https://(sheets|www)\.googleapis\.com", self.base_url, url)
+        return super().request(method, url, *args, **kwargs)
+
+
+def should_retry(err):
+    if err.code in retry_statuses:
+        return True
+    # Drive reports rate limits as 403 with a usageLimits reason
+    errors = err.error.get("errors") or [{}]
+    return err.code == 403 and (
+        errors[0].get("domain") == "usageLimits" or "RateLimitExceeded" in str(errors[0].get("reason", ""))
+    )
+
+
+def backoff_seconds(attempt, retry_after=None):
+    """Exponential backoff with full jitter; a Retry-After header wins when present"""
+    if retry_after:
+        try:
+            return min(float(retry_after), backoff_cap)
+        except ValueError:
+            pass
+    return random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+
+
+class RateLimitedHTTPClient(HTTPClient):
+    """gspread HTTP client that paces requests against the quota and retries 429 / 5xx"""
+
+    def request(self, method, endpoint, *args, **kwargs):
+        for attempt in range(max_retries + 1):
+            quota.acquire()
+            try:
+                response = super().request(method, endpoint, *args, **kwargs)
+                quota.record(response.status_code)
+                return response
+            except APIError as err:
+                quota.record(err.code)
+                if attempt == max_retries or not should_retry(err):
+                    raise
+                wait = backoff_seconds(attempt, err.response.headers.get("Retry-After"))
+                print(f"⏳ Sheets API returned {err.code}, retry {attempt + 1}/{max_retries} in {wait:.1f}s")
+            except (requests.ConnectionError, requests.Timeout) as err:
+                quota.record(type(err).__name__)
+                if attempt == max_retries:
+                    raise
+                wait = backoff_seconds(attempt)
+                print(f"⏳ Sheets API unreachable ({type(err).__name__}), retry {attempt + 1}/{max_retries} in {wait:.1f}s")
+            quota.record_retry()
+            time.sleep(wait)
+
+# ============================== Shared Clients ============================== #
+
+_clients = {}
+_spreadsheets = {}
+_lock = threading.Lock()
+
+def get_client(creds_path=None, timeout=None):
+    """
+    One gspread client (one pooled session) per key file, shared by every dashboard source.
+    A timeout (seconds per request) is applied on every call, not only the first;
+    None leaves the client's current timeout as it is.
+    """
+    import gspread
+    from google.auth.credentials import AnonymousCredentials
+
+    with _lock:
+        if creds_path not in _clients:
+            # The stub server doesn't check tokens, so it runs without credentials
+            credentials = AnonymousCredentials() if api_url else load_credentials(creds_path)
+            session = PooledSession(credentials, api_url)
+            _clients[creds_path] = gspread.Client(None, session=session, http_client=RateLimitedHTTPClient)
+        client = _clients[creds_path]
+        if timeout is not None:
+            client.http_client.set_timeout(timeout)
+        return client
+
+
+def open_spreadsheet(client, spreadsheet_id):
+    """Spreadsheet handle, opened once per ID (opening costs a metadata request)"""
+    with _lock:
+        spreadsheet = _spreadsheets.get(spreadsheet_id)
+    if spreadsheet is None:
+        spreadsheet = client.open_by_key(spreadsheet_id)
+        with _lock:
+            _spreadsheets[spreadsheet_id] = spreadsheet
+    return spreadsheet
+
+
+def forget_spreadsheet(spreadsheet_id):
+    """Drop a cached handle, e.g. after a worksheet was added or renamed"""
+    with _lock:
+        _spreadsheets.pop(spreadsheet_id, None)
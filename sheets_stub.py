@@ -0,0 +1,211 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import json
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pandas as pd
+
+# =============================== Sheets Stub ================================ #
+
+# Local stand-in for the Sheets and Drive APIs, serving the tables synthetic_data.py writes.
+# Spreadsheet IDs are the source names ('navigation', 'findhelp', 'fitness'); worksheets
+# are the <name>__<worksheet> files; --sheet maps real spreadsheet IDs onto those names.
+# Failures can be injected to exercise retries:
+#   python sheets_stub.py data/synthetic --fail 3 --status 429,503 --sheet <navigation-id>=navigation
+#   SHEETS_API_URL=http://127.0.0.1:8765 python nav_dec_25.py
+
+
+def column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+class SheetsStub:
+    """Tables from a synthetic data folder, plus request counters and scripted failures"""
+
+    def __init__(self, folder, fail=0, statuses=(429,), retry_after=None, aliases=None):
+        self.folder = folder
+        self.aliases = aliases or {}
+        self.fail = fail
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def next_failure(self):
+        """Status to fail this request with, or None once the scripted failures are used up"""
+        with self._lock:
+            self.requests += 1
+            if self.failed < self.fail:
+                status = self.statuses[self.failed % len(self.statuses)]
+                self.failed += 1
+                return status
+        return None
+
+    def worksheets(self, spreadsheet_id):
+        """[(title, path)] for one spreadsheet, the base table first (it is sheet1)"""
+        spreadsheet_id = self.aliases.get(spreadsheet_id, spreadsheet_id)
+        found = []
+        for file_name in sorted(os.listdir(self.folder)):
+            stem, ext = os.path.splitext(file_name)
+            if ext not in ('.csv', '.parquet'):
+                continue
+            if stem == spreadsheet_id:
+                found.insert(0, ('Sheet1', os.path.join(self.folder, file_name)))
+            elif stem.startswith(f"{spreadsheet_id}__"):
+                found.append((stem.split('__', 1)[1], os.path.join(self.folder, file_name)))
+        # Parquet and CSV copies of the same table: keep one
+        unique = {}
+        for title, path in found:
+            unique.setdefault(title, path)
+        return list(unique.items())
+
+    def values(self, path):
+        if path.endswith('.parquet'):
+            df_table = pd.read_parquet(path)
+            df_table = df_table.astype(object).where(df_table.notna(), '').astype(str)
+        else:
+            df_table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        return [list(df_table.columns)] + df_table.values.tolist()
+
+    def metadata(self, spreadsheet_id):
+        sheets = []
+        for index, (title, path) in enumerate(self.worksheets(spreadsheet_id)):
+            values = self.values(path)
+            sheets.append({'properties': {
+                'sheetId': index, 'title': title, 'index': index, 'sheetType': 'GRID',
+                'gridProperties': {'rowCount': len(values), 'columnCount': len(values[0]) if values else 0},
+            }})
+        if not sheets:
+            return None
+        return {'spreadsheetId': spreadsheet_id, 'properties': {'title': spreadsheet_id}, 'sheets': sheets}
+
+    def value_range(self, spreadsheet_id, range_name):
+        """Rows for "'Title'!A5:T", "'Title'!1:1" or a bare "'Title'" """
+        title, _, a1 = range_name.partition('!')
+        title = title.strip("'")
+        paths = dict(self.worksheets(spreadsheet_id))
+        if title not in paths:
+            return None
+        values = self.values(paths[title])
+
+        match = re.fullmatch(r'([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?', a1)
+        if a1 and match:
+            start_col, start_row, end_col, end_row = match.groups()
+            values = values[int(start_row or 1) - 1:int(end_row) if end_row else None]
+            first = column_number(start_col) - 1 if start_col else 0
+            last = column_number(end_col) if end_col else None
+            values = [row[first:last] for row in values]
+
+        # The API trims trailing empty cells and rows
+        trimmed = []
+        for row in values:
+            while row and row[-1] == '':
+                row = row[:-1]
+            trimmed.append(row)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+        return {'range': range_name, 'majorDimension': 'ROWS', 'values': trimmed}
+
+    def modified_time(self, spreadsheet_id):
+        paths = [path for _, path in self.worksheets(spreadsheet_id)]
+        if not paths:
+            return None
+        latest = max(os.path.getmtime(path) for path in paths)
+        return datetime.fromtimestamp(latest, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    stub = None
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status, message, headers=None):
+        self.send_json(status, {'error': {'code': status, 'message': message, 'status': 'STUB_ERROR'}}, headers)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+
+        if path == '/stats':
+            return self.send_json(200, {'requests': self.stub.requests, 'failed': self.stub.failed})
+
+        status = self.stub.next_failure()
+        if status is not None:
+            headers = {'Retry-After': str(self.stub.retry_after)} if self.stub.retry_after is not None else None
+            return self.send_error_json(status, f'Injected failure ({status})', headers)
+
+        match = re.fullmatch(r'/drive/v3/files/([^/]+)', path)
+        if match:
+            modified = self.stub.modified_time(match.group(1))
+            if modified is None:
+                return self.send_error_json(404, 'File not found')
+            return self.send_json(200, {'id': match.group(1), 'name': match.group(1), 'modifiedTime': modified})
+
+        match = re.fullmatch(r'/v4/spreadsheets/([^/]+)/values:batchGet', path)
+        if match:
+            value_ranges = [self.stub.value_range(match.group(1), r) for r in query.get('ranges', [])]
+            if any(vr is None for vr in value_ranges):
+                return self.send_error_json(400, 'Unable to parse range')
+            return self.send_json(200, {'spreadsheetId': match.group(1), 'valueRanges': value_ranges})
+
+        match = re.fullmatch(r'/v4/spreadsheets/([^/]+)/values/(.+)', path)
+        if match:
+            value_range = self.stub.value_range(match.group(1), match.group(2))
+            if value_range is None:
+                return self.send_error_json(400, 'Unable to parse range')
+            return self.send_json(200, value_range)
+
+        match = re.fullmatch(r'/v4/spreadsheets/([^/:]+)', path)
+        if match:
+            metadata = self.stub.metadata(match.group(1))
+            if metadata is None:
+                return self.send_error_json(404, 'Requested entity was not found.')
+            return self.send_json(200, metadata)
+
+        return self.send_error_json(404, f'No stub route for {path}')
+
+    def log_message(self, format, *args):
+        print(f"🧪 stub {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+
+def make_server(folder, port=8765, fail=0, statuses=(429,), retry_after=None, aliases=None):
+    """Build the stub server; run it with serve_forever() (in a thread for in-process checks)"""
+    stub = SheetsStub(folder, fail, statuses, retry_after, aliases)
+    handler = type('BoundStubHandler', (StubHandler,), {'stub': stub})
+    return ThreadingHTTPServer(('127.0.0.1', port), handler), stub
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local stand-in for the Google Sheets API')
+    parser.add_argument('folder', help='folder written by synthetic_data.py')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail', type=int, default=0, help='fail this many requests before serving')
+    parser.add_argument('--status', default='429', help='comma-separated statuses for injected failures')
+    parser.add_argument('--retry-after', type=float, default=None, help='Retry-After seconds on failures')
+    parser.add_argument('--sheet', action='append', default=[], metavar='ID=NAME', help='serve table NAME as spreadsheet ID')
+    args = parser.parse_args()
+
+    statuses = [int(s) for s in args.status.split(',')]
+    aliases = dict(alias.split('=', 1) for alias in args.sheet)
+    server, _ = make_server(args.folder, args.port, args.fail, statuses, args.retry_after, aliases)
+    print(f"🚀 Sheets stub on http://127.0.0.1:{args.port} serving {args.folder}")
+    server.serve_forever()
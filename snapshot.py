@@ -0,0 +1,91 @@
+# =================================== IMPORTS ================================= #
+
+import threading
+import time
+import traceback
+from types import MappingProxyType
+
+# ================================= Snapshot ================================== #
+
+class Snapshot:
+    """Read-only bundle of every frame and figure one dashboard build produced"""
+
+    __slots__ = ("version", "built_at", "build_seconds", "_artifacts")
+
+    def __init__(self, version, artifacts, build_seconds=0.0):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "built_at", time.time())
+        object.__setattr__(self, "build_seconds", build_seconds)
+        object.__setattr__(self, "_artifacts", MappingProxyType(dict(artifacts)))
+
+    def __getattr__(self, name):
+        try:
+            return self._artifacts[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._artifacts[name]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is read-only; build a new one instead")
+
+# ============================== Refresher Thread ============================== #
+
+class SnapshotRefresher:
+    """
+    Re-ingests data on a schedule and publishes each rebuilt Snapshot with a
+    single reference swap, so callbacks never see a half-built report and never
+    wait on Google Sheets.
+
+    load_fn() -> raw inputs (tuple), build_fn(*inputs) -> dict of artifacts
+    """
+
+    def __init__(self, load_fn, build_fn, interval=600, name="snapshot-refresher"):
+        self.load_fn = load_fn
+        self.build_fn = build_fn
+        self.interval = interval
+        self.name = name
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()  # serializes rebuilds, never taken by readers
+        self._stop = threading.Event()
+        self._thread = None
+
+    def current(self):
+        """The latest published snapshot (a plain attribute read)"""
+        return self._snapshot
+
+    def refresh(self):
+        """Ingest and rebuild off the request path, then swap the snapshot in"""
+        with self._lock:
+            started = time.perf_counter()
+            inputs = self.load_fn()
+            artifacts = self.build_fn(*inputs)
+            self._version += 1
+            snapshot = Snapshot(self._version, artifacts, time.perf_counter() - started)
+            # Rebinding one attribute is atomic, so readers get the old or the new snapshot
+            self._snapshot = snapshot
+        print(f"✅ Snapshot v{snapshot.version} published in {snapshot.build_seconds:.2f}s")
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous snapshot when a refresh fails
+                print(f"❌ ERROR refreshing snapshot: {str(e)}")
+                traceback.print_exc()
+
+    def start(self):
+        """Build the first snapshot synchronously, then refresh in a daemon thread"""
+        if self._snapshot is None:
+            self.refresh()
+        if self.interval and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
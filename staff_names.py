@@ -0,0 +1,196 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import threading
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from cleaning import normalization_maps, appearance_categories
+
+# =================================== CONFIG ================================== #
+
+# Similarity (0-1) two staff names need to be treated as the same person
+name_match_threshold = float(os.getenv("NAME_MATCH_THRESHOLD", "0.88"))
+
+honorifics = {'dr', 'mr', 'mrs', 'ms', 'miss', 'prof'}
+
+# ============================== Name Keys ============================== #
+
+def name_tokens(name):
+    """Lowercase word tokens: 'Dr EricRoberts' -> ['eric', 'roberts'] (camel case split, titles dropped)"""
+    spaced = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', str(name))
+    tokens = re.findall(r"[a-z0-9']+", spaced.lower())
+    return [t for t in tokens if t.strip("'") not in honorifics]
+
+
+def soundex(word):
+    """American Soundex code of one word, e.g. 'Roberts' -> 'R163'"""
+    codes = {c: d for d, letters in {
+        '1': 'bfpv', '2': 'cgjkqsxz', '3': 'dt', '4': 'l', '5': 'mn', '6': 'r',
+    }.items() for c in letters}
+    word = re.sub(r'[^a-z]', '', word.lower())
+    if not word:
+        return ''
+    encoded = word[0].upper()
+    last = codes.get(word[0], '')
+    for char in word[1:]:
+        code = codes.get(char, '')
+        if code and code != last:
+            encoded += code
+        if char not in 'hw':
+            last = code
+    return (encoded + '000')[:4]
+
+
+def blocking_keys(tokens):
+    """Blocks a name is filed under: sorted tokens, and the sound of its first and last word"""
+    if not tokens:
+        return []
+    keys = ['T:' + ' '.join(sorted(tokens)), 'F:' + soundex(tokens[0])]
+    if len(tokens) > 1:
+        keys.append('L:' + soundex(tokens[-1]))
+    return keys
+
+
+def one_transposition(a, b):
+    """True when b is a with one pair of neighbouring characters swapped ('ovieod' / 'oviedo')"""
+    if len(a) != len(b):
+        return False
+    diff = [i for i in range(len(a)) if a[i] != b[i]]
+    return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+
+
+def safe_merge(tokens, canonical_tokens):
+    """
+    Whether a near match may be merged without review: the first names are the same,
+    or the names only differ in spacing / case or by one swapped pair of letters.
+    Anything else (Michelle / Michael, Erica / Eric) could be a different person.
+    """
+    if tokens[:1] == canonical_tokens[:1]:
+        return True
+    joined, canonical = ''.join(tokens), ''.join(canonical_tokens)
+    return joined == canonical or one_transposition(joined, canonical)
+
+
+def form_rank(name, count=0):
+    """Sort key for picking the display form of a name: full, titled, no honorific, common"""
+    words = str(name).split()
+    has_title = any(w.lower().strip('.') in honorifics for w in words)
+    title_case = all(w[:1].isupper() for w in words)
+    return (has_title, -len(name_tokens(name)), not title_case, ' ' not in str(name).strip(), -count)
+
+# ============================== Canonicalizer ============================== #
+
+class NameCanonicalizer:
+    """
+    Maps raw submitter names onto one canonical spelling per person. Names are filed
+    into blocks (blocking_keys) and only compared with names in the same blocks, so
+    a new name costs a few comparisons instead of one per known name. Curated
+    overrides always win; every raw value is resolved once and cached.
+
+    Near matches are only merged when safe_merge() allows it; the others are kept
+    as their own person and listed in suggestions (raw name -> (canonical, score))
+    for someone to confirm through the Person map in cleaning.py.
+    """
+
+    def __init__(self, overrides=None, threshold=None):
+        self.overrides = dict(overrides or {})
+        self.threshold = name_match_threshold if threshold is None else threshold
+        self.canonicals = []
+        self.blocks = {}
+        self.cache = {}
+        self.suggestions = {}
+        self._lock = threading.Lock()
+        # Override targets are the preferred spellings, so they're known from the start
+        for canonical in dict.fromkeys(self.overrides.values()):
+            self._add(canonical)
+
+    def _add(self, canonical):
+        tokens = name_tokens(canonical)
+        self.canonicals.append((canonical, tokens))
+        for key in blocking_keys(tokens):
+            self.blocks.setdefault(key, []).append(len(self.canonicals) - 1)
+
+    def _match(self, tokens, name=None):
+        """Best known canonical name for these tokens, or None (near misses go to suggestions)"""
+        candidates = sorted({i for key in blocking_keys(tokens) for i in self.blocks.get(key, [])})
+        if not candidates:
+            return None
+        joined = ' '.join(tokens)
+
+        # A lone first name ('Sonya') matches the one known full name starting with it
+        if len(tokens) == 1:
+            starts = [i for i in candidates if self.canonicals[i][1][:1] == tokens and len(self.canonicals[i][1]) > 1]
+            if len(starts) == 1:
+                return self.canonicals[starts[0]][0]
+
+        best, best_score = None, self.threshold
+        for i in candidates:
+            canonical, canonical_tokens = self.canonicals[i]
+            if sorted(canonical_tokens) == sorted(tokens):
+                return canonical
+            score = SequenceMatcher(None, joined, ' '.join(canonical_tokens)).ratio()
+            if score >= best_score:
+                best, best_score = i, score
+        if best is None:
+            return None
+        canonical, canonical_tokens = self.canonicals[best]
+        if safe_merge(tokens, canonical_tokens):
+            return canonical
+        name = ' '.join(tokens) if name is None else name
+        self.suggestions[name] = (canonical, round(best_score, 3))
+        print(f"🔎 '{name}' looks like '{canonical}' ({best_score:.2f}), kept apart; add it to the Person map to merge")
+        return None
+
+    def resolve(self, names, counts=None):
+        """Canonical name per raw name; names are matched best-formed first so they become the canonicals"""
+        counts = counts if counts is not None else [0] * len(names)
+        with self._lock:
+            pending = [(name, count) for name, count in zip(names, counts) if name not in self.cache]
+            for name, count in sorted(pending, key=lambda item: form_rank(*item)):
+                if name in self.overrides:
+                    self.cache[name] = self.overrides[name]
+                    continue
+                tokens = name_tokens(name)
+                if not tokens:
+                    self.cache[name] = name
+                    continue
+                canonical = self._match(tokens, name)
+                if canonical is None:
+                    canonical = name
+                    self._add(canonical)
+                self.cache[name] = canonical
+            return [self.cache[name] for name in names]
+
+
+staff_names = NameCanonicalizer(normalization_maps['Person'])
+
+
+def canonical_names(col, canonicalizer=None):
+    """
+    Column of submitter names mapped to their canonical spelling, resolved once per
+    distinct value. Category columns stay categories, spellings of one person merged.
+    """
+    canonicalizer = canonicalizer or staff_names
+    categorical = isinstance(col.dtype, pd.CategoricalDtype)
+    codes, uniques = (col.cat.codes.to_numpy(), col.cat.categories) if categorical else pd.factorize(col)
+    if not len(uniques):
+        return col
+    names = list(uniques)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    # Unused categories are not submitters and must not become canonical names
+    strings = [i for i, name in enumerate(names) if isinstance(name, str) and counts[i]]
+    resolved = np.asarray(names, dtype=object)
+    resolved[strings] = canonicalizer.resolve([names[i] for i in strings], [int(counts[i]) for i in strings])
+    if categorical:
+        merged_codes, merged = pd.factorize(resolved)
+        new_codes = np.where(codes >= 0, merged_codes[np.maximum(codes, 0)], -1)
+        return pd.Series(appearance_categories(new_codes, pd.Index(merged, dtype=object)), index=col.index, name=col.name)
+    out = resolved[codes]
+    missing = codes < 0
+    if missing.any():
+        out[missing] = col.to_numpy(dtype=object)[missing]
+    return pd.Series(out, index=col.index, name=col.name, dtype=object)
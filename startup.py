@@ -0,0 +1,115 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import ast
+import sys
+import subprocess
+import importlib
+import importlib.util
+
+# =================================== CONFIG ================================== #
+
+# Set EAGER_IMPORTS=1 to import every lazy module up front (surfaces missing packages at boot)
+eager_imports = os.getenv("EAGER_IMPORTS", "0") == "1"
+
+# Seconds a dashboard's top-level imports may take before the check fails
+import_budget = float(os.getenv("IMPORT_BUDGET", "2.5"))
+
+# ================================ Lazy Imports ================================ #
+
+class MissingModule:
+    """Stand-in for an optional package that isn't installed; fails only when used"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        raise ModuleNotFoundError(f"'{self._name}' is not installed (needed for {self._name}.{attr})")
+
+
+def lazy_module(name):
+    """
+    Top-level package whose import runs on first attribute access, so optional
+    subsystems (maps, geocoding) don't cost anything at startup until they're used
+    """
+    if name in sys.modules or eager_imports:
+        return importlib.import_module(name)
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# ============================== Import-Time Check ============================== #
+
+def startup_imports(path):
+    """A dashboard's top-level import statements (and lazy_module calls), without its data loading"""
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    lines = []
+    for node in ast.parse(source).body:
+        is_import = isinstance(node, (ast.Import, ast.ImportFrom))
+        is_lazy = (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Call)
+            and getattr(node.value.func, "id", None) == "lazy_module"
+        )
+        if is_import or is_lazy:
+            lines.append(ast.get_source_segment(source, node))
+    return "\n".join(lines)
+
+
+def import_times(code, cwd=None):
+    """Run code under -X importtime; returns [(level, name, self_us, cumulative_us)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Imports failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((len(indent) // 2, name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check_import_budget(path, budget=None, top=15, runs=3):
+    """Print an import-time report for one dashboard; False when it's over budget"""
+    budget = import_budget if budget is None else budget
+    code = startup_imports(path)
+    cwd = os.path.dirname(os.path.abspath(path))
+
+    # Best of a few runs, so one noisy run doesn't fail the check
+    best_rows, best_total = None, None
+    for _ in range(runs):
+        rows = import_times(code, cwd)
+        total = sum(cumulative for level, _, _, cumulative in rows if level == 0)
+        if best_total is None or total < best_total:
+            best_rows, best_total = rows, total
+
+    print(f"\n⏱️ Import time for {os.path.basename(path)} (best of {runs}):")
+    top_level = sorted((row for row in best_rows if row[0] == 0), key=lambda row: row[3], reverse=True)
+    for _, name, _, cumulative in top_level[:top]:
+        print(f"   {cumulative / 1e6:7.3f}s  {name}")
+
+    seconds = best_total / 1e6
+    if seconds > budget:
+        print(f"❌ {seconds:.2f}s is over the {budget:.2f}s import budget")
+        return False
+    print(f"✅ {seconds:.2f}s is within the {budget:.2f}s import budget")
+    return True
+
+
+if __name__ == '__main__':
+    # python startup.py nav_dec_25.py nav_backup.py fitness_tracker.py
+    paths = sys.argv[1:] or ["nav_dec_25.py"]
+    results = [check_import_budget(path) for path in paths]
+    sys.exit(0 if all(results) else 1)
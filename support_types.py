@@ -0,0 +1,175 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# =================================== CONFIG ================================== #
+
+# Distinct raw Support answers kept tokenized; free-text answers would otherwise grow it forever
+support_token_cache = int(os.getenv("SUPPORT_TOKEN_CACHE", "4096"))
+
+# Multi-select answers and older free-text entries, mapped onto the form's categories
+support_mapping = {
+    "Behavioral Health (therapy, counseling, psych services, crisis support, etc.)": "Behavioral Health",
+    "Community-Based Preventive Wellness (Movement Is Medicine, fitness programs, health classes, etc.)": "Community-Based Preventive Wellness",
+    "Coordinated Assessments (needs assessments, screenings, intake forms, etc.)": "Coordinated Assessments",
+    "Enrollment Assistance (MAP, Medicaid, SNAP, Medicare, insurance, etc.)": "Enrollment Assistance",
+    "Emergency Department (ER follow-up, discharge help, post-ER coordination, etc.)": "Emergency Department",
+    "Nutrition & Cultural Health Education (healthy eating, food demos, SFC programs, etc.)": "Nutrition & Cultural Health Education",
+    "Pediatrics (child related exams, immunizations, sick visits, wellness visits, etc.)": "Pediatrics",
+    "Permanent Support Housing (PSH related referrals, housing applications, long-term housing programs, etc.)": "Permanent Support Housing",
+    "Population Health Education (cancer related awareness, screenings, prevention info, etc.)": "Population Health Education",
+    "Primary Care (dental, vision, physicals, chronic care visits, etc.)": "Primary Care",
+    "SOAR (SSI/SSDI related disability paperwork, documentation support, etc.)": "SOAR",
+    "Social Services (housing, food, utilities, clothing, transportation, etc.)": "Social Services",
+    "Specialty Care (cardiology, dermatology, GI, orthopedics, etc.)": "Specialty Care",
+    "Substance Use Treatment (detox, rehab, MAT programs, recovery support, etc.)": "Substance Use Treatment",
+    "Urgent Care (same-day visits for sudden illness or minor injury that cannot wait for a scheduled appointment, etc.)": "Urgent Care",
+    "Women's Health (OB-GYN, mammograms, well-woman exams, prenatal care, etc.)": "Women's Health",
+    "MAP Application": "Enrollment Assistance",
+    "Primary Care Appointment": "Primary Care",
+    "Behavioral Health Appointment": "Behavioral Health",
+    "Primary Care Referral": "Primary Care",
+    "Specialty Care Referral": "Specialty Care",
+    "Behavioral Health Referral": "Behavioral Health",
+    "Social Determinant of Health Referral": "Social Services",
+    "Dental": "Primary Care",
+    "Specialty Care": "Specialty Care",
+    "Prescription Coverage": "Enrollment Assistance",
+    "Vision Appointment": "Primary Care",
+    "Set up Financial Screening": "Enrollment Assistance",
+    "Set an appointment for Financial Screening": "Enrollment Assistance",
+    "SSI": "SOAR",
+    "Dental and Mental": "Primary Care",
+    "Housing and other services for her and her autistic son": "Permanent Support Housing",
+    "Social Determinant of Health Referral,": "Social Services",
+    "homeless resources": "Social Services",
+    "coordinated assessment with Sunrise": "Coordinated Assessments",
+    "Food bank": "Social Services",
+    "Re-Entry": "Social Services"
+}
+
+parenthetical = re.compile(r'\s*\(.*?\)\s*')
+
+# ================================= Tokenizer ================================= #
+
+def split_support(text):
+    """
+    Split on commas that aren't inside parentheses, in one right-to-left pass.
+    Same pieces as re.split(r',(?=(?:[^()]*\([^()]*\))*[^()]*$)', text), which
+    rescans the rest of the string at every comma: a comma splits when the text
+    after it holds only closed, un-nested (...) groups.
+    """
+    pieces = []
+    end = len(text)
+    state = 'out'  # 'out': suffix is valid, 'in': inside a (...) group, 'bad': unbalanced
+    for i in range(len(text) - 1, -1, -1):
+        char = text[i]
+        if char == ',' and state == 'out':
+            pieces.append(text[i + 1:end])
+            end = i
+        elif char == ')':
+            state = 'in' if state == 'out' else 'bad'
+        elif char == '(':
+            state = 'out' if state == 'in' else 'bad'
+    pieces.append(text[:end])
+    return pieces[::-1]
+
+
+@lru_cache(maxsize=support_token_cache)
+def support_tokens(raw):
+    """Canonical support types in one raw answer, e.g. 'Primary Care (dental, ...), SSI' -> ('Primary Care', 'SOAR')"""
+    tokens = []
+    for piece in split_support(raw.replace(' but', ', ')):
+        item = piece.strip()
+        if not item:
+            continue
+        item = support_mapping.get(item, item)
+        # Drop parenthetical descriptions, keeping only the category name
+        clean_item = parenthetical.sub('', item).strip()
+        if clean_item:
+            tokens.append(clean_item)
+    return tuple(tokens)
+
+# ============================= Long-Format Table ============================= #
+
+def support_table(df, column='Support'):
+    """
+    One row per (row_id, support type) mentioned in df[column]; row_id is the
+    row's position in df. Each distinct answer is tokenized once.
+    """
+    codes, uniques = pd.factorize(df[column].astype(str))
+    tokens = [support_tokens(raw) for raw in uniques]
+
+    # Flatten the tokens of every distinct answer, then look them up per row
+    lengths = np.array([len(t) for t in tokens], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    flat_codes, support_names = pd.factorize(pd.Series([tok for t in tokens for tok in t], dtype=object))
+
+    per_row = lengths[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+    row_id = np.repeat(np.arange(len(codes)), per_row)
+    offset = np.arange(len(row_id)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    support_codes = flat_codes[np.repeat(starts[codes], per_row) + offset] if len(row_id) else np.zeros(0, dtype=np.int64)
+
+    return pd.DataFrame({
+        'row_id': row_id,
+        'Support': pd.Categorical.from_codes(support_codes, pd.Index(support_names, dtype=object)),
+    })
+
+
+def support_counts(long_table, rows=None, name='Support'):
+    """
+    Count of each support type, in order of first mention (like a Counter over the answers).
+    rows is an optional boolean mask over the original frame's rows.
+    """
+    if rows is not None:
+        long_table = long_table[np.asarray(rows, dtype=bool)[long_table['row_id'].to_numpy()]]
+    codes = long_table['Support'].cat.codes.to_numpy()
+    categories = long_table['Support'].cat.categories
+    counts = np.bincount(codes, minlength=len(categories))
+    order = pd.unique(codes)
+    return pd.DataFrame({
+        name: np.asarray(categories, dtype=object)[order],
+        'Count': counts[order].astype(np.int64),
+    })
+
+
+class LocationSupportIndex:
+    """
+    location -> support type -> count, built with one groupby over the long table.
+    Locations come from the data itself; each location's counts are kept in
+    first-mention order, same as support_counts() over that location's rows.
+    """
+
+    def __init__(self, long_table, locations):
+        row_codes, self.locations = pd.factorize(locations)
+        pairs = pd.DataFrame({
+            'Location': row_codes[long_table['row_id'].to_numpy()] if len(long_table) else np.zeros(0, dtype=np.int64),
+            'Support': long_table['Support'].cat.codes.to_numpy(),
+        })
+        pairs = pairs[pairs['Location'] >= 0]
+        # Groups come out in first-mention order of each (location, support) pair
+        counts = pairs.groupby(['Location', 'Support'], sort=False).size().reset_index(name='Count')
+        counts = counts.sort_values('Location', kind='stable')
+        categories = np.asarray(long_table['Support'].cat.categories, dtype=object)
+
+        self.rows = dict(zip(self.locations, np.bincount(row_codes[row_codes >= 0], minlength=len(self.locations))))
+        self.tables = {}
+        bounds = np.searchsorted(counts['Location'].to_numpy(), np.arange(len(self.locations) + 1))
+        for code, location in enumerate(self.locations):
+            part = counts.iloc[bounds[code]:bounds[code + 1]]
+            self.tables[location] = pd.DataFrame({
+                'Support': categories[part['Support'].to_numpy()],
+                'Count': part['Count'].to_numpy(dtype=np.int64),
+            })
+
+    def counts(self, location, name='Support'):
+        """Support type counts for one location (empty frame for a location not in the data)"""
+        table = self.tables.get(location)
+        if table is None:
+            return pd.DataFrame({name: pd.Series(dtype=object), 'Count': pd.Series(dtype=np.int64)})
+        return table.rename(columns={'Support': name})
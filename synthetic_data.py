@@ -0,0 +1,128 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import sys
+import sqlite3
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from data_sources import table_name
+
+# ============================== Synthetic Data ============================== #
+
+# Writes fake Navigation, Findhelp and fitness sheets for offline runs and load tests:
+#   python synthetic_data.py 1000000 data/load_test
+#   DATA_SOURCE=parquet:data/load_test python nav_dec_25.py
+
+support_values = [
+    'Primary Care (dental, vision, physicals, chronic care visits, etc.)',
+    'Enrollment Assistance (MAP, Medicaid, SNAP, Medicare, insurance, etc.)',
+    'Behavioral Health (therapy, counseling, psych services, crisis support, etc.), Primary Care (dental, vision, physicals, chronic care visits, etc.)',
+    'Social Services (housing, food, utilities, clothing, transportation, etc.)',
+    'Coordinated Assessments (needs assessments, screenings, intake forms, etc.)',
+    'Specialty Care (cardiology, dermatology, GI, orthopedics, etc.)',
+    'MAP Application',
+    'Dental and Mental',
+    'Food bank but homeless resources',
+]
+
+location_values = [
+    "Black Men's Health Clinic", 'Downtown Austin Community Court', 'Phone call',
+    'Sunrise Navigation Homeless Center', 'South Bridge', 'Community First Village', '',
+]
+
+person_values = [
+    'Eric Roberts', 'EricRoberts', 'Eric roberts', 'Larry Wallace Jr', 'Dr Larry Wallace Jr',
+    'Sonya', 'Sonya Hosey', 'Toya Craney', 'Michael Lambert ', 'Viviana Varela',
+]
+
+first_names = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Maria']
+last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Lopez', 'Wilson']
+
+
+def make_navigation(n_rows, start='2024-01-01', end='2025-12-31', seed=0):
+    """Form responses shaped like the Navigation sheet (all values as sheet strings)"""
+    rng = np.random.default_rng(seed)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    seconds = np.sort(rng.integers(0, int((end - start).total_seconds()), n_rows))
+    activity = start + pd.to_timedelta(seconds, unit='s')
+    birth = pd.Timestamp('1940-01-01') + pd.to_timedelta(rng.integers(0, 365 * 72, n_rows), unit='D')
+    birth_text = np.where(rng.random(n_rows) < 0.1, '', birth.strftime('%m/%d/%Y'))
+    zips = rng.choice(['78701', '78702', '78741', '78744', '78753', '78758-1234', '78723.0', 'Unhoused', '5126364511', ''], n_rows)
+
+    return pd.DataFrame({
+        'Timestamp': activity.strftime('%m/%d/%Y %H:%M:%S'),
+        'Date of Activity': activity.strftime('%m/%d/%Y'),
+        'Person submitting this form:': rng.choice(person_values, n_rows),
+        'Activity Duration (minutes):': rng.choice(['15', '30', '45', '60', '90'], n_rows),
+        'Location Encountered:': rng.choice(location_values, n_rows),
+        "Individual's First Name:": rng.choice(first_names, n_rows),
+        "Individual's Last Name:": rng.choice(last_names, n_rows),
+        "Individual's Date of Birth:": birth_text,
+        "Individual's Insurance Status:": rng.choice(['MAP', 'MAP 100', 'None', 'Medicaid', 'Medicare', 'Private Insurance', 'unknown', '30 DAY100', ''], n_rows),
+        'ZIP Code:': zips,
+        'Type of Coordination/Navigation Provided:': rng.choice(support_values, n_rows),
+        'Provide brief support description:': 'Synthetic row',
+        "Individual's Status:": rng.choice(['New', 'Returning', 'Group search', ''], n_rows),
+        'HMIS SPID Number:': rng.choice(['', '12345', '67890'], n_rows),
+        'MAP Card Number': rng.choice(['', '1001', '1002'], n_rows),
+        'Gender:': rng.choice(['Male', 'Female', 'Transgender', 'Group search', 'Prefer Not to Say'], n_rows),
+        'Race / Ethnicity:': rng.choice(['Black/ African American', 'Hispanic/Latino', 'White', 'Asian', 'Group search'], n_rows),
+        'Total travel time (minutes):': rng.choice(['0', '0', '30', '60', 'The Bumgalows', ''], n_rows),
+        'Housing Status': rng.choice(['Housed', 'Unhoused', 'Unstably Housed', ''], n_rows),
+        'Income Level': rng.choice(['Under 25,000', '25,000 - 49,999', '$0', 'Unknown', '?', ''], n_rows),
+    })
+
+
+def make_findhelp(df_nav, month_number, seed=0):
+    """Findhelp referrals for one month, overlapping about half of that month's clients"""
+    rng = np.random.default_rng(seed + month_number)
+    dates = pd.to_datetime(df_nav['Date of Activity'], format='%m/%d/%Y')
+    df_month = df_nav[dates.dt.month == month_number]
+    names = (df_month["Individual's First Name:"] + ' ' + df_month["Individual's Last Name:"]).to_numpy()
+    keep = names[rng.random(len(names)) < 0.5]
+    extra = np.char.add(np.char.add(rng.choice(first_names, len(keep) // 4 + 1), ' '), rng.choice(last_names, len(keep) // 4 + 1))
+    seekers = np.concatenate([keep, extra])
+    month_dates = df_month['Date of Activity'].to_numpy()
+    created_at = rng.choice(month_dates, len(seekers)) if len(month_dates) else [''] * len(seekers)
+    return pd.DataFrame({'seeker_name': seekers, 'created_at': created_at})
+
+
+def make_fitness(n_days=365, year=2026, seed=0):
+    """Wide fitness sheet: one row per exercise, one column per gym day"""
+    rng = np.random.default_rng(seed)
+    exercises = [('Push', 'Bench Press'), ('Push', 'Incline Press'), ('Pull', 'Barbell Row'), ('Pull', 'Lat Pulldown'),
+                 ('Legs', 'Squat'), ('Legs', 'Deadlift'), ('Biceps', 'Curl'), ('Triceps', 'Pushdown'),
+                 ('Shoulders', 'Overhead Press'), ('Abs', 'Crunch'), ('Cardio', 'Treadmill')]
+    days = pd.date_range(f'{year}-01-01', periods=n_days, freq='D').strftime('%m/%d/%Y')
+    weights = rng.integers(20, 300, (len(exercises), n_days)).astype(str)
+    weights[rng.random(weights.shape) < 0.6] = ''
+    df_fit = pd.DataFrame(weights, columns=days)
+    df_fit.insert(0, 'Exercise', [e for _, e in exercises])
+    df_fit.insert(0, 'Category', [c for c, _ in exercises])
+    return df_fit
+
+
+def write_tables(tables, folder):
+    """Write every table as CSV, Parquet and into one SQLite database"""
+    os.makedirs(folder, exist_ok=True)
+    with sqlite3.connect(os.path.join(folder, 'data.db')) as conn:
+        for (name, worksheet), df_table in tables.items():
+            base = os.path.join(folder, table_name(name, worksheet))
+            df_table.to_csv(f'{base}.csv', index=False)
+            df_table.to_parquet(f'{base}.parquet', index=False)
+            df_table.to_sql(table_name(name, worksheet), conn, if_exists='replace', index=False)
+    print(f"✅ Wrote {len(tables)} tables to {folder} (csv:, parquet:, sqlite:{os.path.join(folder, 'data.db')})")
+
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    folder = sys.argv[2] if len(sys.argv) > 2 else os.path.join('data', 'synthetic')
+
+    df_nav = make_navigation(n_rows)
+    tables = {('navigation', None): df_nav, ('fitness', '2026'): make_fitness()}
+    for month_number in range(1, 13):
+        tables[('findhelp', calendar.month_name[month_number])] = make_findhelp(df_nav, month_number)
+    write_tables(tables, folder)
@@ -0,0 +1,7 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import sys
+
+# Flat top-level modules, same as the benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
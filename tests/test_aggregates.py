@@ -0,0 +1,53 @@
+# =================================== IMPORTS ================================= #
+
+import warnings
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from aggregates import aggregate, report_dimensions
+
+# ============================== Aggregation Engine ============================== #
+
+def report(person):
+    df = pd.DataFrame({dim: 'x' for dim in report_dimensions}, index=range(len(person)))
+    df['Person'] = person
+    df['Activity Duration'] = np.arange(1, len(person) + 1)
+    df['Travel'] = 0
+    return df
+
+
+def test_person_counts_match_counter():
+    person = pd.Series(pd.Categorical(['Eric Roberts, Sonya Hosey', 'Sonya Hosey', None, 'Toya Craney,, Eric Roberts', ' ', 'Sonya Hosey, Eric Roberts']))
+    df = report(person)
+
+    # The Counter loop the Person chart used before the aggregates
+    counter = Counter()
+    for entry in df['Person']:
+        for item in (i.strip() for i in str(entry).split(",")):
+            if item:
+                counter[item] += 1
+    expected = pd.DataFrame(counter.items(), columns=['Person', 'Count']).sort_values(by='Count', ascending=False)
+
+    counts = aggregate(df).counts('Person')
+    assert counts['Person'].tolist() == expected['Person'].tolist()
+    assert counts['Count'].tolist() == expected['Count'].tolist()
+
+
+def test_person_sums_count_each_name():
+    df = report(pd.Series(['Eric Roberts, Sonya Hosey', 'Sonya Hosey', 'Eric Roberts']))
+    sums = aggregate(df).sums('Person', 'Activity Duration')
+    assert sums.to_dict() == {'Eric Roberts': 4.0, 'Sonya Hosey': 3.0}
+
+
+def test_category_counts_chart_without_observed_warning():
+    df = report(pd.Series(['Eric Roberts'] * 3))
+    df['Gender'] = pd.Categorical(['Female', 'Male', 'Female'], categories=['Female', 'Male', 'Unknown'])
+    counts = aggregate(df).counts('Gender', order='key')
+    assert counts['Gender'].dtype == object
+    assert counts.to_dict('list') == {'Gender': ['Female', 'Male'], 'Count': [2, 1]}
+    with warnings.catch_warnings():
+        warnings.filterwarnings('error', message='.*observed=False', category=FutureWarning)
+        px.bar(counts, x='Gender', y='Count', color='Gender')
@@ -0,0 +1,63 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from data_sources import DataSource, read_concurrently
+
+# ================================ Data Sources ================================ #
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_data_source_requires_read():
+    with pytest.raises(TypeError):
+        DataSource('navigation')
+
+
+class SlowSource(DataSource):
+    def __init__(self, name, seconds):
+        super().__init__(name)
+        self.seconds = seconds
+
+    def read(self, worksheet=None):
+        time.sleep(self.seconds)
+        return f"{self.name} {worksheet}"
+
+
+def test_reads_run_concurrently():
+    reads = {key: (SlowSource(key, 0.3), 'Sheet1') for key in ['nav', 'findhelp', 'fitness']}
+    started = time.perf_counter()
+    frames = read_concurrently(reads, timeout=5)
+    assert frames == {key: f"{key} Sheet1" for key in reads}
+    assert time.perf_counter() - started < 0.8
+
+
+def test_read_timeout_names_the_slow_source():
+    reads = {'nav': (SlowSource('nav', 0), None), 'findhelp': (SlowSource('findhelp', 3), None)}
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError, match="'findhelp'"):
+        read_concurrently(reads, timeout=0.3)
+    assert time.perf_counter() - started < 1
+
+
+def test_hung_read_does_not_block_exit():
+    script = (
+        "import threading\n"
+        "from data_sources import DataSource, read_concurrently\n"
+        "class Hung(DataSource):\n"
+        "    def read(self, worksheet=None):\n"
+        "        threading.Event().wait()\n"
+        "try:\n"
+        "    read_concurrently({'hung': (Hung('hung'), None)}, timeout=0.2)\n"
+        "except TimeoutError:\n"
+        "    print('timed out')\n"
+    )
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', script], cwd=repo_dir, capture_output=True, text=True, timeout=30)
+    assert result.stdout.strip() == 'timed out'
+    assert time.perf_counter() - started < 20
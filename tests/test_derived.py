@@ -0,0 +1,93 @@
+# =================================== IMPORTS ================================= #
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from derived import DerivedGraph
+
+# ============================== Derived Dataset Graph ============================== #
+
+def report_graph(max_mb=None):
+    """df -> sorted -> totals, counting how often each node is computed"""
+    graph = DerivedGraph(max_mb)
+    calls = Counter()
+
+    @graph.node('sorted', inputs=['df'])
+    def sorted_rows(df):
+        calls['sorted'] += 1
+        return df.sort_values('Minutes').reset_index(drop=True)
+
+    @graph.node('totals', inputs=['sorted'])
+    def totals(df_sorted):
+        calls['totals'] += 1
+        return df_sorted.groupby('Location')['Minutes'].sum()
+
+    @graph.node('big', inputs=['df'])
+    def big(df):
+        calls['big'] += 1
+        return np.zeros(300_000)
+
+    return graph, calls
+
+
+def frame(minutes=(30, 10, 20)):
+    return pd.DataFrame({'Location': ['Clinic', 'Library', 'Clinic'], 'Minutes': list(minutes)})
+
+
+def test_nodes_are_memoized():
+    graph, calls = report_graph()
+    graph.source('df', frame())
+    first = graph.get('totals')
+    assert graph.get('totals') is first
+    assert graph.get('sorted') is graph.get('sorted')
+    assert calls == {'sorted': 1, 'totals': 1}
+    assert first.to_dict() == {'Clinic': 50, 'Library': 10}
+
+
+def test_same_content_keeps_derived_values():
+    graph, calls = report_graph()
+    graph.source('df', frame())
+    totals = graph.get('totals')
+    version = graph.versions['df']
+
+    # A refresh that loads identical data: new object, same content
+    graph.source('df', frame())
+    assert graph.versions['df'] == version
+    assert graph.get('totals') is totals
+    assert calls == {'sorted': 1, 'totals': 1}
+
+
+def test_changed_content_invalidates_dependents():
+    graph, calls = report_graph()
+    graph.source('df', frame())
+    graph.get('totals')
+
+    graph.source('df', frame((30, 10, 25)))
+    assert graph.get('totals').to_dict() == {'Clinic': 55, 'Library': 10}
+    assert calls == {'sorted': 2, 'totals': 2}
+
+    # Same numbers as floats are different content
+    graph.source('df', frame((30.0, 10.0, 25.0)))
+    graph.get('totals')
+    assert calls == {'sorted': 3, 'totals': 3}
+
+
+def test_eviction_keeps_versions():
+    # 1 MB cap: the 2.4 MB array pushes the frames out, least recently used first
+    graph, calls = report_graph(max_mb=1)
+    graph.source('df', frame())
+    graph.get('totals')
+    versions = dict(graph.versions)
+
+    graph.get('big')
+    assert list(graph._memo) == ['big']
+
+    # Evicted values are recomputed on demand from unchanged inputs, under the same versions
+    assert graph.get('totals').to_dict() == {'Clinic': 50, 'Library': 10}
+    assert calls == {'sorted': 2, 'totals': 2, 'big': 1}
+    assert {name: graph.versions[name] for name in versions} == versions
+    assert graph._bytes <= graph.max_bytes
+    # Sources are never evicted
+    assert graph.get('df').equals(frame())
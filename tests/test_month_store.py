@@ -0,0 +1,62 @@
+# =================================== IMPORTS ================================= #
+
+import threading
+import time
+
+import pandas as pd
+
+from month_store import MonthPartitionStore
+
+# ============================ Month Partition Store ============================ #
+
+def sheet(minutes):
+    return pd.DataFrame({
+        ' Date of Activity ': ['2025-01-05', '2025-01-20', '2025-02-03', 'not a date'],
+        'Minutes': minutes,
+    })
+
+
+def test_version_follows_content():
+    loads = []
+    def load():
+        loads.append(1)
+        return sheet([10, 20, 30, 40] if len(loads) < 3 else [10, 20, 35, 40])
+
+    store = MonthPartitionStore(load, ttl=0)
+    first = store.version()
+    assert store.keys() == [(2025, 1), (2025, 2)]
+
+    store.refresh()
+    assert store.version() == first
+    store.refresh()
+    assert store.version() != first
+    assert list(store.month(2025, 2)['Minutes']) == [35]
+
+
+def test_expired_partitions_refresh_in_background():
+    release = threading.Event()
+    loads = []
+    def load():
+        loads.append(1)
+        if len(loads) > 1:
+            release.wait(5)
+            return sheet([1, 2, 3, 4])
+        return sheet([10, 20, 30, 40])
+
+    store = MonthPartitionStore(load, ttl=0.01)
+    assert list(store.year(2025)['Minutes']) == [10, 20, 30]
+    old = store.version()
+    time.sleep(0.05)
+
+    # The request after the TTL is served from the loaded partitions without waiting on the load
+    started = time.perf_counter()
+    assert list(store.month(2025, 1)['Minutes']) == [10, 20]
+    assert store.version() == old
+    assert time.perf_counter() - started < 1
+    assert len(loads) == 2
+
+    release.set()
+    deadline = time.time() + 5
+    while store.version() == old and time.time() < deadline:
+        time.sleep(0.01)
+    assert list(store.month(2025, 1)['Minutes']) == [1, 2]
@@ -0,0 +1,100 @@
+# =================================== IMPORTS ================================= #
+
+import os
+
+import pytest
+
+import sheet_cache
+import sheets_client
+from sheet_cache import SnapshotCache, load_records
+
+# ============================== Snapshot Cache ============================== #
+
+sheet_url = "https://docs.google.com/spreadsheets/d/cache-test-sheet/edit"
+spreadsheet_id = "cache-test-sheet"
+
+
+class FakeWorksheet:
+    def __init__(self, values):
+        self.values = values
+
+    def get_all_values(self):
+        return [list(row) for row in self.values]
+
+
+class FakeClient:
+    """Just enough of gspread.Client for load_records, counting the downloads"""
+
+    def __init__(self, values, revision="r1"):
+        self.sheet1 = FakeWorksheet(values)
+        self.revision = revision
+        self.downloads = 0
+
+    def get_file_drive_metadata(self, file_id):
+        return {"modifiedTime": self.revision}
+
+    def open_by_key(self, key):
+        client = self
+
+        class Spreadsheet:
+            @property
+            def sheet1(self):
+                client.downloads += 1
+                return client.sheet1
+        return Spreadsheet()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "sync_mode", "snapshot")
+    monkeypatch.setattr(sheets_client, "_spreadsheets", {})
+    return SnapshotCache(str(tmp_path), ttl=0)
+
+
+def test_download_then_read_through(cache):
+    client = FakeClient([["Name", "Minutes"], ["Ana", "30"], ["Bo", "45"]])
+    first = load_records(client, sheet_url, cache=cache)
+    assert first.to_dict("records") == [{"Name": "Ana", "Minutes": 30}, {"Name": "Bo", "Minutes": 45}]
+    assert cache.read_meta(spreadsheet_id, "sheet1")["revision"] == "r1"
+
+    # Same revision: served from disk
+    again = load_records(client, sheet_url, cache=cache)
+    assert client.downloads == 1
+    assert again.equals(first)
+
+    # New revision: downloaded and written again
+    client.revision = "r2"
+    client.sheet1.values.append(["Cy", "15"])
+    fresh = load_records(client, sheet_url, cache=cache)
+    assert client.downloads == 2
+    assert list(fresh["Name"]) == ["Ana", "Bo", "Cy"]
+    assert cache.read_meta(spreadsheet_id, "sheet1")["revision"] == "r2"
+
+
+def test_lock_timeout_serves_existing_snapshot(cache, monkeypatch):
+    client = FakeClient([["Name"], ["Ana"]])
+    load_records(client, sheet_url, cache=cache)
+    data_file = cache.data_path(spreadsheet_id, "sheet1")
+    written = os.path.getmtime(data_file)
+
+    # Another worker holds the lock past the timeout while the sheet has changed
+    monkeypatch.setattr(sheet_cache, "lock_timeout", 0.5)
+    open(cache._base_path(spreadsheet_id, "sheet1") + ".lock", "w").close()
+    client.revision = "r2"
+    client.sheet1.values.append(["Bo"])
+
+    served = load_records(client, sheet_url, cache=cache)
+    assert list(served["Name"]) == ["Ana"]
+    assert client.downloads == 1
+    assert os.path.getmtime(data_file) == written
+    assert cache.read_meta(spreadsheet_id, "sheet1")["revision"] == "r1"
+
+
+def test_lock_timeout_without_snapshot_raises(cache, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "lock_timeout", 0.5)
+    open(cache._base_path(spreadsheet_id, "sheet1") + ".lock", "w").close()
+    client = FakeClient([["Name"], ["Ana"]])
+    with pytest.raises(TimeoutError):
+        load_records(client, sheet_url, cache=cache)
+    assert client.downloads == 0
+    assert not os.path.exists(cache.data_path(spreadsheet_id, "sheet1"))
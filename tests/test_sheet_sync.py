@@ -0,0 +1,108 @@
+# =================================== IMPORTS ================================= #
+
+import pytest
+
+import sheet_sync
+from sheet_cache import SnapshotCache
+from sheet_sync import full_sync, incremental_sync, hash_column
+
+# ============================== Incremental Sync ============================== #
+
+class FakeSheet:
+    """Worksheet, spreadsheet and client in one, reading the rows like the Sheets API does"""
+
+    title = "Sheet1"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.full_reads = 0
+        self.http_client = self
+        self.sheet1 = self
+
+    def get_all_values(self):
+        self.full_reads += 1
+        width = max(len(row) for row in self.rows)
+        return [list(row) + [""] * (width - len(row)) for row in self.rows]
+
+    def values_batch_get(self, spreadsheet_id, ranges):
+        # "'Sheet1'!1:1" and "'Sheet1'!A<start>:<col>"; the API trims trailing blanks
+        start = int(ranges[1].split("!A")[1].split(":")[0])
+        trim = lambda row: [c for i, c in enumerate(row) if any(row[i:])]
+        return {"valueRanges": [
+            {"values": [trim(self.rows[0])]},
+            {"values": [trim(row) for row in self.rows[start - 1:]]},
+        ]}
+
+
+def sheet(n_rows):
+    return FakeSheet([["Timestamp", "Name", "Minutes"]] + [[f"t{i}", f"name {i}", str(i)] for i in range(n_rows)])
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_sync, "open_spreadsheet", lambda client, spreadsheet_id: client)
+    monkeypatch.setattr(sheet_sync, "verify_rows", 5)
+    monkeypatch.setattr(sheet_sync, "full_every", 0)
+    return SnapshotCache(str(tmp_path))
+
+
+def sync(client, cache):
+    meta = cache.read_meta("id", "sheet1")
+    header, grid = incremental_sync(client, "id", "sheet1", None, cache, meta, "r")
+    return grid.drop(columns=[hash_column])
+
+
+def expected(client, tmp_path):
+    """What a full download of the sheet as it is now stores"""
+    _, grid = full_sync(client, "id", "sheet1", None, SnapshotCache(str(tmp_path / "full")), "r")
+    return grid.drop(columns=[hash_column])
+
+
+def test_appended_rows_match_full_sync(cache, tmp_path):
+    client = sheet(20)
+    full_sync(client, "id", "sheet1", None, cache, "r")
+    client.rows += [[f"t{i}", f"name {i}", ""] for i in range(20, 23)]
+
+    merged = sync(client, cache)
+    assert client.full_reads == 1
+    assert len(merged) == 23
+    assert merged.equals(expected(client, tmp_path))
+
+
+def test_edits_in_the_verify_window_are_merged(cache, tmp_path):
+    client = sheet(20)
+    full_sync(client, "id", "sheet1", None, cache, "r")
+    client.rows[18][2] = "edited"  # data row 17, inside the last 5
+    client.rows[3][1] = "old edit"  # data row 2, above the window
+
+    merged = sync(client, cache)
+    assert client.full_reads == 1
+    assert merged.loc[17, "c2"] == "edited"
+    # Above the window the edit waits for the next full sync
+    assert merged.loc[2, "c1"] == "name 2"
+
+
+def test_periodic_full_sync_catches_older_edits(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_sync, "full_every", 2)
+    client = sheet(20)
+    full_sync(client, "id", "sheet1", None, cache, "r")
+    client.rows[3][1] = "old edit"
+
+    assert sync(client, cache).loc[2, "c1"] == "name 2"
+    merged = sync(client, cache)
+    assert client.full_reads == 2
+    assert merged.equals(expected(client, tmp_path))
+
+
+@pytest.mark.parametrize("change", ["delete", "header"])
+def test_falls_back_to_full_sync(cache, tmp_path, change):
+    client = sheet(20)
+    full_sync(client, "id", "sheet1", None, cache, "r")
+    if change == "delete":
+        del client.rows[5]
+    else:
+        client.rows[0] = client.rows[0] + ["Notes"]
+
+    merged = sync(client, cache)
+    assert client.full_reads == 2
+    assert merged.equals(expected(client, tmp_path))
@@ -0,0 +1,115 @@
+# =================================== IMPORTS ================================= #
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from gspread.exceptions import APIError
+
+import sheets_client
+from sheets_client import QuotaTracker, get_client
+from sheets_stub import make_server
+
+# ================================ Sheets Client ================================ #
+
+@pytest.fixture
+def stub_clients(monkeypatch):
+    # Any api_url makes get_client skip credentials; nothing is requested here
+    monkeypatch.setattr(sheets_client, "api_url", "http://127.0.0.1:9")
+    monkeypatch.setattr(sheets_client, "_clients", {})
+
+
+def test_timeout_applies_on_every_call(stub_clients):
+    client = get_client(timeout=60)
+    assert client.http_client.timeout == 60
+    assert get_client(timeout=5) is client
+    assert client.http_client.timeout == 5
+    # No timeout keeps the current one
+    get_client()
+    assert client.http_client.timeout == 5
+
+# ============================ Retries Against the Stub ============================ #
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    """sheets_stub.py on a free port; returns a function configuring its failures and a client on it"""
+    pd.DataFrame({'Timestamp': ['t1', 't2'], 'Name': ['Ana', 'Bo']}).to_csv(tmp_path / 'navigation.csv', index=False)
+    servers = []
+    sleeps = []
+    monkeypatch.setattr(sheets_client, 'time', SimpleNamespace(monotonic=time.monotonic, sleep=sleeps.append))
+    monkeypatch.setattr(sheets_client, 'quota', QuotaTracker(per_minute=0))
+    monkeypatch.setattr(sheets_client, '_clients', {})
+    monkeypatch.setattr(sheets_client, '_spreadsheets', {})
+
+    def start(fail=0, statuses=(429,), retry_after=None):
+        server, state = make_server(str(tmp_path), 0, fail, statuses, retry_after)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setattr(sheets_client, 'api_url', f"http://127.0.0.1:{server.server_address[1]}")
+        return get_client(), state, sleeps
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_429_waits_for_retry_after(stub):
+    client, state, sleeps = stub(fail=1, statuses=(429,), retry_after=7)
+    assert client.open_by_key('navigation').sheet1.get_all_values()[1] == ['t1', 'Ana']
+    assert sleeps == [7.0]
+    assert sheets_client.quota.usage()['statuses'][429] == 1
+    assert state.failed == 1
+    assert sheets_client.quota.retries == 1
+
+
+def test_5xx_retries_then_succeeds(stub):
+    client, state, sleeps = stub(fail=2, statuses=(503, 500))
+    assert client.open_by_key('navigation').title == 'navigation'
+    assert state.requests == 3
+    assert len(sleeps) == 2
+    # Full jitter under the exponential bound for attempts 0 and 1
+    assert all(0 <= wait <= sheets_client.backoff_base * 2 ** attempt for attempt, wait in enumerate(sleeps))
+
+
+def test_gives_up_after_max_retries(stub, monkeypatch):
+    monkeypatch.setattr(sheets_client, 'max_retries', 2)
+    client, state, sleeps = stub(fail=100, statuses=(503,))
+    with pytest.raises(APIError) as err:
+        client.open_by_key('navigation')
+    assert err.value.code == 503
+    assert state.requests == 3
+    assert len(sleeps) == 2
+
+
+def test_errors_that_are_not_retried(stub):
+    client, state, sleeps = stub(fail=1, statuses=(400,))
+    with pytest.raises(APIError):
+        client.open_by_key('navigation')
+    assert state.requests == 1
+    assert sleeps == []
+
+# ================================ Quota Tracker ================================ #
+
+def test_quota_tracker_waits_for_the_oldest_request(monkeypatch):
+    clock = [1000.0]
+    sleeps = []
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+    monkeypatch.setattr(sheets_client, 'time', SimpleNamespace(monotonic=lambda: clock[0], sleep=sleep))
+
+    tracker = QuotaTracker(per_minute=2)
+    tracker.acquire()
+    clock[0] += 10
+    tracker.acquire()
+    assert sleeps == []
+
+    # Third request in the minute waits until the first one is 60s old
+    tracker.acquire()
+    assert sleeps == [50.0]
+    assert tracker.usage()['last_minute'] == 2
+    assert tracker.usage()['throttled_seconds'] == 50.0
+    assert tracker.total == 3
@@ -0,0 +1,39 @@
+# =================================== IMPORTS ================================= #
+
+import pandas as pd
+
+from cleaning import normalization_maps
+from staff_names import NameCanonicalizer, canonical_names
+
+# ============================== Name Canonicalizer ============================== #
+
+def canonicalizer():
+    return NameCanonicalizer(normalization_maps['Person'])
+
+
+def test_distinct_first_names_stay_apart():
+    names = canonicalizer()
+    pairs = [
+        ('Michael Lambert', 'Michelle Lambert'),
+        ('Eric Roberts', 'Erica Roberts'),
+        ('Maria Garcia', 'Mario Garcia'),
+        ('Toya Craney', 'Tonya Craney'),
+    ]
+    for known, other in pairs:
+        assert names.resolve([known, other]) == [known, other]
+        assert names.suggestions[other][0] == known
+
+
+def test_spelling_variants_merge():
+    names = canonicalizer()
+    raw = ['Eric Roberts', 'eric  ROBERTS', 'EricRoberts', 'Michael Lambert', 'Micheal Lambert', 'Sonya']
+    assert names.resolve(raw) == ['Eric Roberts'] * 3 + ['Michael Lambert'] * 2 + ['Sonya Hosey']
+    assert not names.suggestions
+
+
+def test_canonical_names_keeps_categories():
+    col = pd.Series(pd.Categorical(['EricRoberts', 'Eric Roberts', None, 'Sonya']), name='Person')
+    out = canonical_names(col, canonicalizer())
+    assert isinstance(out.dtype, pd.CategoricalDtype)
+    assert out.tolist()[:2] == ['Eric Roberts', 'Eric Roberts'] and pd.isna(out[2]) and out[3] == 'Sonya Hosey'
+    assert list(out.cat.categories) == ['Eric Roberts', 'Sonya Hosey']
@@ -0,0 +1,92 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from support_types import support_table
+from trends import TrendEngine, trend_frequencies, trend_measures, trend_breakdowns
+
+# ============================== Trend Engine ============================== #
+
+def history(n_rows=400, seed=3):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Date of Activity': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 120, n_rows), unit='D'),
+        'Client Key': rng.integers(0, 40, n_rows).astype(np.uint64),  # 0 is an unnamed client
+        'Activity Duration': rng.integers(5, 90, n_rows).astype(float),
+        'Travel': rng.integers(0, 30, n_rows).astype(float),
+        'Location': rng.choice(['Clinic', 'Library', 'Outreach'], n_rows),
+        'Support': rng.choice(['Food', 'Housing, Food', 'Transportation', 'Housing, Transportation, Food', ''], n_rows),
+    })
+    df.loc[5, 'Date of Activity'] = pd.NaT
+    df.loc[7, 'Location'] = np.nan
+    df.loc[9, 'Activity Duration'] = np.nan
+    return df
+
+
+def expected_series(df, measure, freq, by):
+    """The same series from a plain pandas groupby over (label, period)"""
+    if by == 'Support':
+        long_table = support_table(df)
+        facts = df.iloc[long_table['row_id'].to_numpy()].reset_index(drop=True)
+        facts['Support'] = long_table['Support'].astype(object).to_numpy()
+    else:
+        facts = df.copy()
+    facts['Label'] = 'All' if by is None else facts[by]
+    facts['Period'] = facts['Date of Activity'].dt.to_period(freq).dt.start_time
+    grouped = facts.groupby(['Period', 'Label'])
+    if measure == 'visits':
+        values = grouped.size()
+    elif measure == 'clients':
+        values = facts[facts['Client Key'] != 0].groupby(['Period', 'Label'])['Client Key'].nunique()
+    else:
+        column = 'Activity Duration' if measure == 'hours' else 'Travel'
+        values = grouped[column].sum() / 60
+    return values.unstack('Label', fill_value=0)
+
+
+@pytest.fixture(scope='module')
+def engine_and_history():
+    df = history()
+    return TrendEngine(df, support_table(df)), df
+
+
+@pytest.mark.parametrize('by', trend_breakdowns)
+@pytest.mark.parametrize('freq', list(trend_frequencies))
+@pytest.mark.parametrize('measure', list(trend_measures))
+def test_series_match_groupby(engine_and_history, measure, freq, by):
+    engine, df = engine_and_history
+    series = engine.series(measure, freq, by)
+    expected = expected_series(df, measure, freq, by)
+    # The engine lists every period in range and every label; the groupby only those seen
+    expected = expected.reindex(index=series.index, columns=series.columns, fill_value=0)
+    assert set(expected.columns) <= set(series.columns)
+    np.testing.assert_allclose(series.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+
+@pytest.mark.parametrize('by', trend_breakdowns)
+@pytest.mark.parametrize('measure', list(trend_measures))
+def test_rolling_weeks_match_groupby(engine_and_history, measure, by):
+    engine, df = engine_and_history
+    weeks = 3
+    rolling = engine.series(measure, 'W', by).copy()
+    rolling.loc[:, :] = engine.window(measure, by, weeks).T
+    weekly = expected_series(df, measure, 'W', by).reindex(index=rolling.index, columns=rolling.columns, fill_value=0)
+    if measure != 'clients':
+        expected = weekly.rolling(weeks, min_periods=1).sum()
+    else:
+        # Distinct named clients over each trailing window of weeks
+        facts = df if by != 'Support' else df.iloc[support_table(df)['row_id'].to_numpy()].assign(
+            Support=support_table(df)['Support'].astype(object).to_numpy())
+        facts = facts[(facts['Client Key'] != 0) & facts['Date of Activity'].notna()]
+        week = facts['Date of Activity'].dt.to_period('W').dt.start_time
+        expected = pd.DataFrame(0, index=rolling.index, columns=rolling.columns)
+        for end in rolling.index:
+            inside = facts[(week > end - pd.Timedelta(weeks=weeks)) & (week <= end)]
+            if by is None:
+                expected.loc[end, 'All'] = inside['Client Key'].nunique()
+            else:
+                for label, keys in inside.groupby(by)['Client Key']:
+                    expected.loc[end, label] = keys.nunique()
+    np.testing.assert_allclose(rolling.to_numpy(dtype=float), expected.to_numpy(dtype=float))
@@ -0,0 +1,98 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+
+from aggregates import aggregate
+from bitmap_index import BitmapIndex
+from cleaning import clean_stage, normalize, age_stage
+from cube import NavigationCube, cube_dimensions
+from date_index import DateRangeIndex
+from support_types import support_table
+from synthetic_data import make_navigation
+from zip_codes import zip_stage
+
+# ============================== Report Views ============================== #
+
+columns = {
+    "Activity Duration (minutes):": "Activity Duration",
+    "Location Encountered:": "Location",
+    "Type of Coordination/Navigation Provided:": "Support",
+    "Individual's Insurance Status:": "Insurance",
+    "Individual's Status:": "Status",
+    'Person submitting this form:': 'Person',
+    'Total travel time (minutes):': 'Travel',
+    'Race / Ethnicity:': 'Ethnicity',
+    'Gender:': 'Gender',
+    'Housing Status': 'Housing',
+    'Income Level': 'Income',
+}
+
+
+def report_frame(n_rows=3000, seed=0):
+    """Synthetic report through the dashboard's cleaning steps, rows shuffled out of date order"""
+    raw = make_navigation(n_rows, start='2025-01-01', end='2025-12-31', seed=seed)
+    raw = raw.iloc[np.random.default_rng(seed).permutation(n_rows)].reset_index(drop=True)
+    raw['Date of Activity'] = pd.to_datetime(raw['Date of Activity'], errors='coerce')
+    df = clean_stage(raw)
+    df['Full Name'] = df["Individual's First Name:"].astype(str) + " " + df["Individual's Last Name:"].astype(str)
+    df = df.rename(columns=columns)
+    df = normalize(df)
+    df['Travel'] = pd.to_numeric(df['Travel'], errors='coerce').fillna(0)
+    # Some forms list two staff, 'A, B'; a few name one person twice
+    person = df['Person'].astype(object).copy()
+    person[::7] = person[::7] + ', ' + person.shift(1)[::7].fillna('Sonya Hosey')
+    person[::97] = person[::97] + ', ' + person[::97]
+    df['Person'] = person
+    return zip_stage(age_stage(df))
+
+
+def month_views(month=3, df=None):
+    df = report_frame() if df is None else df
+    # Shared the way nav_backup.build_views shares it
+    long_table = support_table(df)
+    dates = DateRangeIndex(df, long_table=long_table)
+    cube = NavigationCube(df, order=dates.order, long_table=long_table)
+    bitmaps = BitmapIndex(df, order=dates.order, long_table=long_table)
+    end = pd.Timestamp(2025, month, 1) + pd.offsets.MonthEnd(0)
+    date_view = dates.slice(f'2025-{month:02d}-01', end)
+    return cube.slice(2025, month), date_view, bitmaps.slice({}, date_view.lo, date_view.hi)
+
+
+def test_month_views_agree():
+    cube_view, *others = month_views()
+    assert cube_view.rows > 0
+    for view in others:
+        assert view.rows == cube_view.rows
+        for measure in ['Activity Duration', 'Travel']:
+            assert np.isclose(view.total(measure), cube_view.total(measure))
+        for dim in cube_dimensions:
+            for order in ['count', 'key']:
+                pd.testing.assert_frame_equal(view.counts(dim, order), cube_view.counts(dim, order))
+        # Support counts are mentions in every view, however many times a row names a type
+        pd.testing.assert_frame_equal(view.support_counts(), cube_view.support_counts())
+
+
+
+def test_views_match_aggregates_on_the_month():
+    df = report_frame()
+    views = month_views(df=df)
+    # The month's rows in date order, counted the way nav_dec_25 counts its report
+    month = df.iloc[DateRangeIndex(df).rows('2025-03-01', '2025-03-31')]
+    report = aggregate(month)
+    for view in views:
+        for dim in cube_dimensions:
+            pd.testing.assert_frame_equal(view.counts(dim), report.counts(dim))
+        person = view.counts('Person')
+        assert person['Count'].sum() > view.rows
+
+
+def test_reversed_range_reads_like_the_forward_one():
+    dates = DateRangeIndex(report_frame(n_rows=500))
+    forward = dates.slice('2025-03-01', '2025-03-31')
+    backward = dates.slice('2025-03-31', '2025-03-01')
+    assert backward.rows == forward.rows > 0
+    assert (backward.lo, backward.hi) == (forward.lo, forward.hi)
+    assert backward.total('Travel') == forward.total('Travel')
+    pd.testing.assert_frame_equal(backward.counts('Location'), forward.counts('Location'))
+    np.testing.assert_array_equal(dates.rows('2025-03-31', '2025-03-01'), dates.rows('2025-03-01', '2025-03-31'))
@@ -0,0 +1,30 @@
+# =================================== IMPORTS ================================= #
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from zip_codes import extract_zips
+
+# ============================== ZIP Cleaning Stage ============================== #
+
+@pytest.mark.parametrize('cell, expected', [
+    ('78701', '78701'),
+    ('78701-1234', '78701'),
+    ('78701.0', '78701'),
+    (78701.0, '78701'),
+    (' 78758 ', '78758'),
+    ('5125551234', None),
+    ('787011234', None),
+    ('512-555-1234', None),
+    ('00000', None),
+    ('Unhoused', None),
+    ('', None),
+    (np.nan, None),
+])
+def test_extract_zips(cell, expected):
+    zips = extract_zips(pd.Series([cell], dtype=object))
+    if expected is None:
+        assert zips.isna().all()
+    else:
+        assert zips.tolist() == [expected]
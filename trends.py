@@ -0,0 +1,147 @@
+# =================================== IMPORTS ================================= #
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from client_identity import no_identity
+
+# =================================== CONFIG ================================== #
+
+# Resampling frequencies (pandas period codes; weeks run Monday-Sunday)
+trend_frequencies = {'D': 'Daily', 'W': 'Weekly', 'M': 'Monthly'}
+
+# Series the engine precomputes, and the breakdowns (None = all activity)
+trend_measures = {
+    'visits': 'Visits',
+    'clients': 'Unique Clients',
+    'hours': 'Navigation Hours',
+    'travel_hours': 'Travel Hours',
+}
+trend_breakdowns = [None, 'Location', 'Support']
+
+# Width of the rolling window over the weekly series
+rolling_weeks = int(os.getenv("TREND_ROLLING_WEEKS", "4"))
+
+# ============================== Trend Engine ============================== #
+
+def period_codes(dates, freq):
+    """(code per row, period start per code) for a datetime column; rows without a date get -1"""
+    ordinals = dates.dt.to_period(freq).array.asi8
+    valid = ~dates.isna().to_numpy()
+    if not valid.any():
+        return np.full(len(dates), -1, dtype=np.int64), pd.DatetimeIndex([])
+    first, last = ordinals[valid].min(), ordinals[valid].max()
+    codes = np.where(valid, ordinals - first, -1)
+    starts = pd.period_range(start=pd.Period(ordinal=first, freq=freq), periods=last - first + 1, freq=freq)
+    return codes, starts.to_timestamp()
+
+
+def rolling_sum(weekly, weeks):
+    """Sum over each trailing window of `weeks` periods, along the last axis (prefix-sum differences)"""
+    cumulative = np.concatenate([np.zeros(weekly.shape[:-1] + (1,)), np.cumsum(weekly, axis=-1)], axis=-1)
+    ends = np.arange(1, weekly.shape[-1] + 1)
+    return cumulative[..., ends] - cumulative[..., np.maximum(ends - weeks, 0)]
+
+
+class TrendEngine:
+    """
+    Daily, weekly and monthly series over the full history, precomputed once per
+    snapshot as [label x period] arrays for every measure and breakdown, plus rolling
+    windows over the weekly series. A trend chart is an array lookup, however many
+    years of data there are.
+
+    df holds one row per activity (date, client key, minutes); support_long is
+    support_table(df) for the support-type breakdown.
+    """
+
+    def __init__(self, df, support_long, date_column='Date of Activity', key_column='Client Key',
+                 duration_column='Activity Duration', travel_column='Travel'):
+        dates = pd.to_datetime(df[date_column], errors='coerce').reset_index(drop=True)
+        keys = np.asarray(df[key_column], dtype=np.uint64)
+        minutes = {
+            'hours': pd.to_numeric(df[duration_column], errors='coerce').fillna(0).to_numpy(dtype='float64'),
+            'travel_hours': pd.to_numeric(df[travel_column], errors='coerce').fillna(0).to_numpy(dtype='float64'),
+        }
+
+        # Facts per breakdown: (row of df, label code, labels)
+        location_codes, locations = pd.factorize(df['Location'])
+        support_rows = support_long['row_id'].to_numpy()
+        facts = {
+            None: (np.arange(len(df)), np.zeros(len(df), dtype=np.int64), pd.Index(['All'])),
+            'Location': (np.arange(len(df)), location_codes, pd.Index(locations)),
+            'Support': (support_rows, support_long['Support'].cat.codes.to_numpy(dtype=np.int64), support_long['Support'].cat.categories),
+        }
+        self.labels = {by: labels for by, (_, _, labels) in facts.items()}
+
+        self.periods = {}
+        self.arrays = {}
+        self.rolling = {}
+        self._week_pairs = {}
+        for freq in trend_frequencies:
+            codes, self.periods[freq] = period_codes(dates, freq)
+            for by, (rows, groups, labels) in facts.items():
+                period = codes[rows]
+                keep = (period >= 0) & (groups >= 0)
+                shape = (len(labels), len(self.periods[freq]))
+                cell = groups[keep] * shape[1] + period[keep]
+                size = shape[0] * shape[1]
+
+                self.arrays[freq, by, 'visits'] = np.bincount(cell, minlength=size).reshape(shape)
+                for measure, values in minutes.items():
+                    self.arrays[freq, by, measure] = (np.bincount(cell, weights=values[rows][keep], minlength=size) / 60).reshape(shape)
+
+                # Unique clients: distinct (cell, client) pairs, named clients only
+                named = keys[rows][keep] != no_identity
+                pairs = pd.DataFrame({'cell': cell[named], 'key': keys[rows][keep][named]}).drop_duplicates()
+                self.arrays[freq, by, 'clients'] = np.bincount(pairs['cell'].to_numpy(), minlength=size).reshape(shape)
+                if freq == 'W':
+                    self._week_pairs[by] = (pairs, shape)
+
+        for by in trend_breakdowns:
+            for measure in trend_measures:
+                self.window(measure, by, rolling_weeks)
+
+    def window(self, measure, by=None, weeks=None):
+        """[label x week] rolling totals over the trailing `weeks` weeks (computed once, then cached)"""
+        weeks = weeks or rolling_weeks
+        if (measure, by, weeks) not in self.rolling:
+            if measure == 'clients':
+                values = self._rolling_clients(by, weeks)
+            else:
+                values = rolling_sum(self.arrays['W', by, measure].astype('float64'), weeks)
+            self.rolling[measure, by, weeks] = values
+        return self.rolling[measure, by, weeks]
+
+    def _rolling_clients(self, by, weeks):
+        """Distinct clients per trailing window: each client-week counts toward the windows it opens"""
+        pairs, (n_labels, n_weeks) = self._week_pairs[by]
+        pairs = pairs.sort_values(['key', 'cell'], kind='stable')
+        cell = pairs['cell'].to_numpy()
+        group, week = cell // max(n_weeks, 1), cell % max(n_weeks, 1)
+        same = np.r_[False, (pairs['key'].to_numpy()[1:] == pairs['key'].to_numpy()[:-1]) & (group[1:] == group[:-1])]
+        previous = np.where(same, np.r_[0, week[:-1]], -weeks)
+        # A visit in week w covers windows w .. w+weeks-1, minus those an earlier visit already covers
+        start = np.maximum(week, previous + weeks)
+        end = np.minimum(week + weeks, n_weeks)
+        opens = start < end
+        delta = np.zeros((n_labels, n_weeks + 1))
+        np.add.at(delta, (group[opens], start[opens]), 1)
+        np.add.at(delta, (group[opens], end[opens]), -1)
+        return np.cumsum(delta, axis=1)[:, :n_weeks].astype(np.int64)
+
+    def series(self, measure, freq='W', by=None, rolling=False):
+        """Wide frame: one row per period start, one column per label ('All' without a breakdown)"""
+        if rolling:
+            values, index = self.window(measure, by), self.periods['W']
+        else:
+            values, index = self.arrays[freq, by, measure], self.periods[freq]
+        return pd.DataFrame(np.asarray(values).T, index=pd.Index(index, name='Period'), columns=list(self.labels[by]))
+
+    def long(self, measure, freq='W', by=None, rolling=False):
+        """series() melted to [Period, label, value] for plotly, labels with no activity dropped"""
+        wide = self.series(measure, freq, by, rolling)
+        wide = wide.loc[:, wide.sum(axis=0) > 0]
+        name = by or 'Series'
+        return wide.reset_index().melt(id_vars='Period', var_name=name, value_name=trend_measures[measure])
@@ -0,0 +1,101 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# =================================== CONFIG ================================== #
+
+# ZIP -> county / centroid table (columns: zip, city, county, state, latitude, longitude).
+# The bundled table covers the Austin area with approximate centroids; point ZIP_REFERENCE
+# at a fuller export (e.g. the Census ZCTA gazetteer reshaped to these columns) to widen it.
+zip_reference_path = os.getenv(
+    "ZIP_REFERENCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference", "zip_codes.csv"),
+)
+
+# 5-digit ZIP, optionally followed by a hyphenated +4 extension (78758-1234) or '.0' from
+# float cells. Unhyphenated 9-digit numbers are dropped: they are as likely phone numbers.
+zip_pattern = r'^(\d{5})(?:\.0+|-\d{4})?$'
+
+# ============================== ZIP Reference Index ============================== #
+
+class ZipIndex:
+    """
+    Reference table as direct-address arrays over the 100,000 five-digit ZIPs:
+    a lookup is one array index, and a whole column is looked up with one fancy index.
+    """
+
+    size = 100_000
+
+    def __init__(self, table):
+        zips = table['zip'].astype(int).to_numpy()
+        county_codes, self.counties = pd.factorize(table['county'])
+        self.known = np.zeros(self.size, dtype=bool)
+        self.county_code = np.full(self.size, -1, dtype=np.int16)
+        self.latitude = np.full(self.size, np.nan, dtype=np.float32)
+        self.longitude = np.full(self.size, np.nan, dtype=np.float32)
+        self.known[zips] = True
+        self.county_code[zips] = county_codes
+        self.latitude[zips] = table['latitude'].to_numpy(dtype=np.float32)
+        self.longitude[zips] = table['longitude'].to_numpy(dtype=np.float32)
+
+    @classmethod
+    def load(cls, path=None):
+        table = pd.read_csv(path or zip_reference_path, dtype={'zip': str})
+        return cls(table)
+
+    def lookup(self, zip_numbers):
+        """(county, latitude, longitude) arrays for an int array of ZIPs; -1 means no ZIP"""
+        zip_numbers = np.asarray(zip_numbers, dtype=np.int64)
+        present = zip_numbers >= 0
+        slots = np.where(present, zip_numbers, 0)
+        codes = np.where(present, self.county_code[slots], -1)
+        county = pd.Categorical.from_codes(codes, self.counties)
+        # Stored as float32; 4 decimals (~10 m) is all the table carries
+        latitude = np.where(present, self.latitude[slots], np.nan).astype(np.float64).round(4)
+        longitude = np.where(present, self.longitude[slots], np.nan).astype(np.float64).round(4)
+        return county, latitude, longitude
+
+
+_index = None
+_lock = threading.Lock()
+
+def get_zip_index():
+    """The reference index, loaded once per process"""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = ZipIndex.load()
+        return _index
+
+# ============================== ZIP Cleaning Stage ============================== #
+
+def extract_zips(col):
+    """
+    Five-digit ZIP string per row, or NaN when the cell isn't a ZIP ('Unhoused',
+    phone numbers, blanks). Handles 78701-1234 and float-formatted cells like '78701.0'.
+    Each distinct value is parsed once.
+    """
+    codes, uniques = pd.factorize(col.astype(str).str.strip())
+    parsed = pd.Series(uniques, dtype=object).str.extract(zip_pattern, expand=False)
+    parsed = parsed.where(parsed != '00000')
+    out = parsed.to_numpy(dtype=object)[codes] if len(uniques) else np.full(len(col), np.nan, dtype=object)
+    return pd.Series(out, index=col.index, name=col.name, dtype=object)
+
+
+def zip_stage(df, column='ZIP Code:', index=None):
+    """
+    Add 'ZIP2' (clean five-digit ZIP or NaN) and, from the reference index,
+    'ZIP County', 'ZIP Latitude' and 'ZIP Longitude' for every row
+    """
+    index = index or get_zip_index()
+    df['ZIP2'] = extract_zips(df[column])
+    zip_numbers = pd.to_numeric(df['ZIP2'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+    county, latitude, longitude = index.lookup(zip_numbers)
+    df['ZIP County'] = county
+    df['ZIP Latitude'] = latitude
+    df['ZIP Longitude'] = longitude
+    return df